@@ -10,6 +10,9 @@ from openshift_cli_installer.utils.click_dict_type import DictParamType
 from openshift_cli_installer.utils.const import (
     CREATE_STR,
     DESTROY_STR,
+    INSTALLER_CACHE_DEFAULT_DIRECTORY,
+    INSTALLER_CACHE_DEFAULT_MAX_SIZE_GB,
+    TERRAFORM_CACHE_DEFAULT_DIRECTORY,
 )
 
 
@@ -192,6 +195,88 @@ must-gather will try to collect data when cluster installation fails and cluster
 """,
     type=click.Path(exists=True),
 )
+@click.option(
+    "--installer-cache-dir",
+    help="""
+\b
+Path to openshift-install binaries cache directory, shared between runs.
+Binaries are extracted once per release image digest (and fips flag).
+""",
+    default=os.environ.get("OPENSHIFT_INSTALLER_CACHE_DIR", INSTALLER_CACHE_DEFAULT_DIRECTORY),
+    type=click.Path(),
+    show_default=True,
+)
+@click.option(
+    "--installer-cache-max-size",
+    help="Maximum openshift-install binaries cache size in GB, least recently used binaries are evicted.",
+    default=os.environ.get("OPENSHIFT_INSTALLER_CACHE_MAX_SIZE", INSTALLER_CACHE_DEFAULT_MAX_SIZE_GB),
+    type=float,
+    show_default=True,
+)
+@click.option(
+    "--terraform-cache-dir",
+    help="""
+\b
+Path to terraform providers and modules cache directory, shared between clusters and runs.
+Providers and modules are downloaded once, later `terraform init` runs do not use the network.
+""",
+    default=os.environ.get("OPENSHIFT_CLI_INSTALLER_TERRAFORM_CACHE_DIR", TERRAFORM_CACHE_DEFAULT_DIRECTORY),
+    type=click.Path(),
+    show_default=True,
+)
+@click.option(
+    "--aws-vpc-pool-dir",
+    help="""
+\b
+Path to the AWS VPCs pool directory, used by AWS IPI clusters with `vpc-pool=true`.
+Pool VPCs are created with terraform on demand and reused by later clusters.
+Default: <clusters-install-data-directory>/vpc-pool
+""",
+    default=os.environ.get("OPENSHIFT_CLI_INSTALLER_AWS_VPC_POOL_DIR"),
+    type=click.Path(),
+)
+@click.option(
+    "--hypershift-batch-vpcs",
+    help="""
+\b
+Create all hypershift clusters VPCs of a region in a single terraform run, before the clusters are created.
+The region terraform workspace is kept in <clusters-install-data-directory>/hypershift-vpcs/<region>.
+""",
+    is_flag=True,
+    show_default=True,
+)
+@click.option(
+    "--terraform-state-backend",
+    help="""
+\b
+Keep each hypershift cluster VPC terraform state in a remote backend with state locking, keyed by cluster name
+and shortuuid: `s3://<bucket>[/<prefix>]` (S3 lock file, terraform >= 1.10) or a local (shared) directory.
+Cluster destroy uses the remote state, the cluster directory terraform state is not needed.
+""",
+    default=os.environ.get("OPENSHIFT_CLI_INSTALLER_TERRAFORM_STATE_BACKEND"),
+)
+@click.option(
+    "--hypershift-pool-size",
+    help="""
+\b
+Number of ready hypershift OIDC configs, operator roles and VPCs to keep per OCM environment and region.
+Hypershift clusters use a ready pool entry when available, the pool is refilled while the clusters are created.
+Pool entries are returned to the pool when the clusters are destroyed. 0 disables the pool.
+""",
+    default=os.environ.get("OPENSHIFT_CLI_INSTALLER_HYPERSHIFT_POOL_SIZE", 0),
+    type=int,
+    show_default=True,
+)
+@click.option(
+    "--hypershift-pool-dir",
+    help="""
+\b
+Path to the hypershift pool directory (entries terraform state and claims).
+Default: <clusters-install-data-directory>/hypershift-pool
+""",
+    default=os.environ.get("OPENSHIFT_CLI_INSTALLER_HYPERSHIFT_POOL_DIR"),
+    type=click.Path(),
+)
 @click.option(
     "--dry-run",
     help="For testing, only verify user input",
@@ -1,33 +1,46 @@
 from __future__ import annotations
 import os
-import re
 import shlex
-from contextlib import contextmanager
-from typing import Any, Dict, Generator, List, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, Tuple
 
 import click
-import requests
 import yaml
-import tempfile
 
-from pyhelper_utils.shell import run_command
+from ocp_resources.namespace import Namespace
 from simple_logger.logger import get_logger
 
 from openshift_cli_installer.libs.clusters.ocp_cluster import OCPCluster
 from openshift_cli_installer.libs.user_input import UserInput
-from openshift_cli_installer.utils.cluster_versions import (
-    get_cluster_version_to_install,
-    get_ipi_cluster_versions,
-    parse_openshift_release_url,
+from openshift_cli_installer.utils.const import (
+    ACM_NAMESPACES,
+    CREATE_STR,
+    DESTROY_STR,
+    PRODUCTION_STR,
+    GCP_STR,
+    AWS_STR,
 )
-from openshift_cli_installer.utils.const import CREATE_STR, DESTROY_STR, PRODUCTION_STR, GCP_STR, AWS_STR
 from openshift_cli_installer.utils.general import (
     generate_unified_pull_secret,
-    get_install_config_j2_template,
     get_local_ssh_key,
+    get_unified_pull_secret_file,
+    upload_install_dir_snapshot_to_s3,
     zip_and_upload_to_s3,
 )
 from openshift_cli_installer.utils.general import get_dict_from_json
+from openshift_cli_installer.utils.installer_output import (
+    API_UP_PHASE,
+    BOOTSTRAP_COMPLETE_PHASE,
+    INSTALL_COMPLETE_PHASE,
+    InstallerEvent,
+    InstallerOutputMonitor,
+    get_installer_fatal_patterns,
+    run_installer,
+)
+from openshift_cli_installer.utils.install_config import InstallConfigError, render_install_config
+from openshift_cli_installer.utils.installer_cache import InstallerCacheError, prefetch_openshift_install_binary
+from openshift_cli_installer.utils.vpc_pool import VpcPool, VpcPoolError
 
 
 class IpiCluster(OCPCluster):
@@ -38,6 +51,9 @@ class IpiCluster(OCPCluster):
 
         self.platform = ""
         self.gcp_project_id = ""
+        # Split install: post API work runs once the API is up, while the operators are still converging
+        self.split_install = self.cluster.get("split-install") is True
+        self.post_api_future: Future[None] | None = None
         self.unified_pull_secret = generate_unified_pull_secret(
             registry_config_file=self.user_input.registry_config_file,
             docker_config_file=self.user_input.docker_config_file,
@@ -50,47 +66,42 @@ class IpiCluster(OCPCluster):
         if self.user_input.destroy_from_s3_bucket_or_local_directory:
             self._ipi_download_installer()
         else:
-            self.openshift_install_binary_path = ""
-            self.ipi_base_available_versions: Dict[str, Dict[str, List[str]]]
             self.cluster["ocm-env"] = self.cluster_info["ocm-env"] = PRODUCTION_STR
 
     def _prepare_ipi_cluster(self) -> None:
-        self.ipi_base_available_versions = get_ipi_cluster_versions()
-        self.cluster["version"] = get_cluster_version_to_install(
-            wanted_version=self.cluster_info["user-requested-version"],
-            base_versions_dict=self.ipi_base_available_versions,
-            platform=self.cluster_info["platform"],
-            stream=self.cluster_info["stream"],
-            log_prefix=self.log_prefix,
-        )
-        self._set_install_version_url()
+        # Version and release image are resolved by `OCPClusters.resolve_clusters_versions`
+        self.cluster.pop("version-url", None)
         self._ipi_download_installer()
-        if self.user_input.create:
-            self._create_install_config_file()
 
     def _ipi_download_installer(self) -> None:
-        openshift_install_binary = f"openshift-install{'-fips' if self.fips else ''}"
-        version_url = self.cluster_info["version-url"]
-        binary_dir = os.path.join(tempfile.TemporaryDirectory().name, version_url)
-        self.openshift_install_binary_path = os.path.join(binary_dir, openshift_install_binary)
-
-        with self._set_docker_config_file() as unified_pull_secret:
-            rc, _, err = run_command(
-                command=shlex.split(
-                    "oc adm release extract "
-                    f"{version_url} "
-                    f"--command={openshift_install_binary} --to={binary_dir} --registry-config={unified_pull_secret}"
-                ),
-                check=False,
-            )
+        # Already started by `OCPClusters.resolve_clusters_versions` for new clusters, shared per version
+        self.openshift_install_binary_future = prefetch_openshift_install_binary(
+            version_url=self.cluster_info["version-url"],
+            fips=bool(self.fips),
+            registry_config=get_unified_pull_secret_file(
+                registry_config_file=self.user_input.registry_config_file,
+                docker_config_file=self.user_input.docker_config_file,
+            ),
+            cache_dir=self.user_input.installer_cache_dir,
+            max_size_gb=self.user_input.installer_cache_max_size,
+        )
 
-            if not rc:
-                self.logger.error(
-                    f"{self.log_prefix}: Failed to get {openshift_install_binary} for version {version_url}, error: {err}",
-                )
-                raise click.Abort()
+    @property
+    def openshift_install_binary_path(self) -> str:
+        """
+        openshift-install binary path, waits for the binary download if still running.
+        """
+        try:
+            installer_binary = self.openshift_install_binary_future.result()
+        except InstallerCacheError as ex:
+            self.logger.error(f"{self.log_prefix}: {ex}")
+            raise click.Abort()
 
-    def _create_install_config_file(self) -> None:
+        self.cluster_info["installer-download-source"] = installer_binary.source
+        return installer_binary.path
+
+    @property
+    def install_config_parameters(self) -> Dict[str, Any]:
         terraform_parameters = {
             "name": self.cluster_info["name"],
             "region": self.cluster_info["region"],
@@ -115,61 +126,119 @@ class IpiCluster(OCPCluster):
         if fips := self.cluster.get("fips"):
             terraform_parameters["fips"] = fips
 
-        cluster_install_config = get_install_config_j2_template(jinja_dict=terraform_parameters, platform=self.platform)
+        if vpc_pool_lease := self.cluster_info.get("vpc-pool-lease"):
+            terraform_parameters["subnets"] = vpc_pool_lease["subnets"]
 
+        return terraform_parameters
+
+    def write_install_config_file(self, install_config: Dict[str, Any]) -> None:
         with open(os.path.join(self.cluster_info["cluster-dir"], "install-config.yaml"), "w") as fd:
-            fd.write(yaml.dump(cluster_install_config))
-
-    @contextmanager
-    def _set_docker_config_file(self) -> Generator[str, None, None]:
-        with tempfile.NamedTemporaryFile(prefix="pull-secret-") as fp:
-            fp.write(bytes(self.unified_pull_secret, "utf-8"))
-            yield fp.name
-
-    def _set_install_version_url(self) -> None:
-        version_url = None
-        cluster_version = self.cluster["version"]
-        for tr in parse_openshift_release_url():
-            version = any(_tr for _tr in tr.text.splitlines() if cluster_version == _tr)
-            if version:
-                href = tr.find_all("a", attrs={"class": "text-success"})[0]["href"]
-                version_url_match = re.search(
-                    r"oc adm release extract --tools (.*?)<",
-                    requests.get(f"https://{[*self.ipi_base_available_versions][0]}{href}").text,
-                )
-                version_url = version_url_match.group(1) if version_url_match else None
+            fd.write(yaml.dump(install_config))
 
-        if version_url:
-            self.cluster_info["version-url"] = version_url
-        else:
-            self.logger.error(
-                f"{self.log_prefix}: Cluster version url not found for"
-                f" {cluster_version} in {self.ipi_base_available_versions.keys()}",
-            )
+    def _create_install_config_file(self) -> None:
+        try:
+            install_config = render_install_config(jinja_dict=self.install_config_parameters, platform=self.platform)
+        except InstallConfigError as ex:
+            self.logger.error(f"{self.log_prefix}: {ex}")
             raise click.Abort()
 
-    def run_installer_command(self, action: str, raise_on_failure: bool) -> Tuple[bool, str, str]:
+        self.write_install_config_file(install_config=install_config)
+
+    @property
+    def installer_env(self) -> Dict[str, str] | None:
+        """
+        openshift-install environment, None to inherit the current environment.
+        """
+        return None
+
+    def run_installer_command(
+        self, action: str, raise_on_failure: bool, target: str = "cluster"
+    ) -> Tuple[bool, str, str]:
         run_after_failed_create_str = (
             " after cluster creation failed" if action == DESTROY_STR and self.user_input.action == CREATE_STR else ""
         )
-        self.logger.info(f"{self.log_prefix}: Running cluster {action}{run_after_failed_create_str}")
-        res, out, err = run_command(
+        self.logger.info(f"{self.log_prefix}: Running {target} {action}{run_after_failed_create_str}")
+        monitor = InstallerOutputMonitor(
+            fatal_patterns=get_installer_fatal_patterns(cluster_data=self.cluster) if action != DESTROY_STR else [],
+            on_event=self._installer_event,
+        )
+        res, out, fatal_error = run_installer(
             command=shlex.split(
-                f"{self.openshift_install_binary_path} {action} cluster --dir"
+                f"{self.openshift_install_binary_path} {action} {target} --dir"
                 f" {self.cluster_info['cluster-dir']} --log-level {self.log_level}"
             ),
-            capture_output=False,
-            check=False,
+            install_dir=self.cluster_info["cluster-dir"],
+            monitor=monitor,
+            log_prefix=self.log_prefix,
+            env=self.installer_env,
         )
 
         if not res:
+            fatal_error_str = f"\n\tFATAL LINE: {fatal_error}" if fatal_error else ""
             self.logger.error(
-                f"{self.log_prefix}: Failed to run cluster {action} \n\tERR: {err}\n\tOUT: {out}.",
+                f"{self.log_prefix}: Failed to run {target} {action} {fatal_error_str}\n\tOUT: {out}.",
             )
             if raise_on_failure:
                 raise click.Abort()
 
-        return res, out, err
+        return res, out, fatal_error
+
+    def _installer_event(self, event: InstallerEvent) -> None:
+        self.logger.info(f"{self.log_prefix}: Installer phase {event.phase}")
+        self.cluster_info.setdefault("installer-phases", {})[event.phase] = datetime.fromtimestamp(
+            event.time, tz=timezone.utc
+        ).isoformat()
+        if self.split_install and event.phase == API_UP_PHASE and not self.post_api_future:
+            self.post_api_future = self.post_api_executor.submit(self.run_post_api_tasks)
+
+    def run_post_api_tasks(self) -> None:
+        """
+        Split install: run the work that only needs a reachable API while the installer is still running.
+        """
+        self.logger.info(f"{self.log_prefix}: API is up, running post API tasks while the installation continues")
+        self.add_cluster_info_to_cluster_object()
+
+        if self.user_input.s3_bucket_name:
+            # Early backup, so that the cluster can be destroyed from S3 even if this run is interrupted; the
+            # installer is still writing to the cluster dir, a snapshot of it is uploaded
+            try:
+                upload_install_dir_snapshot_to_s3(
+                    install_dir=self.cluster_info["cluster-dir"],
+                    s3_bucket_name=self.user_input.s3_bucket_name,
+                    s3_bucket_object_name=self.cluster_info["s3-object-name"],
+                )
+            except Exception as ex:
+                self.logger.warning(f"{self.log_prefix}: Failed to upload early cluster data backup to S3: {ex}")
+
+        if self.cluster_info["acm"]:
+            for _namespace in ACM_NAMESPACES:
+                namespace = Namespace(client=self.ocp_client, name=_namespace)
+                if not namespace.exists:
+                    self.logger.info(f"{self.log_prefix}: Creating namespace {_namespace}")
+                    namespace.deploy(wait=True)
+
+    def resume_split_install(self) -> bool:
+        """
+        Split install: continue a failed `create cluster` with the installer `wait-for` stages once the API is up.
+        """
+        installer_phases = self.cluster_info.get("installer-phases", {})
+        if API_UP_PHASE not in installer_phases:
+            return False
+
+        if BOOTSTRAP_COMPLETE_PHASE not in installer_phases:
+            res, _, _ = self.run_installer_command(
+                action="wait-for", target="bootstrap-complete", raise_on_failure=False
+            )
+            if not res:
+                return False
+
+            self.run_installer_command(action=DESTROY_STR, target="bootstrap", raise_on_failure=False)
+
+        if INSTALL_COMPLETE_PHASE not in installer_phases:
+            res, _, _ = self.run_installer_command(action="wait-for", target="install-complete", raise_on_failure=False)
+            return res
+
+        return True
 
     def create_cluster(self) -> None:
         def _rollback_on_error(_ex: Exception | None = None) -> None:
@@ -182,12 +251,20 @@ class IpiCluster(OCPCluster):
             raise click.Abort()
 
         self.timeout_watch = self.start_time_watcher()
-        res, _, _ = self.run_installer_command(action=CREATE_STR, raise_on_failure=False)
+        with ThreadPoolExecutor(max_workers=1) as self.post_api_executor:
+            res, _, fatal_error = self.run_installer_command(action=CREATE_STR, raise_on_failure=False)
+            if not res and self.split_install and not fatal_error:
+                self.logger.warning(f"{self.log_prefix}: Cluster create failed, resuming install with wait-for")
+                res = self.resume_split_install()
 
         if not res:
             _rollback_on_error()
 
         try:
+            if self.post_api_future:
+                self.post_api_future.result()
+
+            # Again after install complete, console is available only when the operators are ready
             self.add_cluster_info_to_cluster_object()
             self.logger.success(f"{self.log_prefix}: Cluster created successfully")
 
@@ -213,23 +290,79 @@ class AwsIpiCluster(IpiCluster):
         super().__init__(ocp_cluster=ocp_cluster, user_input=user_input)
         self.logger = get_logger(f"{self.__class__.__module__}-{self.__class__.__name__}")
         self.platform = AWS_STR
+        # Install into an existing, pre-provisioned VPC leased from the VPCs pool
+        self.vpc_pool = self.cluster.get("vpc-pool") is True
         if not self.user_input.destroy_from_s3_bucket_or_local_directory:
             self._prepare_ipi_cluster()
             self.dump_cluster_data_to_file()
 
         self.prepare_cluster_data()
 
+    def lease_pool_vpc(self) -> None:
+        vpc_pool = VpcPool(
+            pool_dir=self.user_input.aws_vpc_pool_dir,
+            region=self.cluster_info["region"],
+            terraform_cache_dir=self.user_input.terraform_cache_dir,
+        )
+        try:
+            lease = vpc_pool.lease(cluster_name=self.cluster_info["name"])
+        except VpcPoolError as ex:
+            self.logger.error(f"{self.log_prefix}: {ex}")
+            raise click.Abort()
+
+        self.cluster_info["vpc-pool-lease"] = {
+            "pool-dir": self.user_input.aws_vpc_pool_dir,
+            "name": lease.name,
+            "vpc-id": lease.vpc_id,
+            "subnets": lease.subnets,
+        }
+        self.logger.info(f"{self.log_prefix}: Installing into pool VPC {lease.name} ({lease.vpc_id})")
+        self._create_install_config_file()
+        self.dump_cluster_data_to_file()
+
+    def release_pool_vpc(self) -> None:
+        vpc_pool_lease = self.cluster_info.get("vpc-pool-lease")
+        if not vpc_pool_lease:
+            return
+
+        if not os.path.isdir(vpc_pool_lease["pool-dir"]):
+            self.logger.warning(
+                f"{self.log_prefix}: VPCs pool directory {vpc_pool_lease['pool-dir']} not found, pool VPC"
+                f" {vpc_pool_lease['name']} ({vpc_pool_lease['vpc-id']}) is not released"
+            )
+            return
+
+        VpcPool(
+            pool_dir=vpc_pool_lease["pool-dir"],
+            region=self.cluster_info["region"],
+            terraform_cache_dir=self.user_input.terraform_cache_dir,
+        ).release(name=vpc_pool_lease["name"], cluster_name=self.cluster_info["name"])
+
+    def create_cluster(self) -> None:
+        if self.vpc_pool:
+            self.lease_pool_vpc()
+
+        super().create_cluster()
+
+    def destroy_cluster(self) -> None:
+        super().destroy_cluster()
+        # Only a cleanly destroyed cluster returns its VPC to the pool
+        self.release_pool_vpc()
+
 
 class GcpIpiCluster(IpiCluster):
     def __init__(self, ocp_cluster: Dict[str, Any], user_input: UserInput) -> None:
         super().__init__(ocp_cluster=ocp_cluster, user_input=user_input)
         self.logger = get_logger(f"{self.__class__.__module__}-{self.__class__.__name__}")
         self.platform = GCP_STR
-        self.gcp_project_id = get_dict_from_json(gcp_service_account_file=self.user_input.gcp_service_account_file)[
-            "project_id"
-        ]
+        self.gcp_project_id = get_dict_from_json(gcp_service_account_file=self.gcp_service_account_file)["project_id"]
         if not self.user_input.destroy_from_s3_bucket_or_local_directory:
             self._prepare_ipi_cluster()
             self.dump_cluster_data_to_file()
 
         self.prepare_cluster_data()
+
+    @property
+    def installer_env(self) -> Dict[str, str] | None:
+        # The installer reads the cluster service account from GOOGLE_CREDENTIALS before `~/.gcp/osServiceAccount.json`
+        return {**os.environ, "GOOGLE_CREDENTIALS": self.gcp_service_account_file}
@@ -1,32 +1,21 @@
 from datetime import datetime, timedelta
-import re
-from typing import Any, Dict, List
-import sys
+from typing import Any, Dict
 from ocm_python_wrapper.cluster import Cluster
-from ocm_python_wrapper.versions import Versions
 from simple_logger.logger import get_logger
 
 from openshift_cli_installer.libs.clusters.ocp_cluster import OCPCluster
 from openshift_cli_installer.libs.user_input import UserInput
-from openshift_cli_installer.utils.const import STAGE_STR
+from openshift_cli_installer.utils.const import HYPERSHIFT_STR, STAGE_STR
+from openshift_cli_installer.utils.ocm_status_poller import get_ocm_fatal_patterns, get_ocm_status_poller
 from pyhelper_utils.general import tts
 
 
-version = sys.version_info
-if version[0] == 3 and version[1] < 9:
-    from functools import lru_cache as cache
-else:
-    from functools import cache  # type: ignore[no-redef]
-
-
 class OcmCluster(OCPCluster):
     def __init__(self, ocp_cluster: Dict[str, Any], user_input: UserInput) -> None:
         super().__init__(ocp_cluster=ocp_cluster, user_input=user_input)
         self.logger = get_logger(f"{self.__class__.__module__}-{self.__class__.__name__}")
 
         if not self.user_input.destroy_from_s3_bucket_or_local_directory:
-            self.osd_base_available_versions_dict: Dict[str, Dict[str, List[str]]] = {}
-            self.rosa_base_available_versions_dict: Dict[str, Dict[str, List[str]]] = {}
             self.cluster["channel-group"] = self.cluster_info["channel-group"] = self.cluster.get(
                 "channel-group", "stable"
             )
@@ -50,15 +39,23 @@ class OcmCluster(OCPCluster):
                 f"{(datetime.now() + timedelta(seconds=_expiration_time)).isoformat()}Z"
             )
 
-    @cache
-    def get_osd_versions(self) -> None:
-        updated_versions_dict: Dict[str, Dict[str, List[str]]] = {}
-        for channel, versions in (
-            Versions(client=self.ocm_client).get(channel_group=self.cluster_info["channel-group"]).items()
-        ):
-            updated_versions_dict[channel] = {}
-            for version in versions:
-                _version_key = re.findall(r"^\d+.\d+", version)[0]
-                updated_versions_dict[channel].setdefault(_version_key, []).append(version)
-
-        self.osd_base_available_versions_dict.update(updated_versions_dict)
+    def wait_for_cluster_ready(self) -> None:
+        """
+        Wait for the cluster to be ready using the OCM environment shared status poller, then (for non-hypershift
+        clusters) for the osd-cluster-ready job, like `Cluster.wait_for_cluster_ready`.
+        Fails right away if the cluster is in error state or hits a fatal install error.
+        """
+        self.logger.info(f"{self.log_prefix}: Wait for cluster to be ready")
+        get_ocm_status_poller(ocm_env=self.cluster_info["ocm-env"], ocm_client=self.ocm_client).wait_for_cluster_ready(
+            name=self.cluster_info["name"],
+            wait_timeout=self.timeout_watch.remaining_time(),
+            fatal_patterns=get_ocm_fatal_patterns(cluster_data=self.cluster),
+        )
+        if self.cluster_info["platform"] != HYPERSHIFT_STR:
+            self.cluster_object.wait_for_osd_cluster_ready_job(wait_timeout=self.timeout_watch.remaining_time())
+
+    def wait_for_cluster_deletion(self) -> None:
+        self.logger.info(f"{self.log_prefix}: Wait for cluster to be deleted")
+        get_ocm_status_poller(
+            ocm_env=self.cluster_info["ocm-env"], ocm_client=self.ocm_client
+        ).wait_for_cluster_deletion(name=self.cluster_info["name"], wait_timeout=self.timeout_watch.remaining_time())
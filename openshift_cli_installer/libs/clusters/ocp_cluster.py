@@ -87,6 +87,11 @@ class OCPCluster:
             # To avoid duplicate version, already saved as user-requested-version
             self.cluster_info.pop("version")
 
+            # Versions are resolved in batch by `OCPClusters.resolve_clusters_versions`
+            self.cluster_info.pop("resolved-version", None)
+            if resolved_version := self.cluster.pop("resolved-version", None):
+                self.cluster["version"] = resolved_version
+
             if self.user_input.create:
                 if self.cluster_info.get("auto-region") is True:
                     self.check_and_assign_aws_cluster_region()
@@ -115,6 +120,17 @@ class OCPCluster:
             if self.s3_bucket_name:
                 self._add_s3_bucket_data()
 
+        # Per cluster GCP credentials, clusters from different projects / service accounts can run in parallel
+        self.gcp_service_account_file = (
+            self.cluster_info.get("gcp-service-account-file") or self.user_input.gcp_service_account_file
+        )
+        if self.user_input.destroy_from_s3_bucket_or_local_directory:
+            # The saved path is usually from another machine or a removed temporary directory
+            saved_gcp_service_account_file = self.cluster_info.get("gcp-service-account-file") or ""
+            self.gcp_service_account_file = self.user_input.gcp_service_account_file or (
+                saved_gcp_service_account_file if os.path.isfile(saved_gcp_service_account_file) else ""
+            )
+
         self.log_prefix = (
             f"[C:{self.cluster_info['name']}|P:{self.cluster_info['platform']}|"
             f"R:{self.cluster_info.get('region', 'auto-region')}]"
@@ -205,6 +221,9 @@ class OCPCluster:
             "terraform",
             "timeout_watch",
             "ipi_base_available_versions",
+            "openshift_install_binary_future",
+            "post_api_executor",
+            "post_api_future",
             "_already_processed",
             "user_input",
         )
@@ -358,7 +377,9 @@ class OCPCluster:
             open_cluster_management_observability_ns = Namespace(
                 client=self.ocp_client, name="open-cluster-management-observability"
             )
-            open_cluster_management_observability_ns.deploy(wait=True)
+            # May be pre-created by split IPI install
+            if not open_cluster_management_observability_ns.exists:
+                open_cluster_management_observability_ns.deploy(wait=True)
             openshift_pull_secret = Secret(client=self.ocp_client, name="pull-secret", namespace="openshift-config")
             observability_pull_secret = Secret(
                 client=self.ocp_client,
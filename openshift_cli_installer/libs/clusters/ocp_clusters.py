@@ -1,11 +1,12 @@
+import os
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 import click
-import rosa.cli
 from clouds.aws.aws_utils import set_and_verify_aws_credentials
 from clouds.gcp.utils import get_gcp_regions
 from ocm_python_wrapper.ocm_client import OCMPythonClient
+from rosa.rosa_versions import get_rosa_versions
 from simple_logger.logger import get_logger
 
 from openshift_cli_installer.libs.clusters.ipi_cluster import (
@@ -15,11 +16,31 @@ from openshift_cli_installer.libs.clusters.ipi_cluster import (
 from openshift_cli_installer.libs.clusters.osd_cluster import OsdCluster
 from openshift_cli_installer.libs.clusters.rosa_cluster import RosaCluster
 from openshift_cli_installer.libs.user_input import UserInput
+from openshift_cli_installer.utils.cluster_versions import (
+    ClusterVersionSource,
+    ReleaseSourceError,
+    get_cluster_stream,
+    get_cluster_version_source,
+    get_cluster_version_to_install,
+    get_ipi_cluster_versions,
+    get_ipi_version_url,
+    get_osd_versions,
+)
+from openshift_cli_installer.utils.clusters import get_ocm_client
+from openshift_cli_installer.utils.general import get_unified_pull_secret_file
+from openshift_cli_installer.utils.hypershift_pool import HypershiftPool
+from openshift_cli_installer.utils.hypershift_vpcs import HypershiftVpcsError, HypershiftVpcsWorkspace
+from openshift_cli_installer.utils.install_config import InstallConfigError, render_install_configs
+from openshift_cli_installer.utils.rosa_cli import execute_rosa_command
+from openshift_cli_installer.utils.installer_cache import prefetch_openshift_install_binary
 from openshift_cli_installer.utils.const import (
     AWS_OSD_STR,
     AWS_STR,
     GCP_OSD_STR,
     HYPERSHIFT_STR,
+    IPI_BASED_PLATFORMS,
+    IPI_VERSION_SOURCE,
+    OSD_VERSION_SOURCE,
     PRODUCTION_STR,
     ROSA_STR,
     STAGE_STR,
@@ -40,10 +61,14 @@ class OCPClusters:
 
         self.s3_target_dirs: List[str] = []
 
+        if not self.user_input.destroy_from_s3_bucket_or_local_directory:
+            self.resolve_clusters_versions()
+
         for _cluster in user_input.clusters:
             self.add_to_cluster_lists(ocp_cluster=_cluster)
 
         if self.user_input.create:
+            self.create_ipi_install_config_files()
             self.check_ocm_managed_existing_clusters()
             self.is_region_support_hypershift()
             self.is_region_support_aws()
@@ -69,6 +94,165 @@ class OCPClusters:
         if _cluster_platform == GCP_OSD_STR:
             self.gcp_osd_clusters.append(OsdCluster(ocp_cluster=ocp_cluster, user_input=self.user_input))
 
+    def resolve_clusters_versions(self) -> None:
+        """
+        Resolve all clusters versions before any cluster object is constructed.
+
+        Clusters are grouped by version source, every source catalog is fetched once (in parallel) and all
+        requested versions are resolved in one batch.
+        The resolved version (and release image for IPI clusters) is set in the cluster data;
+        the run is aborted before any cloud work starts if any version cannot be resolved.
+        """
+        clusters = [
+            _cluster
+            for _cluster in self.user_input.clusters
+            if self.user_input.create or _cluster["platform"] in IPI_BASED_PLATFORMS
+        ]
+        if not clusters:
+            return
+
+        self.logger.info("Resolving clusters versions.")
+        clusters_by_source: Dict[ClusterVersionSource, List[Dict[str, Any]]] = {}
+        for _cluster in clusters:
+            clusters_by_source.setdefault(get_cluster_version_source(cluster_data=_cluster), []).append(_cluster)
+
+        resolved_versions: Dict[int, str] = {}
+        with ThreadPoolExecutor() as executor:
+            futures = {
+                executor.submit(self.get_version_source_versions, version_source=_source): _source
+                for _source in clusters_by_source
+            }
+            # Clusters are resolved as soon as their source catalog is fetched, so IPI installers downloads start
+            # while slower sources (OCM) are still listed
+            for result in as_completed(futures):
+                _source = futures[result]
+                if _exception := result.exception():
+                    self.logger.error(f"Failed to get versions from {_source}: {_exception}")
+                    continue
+
+                for _cluster in clusters_by_source[_source]:
+                    resolved_versions[id(_cluster)] = self.resolve_cluster_version(
+                        cluster=_cluster, base_versions_dict=result.result()
+                    )
+
+                self.prefetch_ipi_installers(clusters=clusters_by_source[_source])
+
+        versions_table = [("NAME", "PLATFORM", "STREAM", "REQUESTED", "RESOLVED")]
+        unresolved_clusters = []
+        for _cluster in clusters:
+            _name = _cluster.get("name") or f"{_cluster['name-prefix']}-*"
+            resolved_version = resolved_versions.get(id(_cluster), "")
+            if not resolved_version:
+                unresolved_clusters.append(_name)
+
+            versions_table.append((
+                _name,
+                _cluster["platform"],
+                get_cluster_stream(cluster_data=_cluster),
+                str(_cluster["version"]),
+                resolved_version or "-",
+            ))
+
+        columns_width = [max(len(_row[idx]) for _row in versions_table) for idx in range(len(versions_table[0]))]
+        versions_table_str = "\n".join(
+            "  ".join(_value.ljust(_width) for _value, _width in zip(_row, columns_width)) for _row in versions_table
+        )
+        self.logger.info(f"Clusters versions:\n{versions_table_str}")
+
+        if unresolved_clusters:
+            self.logger.error(f"Failed to resolve versions for clusters: {unresolved_clusters}")
+            raise click.Abort()
+
+    def resolve_cluster_version(
+        self, cluster: Dict[str, Any], base_versions_dict: Dict[str, Dict[str, List[str]]]
+    ) -> str:
+        """
+        Resolve the cluster version and set it (and the release image for IPI clusters) in the cluster data.
+
+        Returns:
+            str: resolved version, empty if the version cannot be resolved
+        """
+        _name = cluster.get("name") or f"{cluster['name-prefix']}-*"
+        _platform = cluster["platform"]
+        try:
+            resolved_version = get_cluster_version_to_install(
+                wanted_version=str(cluster["version"]),
+                base_versions_dict=base_versions_dict,
+                platform=_platform,
+                stream=get_cluster_stream(cluster_data=cluster),
+                log_prefix=f"[C:{_name}|P:{_platform}]",
+            )
+            if _platform in IPI_BASED_PLATFORMS:
+                cluster["version-url"] = get_ipi_version_url(version=resolved_version)
+
+        except (click.Abort, ReleaseSourceError) as ex:
+            self.logger.error(f"[C:{_name}|P:{_platform}]: Failed to resolve version {ex}")
+            return ""
+
+        cluster["resolved-version"] = resolved_version
+        return resolved_version
+
+    def prefetch_ipi_installers(self, clusters: List[Dict[str, Any]]) -> None:
+        """
+        Start openshift-install downloads in the background, overlapping with pre-flight checks and clusters
+        construction; clusters only wait for the binary when running the installer.
+        """
+        ipi_clusters = [_cluster for _cluster in clusters if _cluster.get("version-url")]
+        if not ipi_clusters:
+            return
+
+        pull_secret_file = get_unified_pull_secret_file(
+            registry_config_file=self.user_input.registry_config_file,
+            docker_config_file=self.user_input.docker_config_file,
+        )
+        for _cluster in ipi_clusters:
+            prefetch_openshift_install_binary(
+                version_url=_cluster["version-url"],
+                fips=str(_cluster.get("fips", "")).lower() == "true",
+                registry_config=pull_secret_file,
+                cache_dir=self.user_input.installer_cache_dir,
+                max_size_gb=self.user_input.installer_cache_max_size,
+            )
+
+    def create_ipi_install_config_files(self) -> None:
+        """
+        Render and validate all IPI clusters install-configs in one batch, before any installer runs;
+        the run is aborted with the errors of all the invalid clusters.
+        """
+        ipi_clusters = self.aws_ipi_clusters + self.gcp_ipi_clusters
+        if not ipi_clusters:
+            return
+
+        self.logger.info("Rendering IPI clusters install-configs.")
+        try:
+            install_configs = render_install_configs(
+                clusters_parameters={
+                    _cluster.cluster_info["name"]: (_cluster.platform, _cluster.install_config_parameters)
+                    for _cluster in ipi_clusters
+                }
+            )
+        except InstallConfigError as ex:
+            self.logger.error(f"Invalid IPI clusters install-configs:\n{ex}")
+            raise click.Abort()
+
+        for _cluster in ipi_clusters:
+            _cluster.write_install_config_file(install_config=install_configs[_cluster.cluster_info["name"]])
+
+    def get_version_source_versions(self, version_source: ClusterVersionSource) -> Dict[str, Dict[str, List[str]]]:
+        if version_source.kind == IPI_VERSION_SOURCE:
+            return get_ipi_cluster_versions()
+
+        ocm_client = get_ocm_client(ocm_token=self.user_input.ocm_token, ocm_env=version_source.ocm_env)
+        if version_source.kind == OSD_VERSION_SOURCE:
+            return get_osd_versions(ocm_client=ocm_client, channel_group=version_source.channel_group)
+
+        return get_rosa_versions(
+            ocm_client=ocm_client,
+            aws_region=version_source.region,
+            channel_group=version_source.channel_group,
+            hosted_cp=version_source.hosted_cp,
+        )
+
     @property
     def list_clusters(self) -> List[Any]:
         return (
@@ -104,7 +288,7 @@ class OCPClusters:
 
     @staticmethod
     def _hypershift_regions(ocm_client: OCMPythonClient) -> List[str]:
-        rosa_regions = rosa.cli.execute(
+        rosa_regions = execute_rosa_command(
             command="list regions",
             aws_region="us-west-2",
             ocm_client=ocm_client,
@@ -149,35 +333,150 @@ class OCPClusters:
     def is_region_support_gcp(self) -> None:
         if _clusters := self.gcp_ipi_clusters + self.gcp_osd_clusters:
             self.logger.info(f"Check if regions are {GCP_STR}-supported.")
-            supported_regions = get_gcp_regions(gcp_service_account_file=self.user_input.gcp_service_account_file)
+            # Regions are listed once per service account, clusters may use different projects
+            supported_regions: Dict[str, List[str]] = {}
             unsupported_regions = []
             for _cluster in _clusters:
+                gcp_service_account_file = _cluster.gcp_service_account_file
+                if gcp_service_account_file not in supported_regions:
+                    supported_regions[gcp_service_account_file] = get_gcp_regions(
+                        gcp_service_account_file=gcp_service_account_file
+                    )
+
                 cluster_region = _cluster.cluster_info["region"]
-                if cluster_region not in supported_regions:
+                if cluster_region not in supported_regions[gcp_service_account_file]:
                     unsupported_regions.append(f"cluster: {_cluster.cluster_info['name']}, region: {cluster_region}")
 
             if unsupported_regions:
-                self.logger.error("The following clusters regions are not supported in GCP: {unsupported_regions}")
+                self.logger.error(f"The following clusters regions are not supported in GCP: {unsupported_regions}")
                 raise click.Abort()
 
+    def create_hypershift_vpcs(self, clusters: List[RosaCluster]) -> None:
+        """
+        Create the hypershift clusters VPCs with one terraform run per region, regions are created concurrently.
+        """
+        region_clusters: Dict[str, List[RosaCluster]] = {}
+        for _cluster in clusters:
+            region_clusters.setdefault(_cluster.cluster_info["region"], []).append(_cluster)
+
+        def _create_region_vpcs(region: str, clusters: List[RosaCluster]) -> None:
+            workspace = HypershiftVpcsWorkspace(
+                workspace_dir=os.path.join(self.user_input.clusters_install_data_directory, "hypershift-vpcs", region),
+                region=region,
+                terraform_cache_dir=self.user_input.terraform_cache_dir,
+            )
+            clusters_subnets = workspace.apply(
+                clusters={
+                    _cluster.cluster_info["name"]: workspace.cluster_vpc_variables(
+                        name=_cluster.cluster_info["name"], region=region, cluster_data=_cluster.cluster
+                    )
+                    for _cluster in clusters
+                }
+            )
+            for _cluster in clusters:
+                _subnets = clusters_subnets[_cluster.cluster_info["name"]]
+                _cluster.cluster["subnet-ids"] = f'"{_subnets["public-subnets"][0]},{_subnets["private-subnets"][0]}"'
+                _cluster.cluster_info["hypershift-vpcs-workspace"] = workspace.workspace_dir
+                _cluster.dump_cluster_data_to_file()
+
+        self.logger.info(f"Creating {HYPERSHIFT_STR} clusters VPCs in regions: {sorted(region_clusters)}")
+        with ThreadPoolExecutor() as executor:
+            futures = {
+                executor.submit(_create_region_vpcs, region=_region, clusters=_clusters): _region
+                for _region, _clusters in region_clusters.items()
+            }
+
+        failed_regions: Dict[str, Exception] = {}
+        for _future, _region in futures.items():
+            try:
+                _future.result()
+            except Exception as ex:
+                failed_regions[_region] = ex
+
+        if failed_regions:
+            self.logger.error(f"Failed to create {HYPERSHIFT_STR} clusters VPCs: {failed_regions}")
+            for _region, _clusters in region_clusters.items():
+                if _region not in failed_regions:
+                    for _cluster in _clusters:
+                        try:
+                            _cluster.destroy_hypershift_vpc()
+                        except Exception as ex:
+                            self.logger.error(
+                                f"{_cluster.log_prefix}: Failed to roll back {HYPERSHIFT_STR} cluster VPC: {ex}"
+                            )
+
+            for _ex in failed_regions.values():
+                if not isinstance(_ex, HypershiftVpcsError):
+                    raise _ex
+
+            raise click.Abort()
+
+    def claim_hypershift_pool_entries(self) -> List[HypershiftPool]:
+        """
+        Claim ready hypershift pool entries for the hypershift clusters.
+
+        Returns:
+            list: the clusters (OCM env, region) pools, to be refilled
+        """
+        pools: Dict[Tuple[str, str], HypershiftPool] = {}
+        for _cluster in self.hypershift_clusters:
+            pool_key = (_cluster.cluster_info["ocm-env"], _cluster.cluster_info["region"])
+            pools.setdefault(pool_key, _cluster.hypershift_pool(pool_dir=self.user_input.hypershift_pool_dir))
+            _cluster.claim_hypershift_pool_entry()
+
+        return list(pools.values())
+
     def run_create_or_destroy_clusters(self) -> None:
         futures: List[Any] = []
         action_str = "create_cluster" if self.user_input.create else "destroy_cluster"
-
-        with ThreadPoolExecutor() as executor:
-            for cluster in self.list_clusters:
-                action_func = getattr(cluster, action_str)
-                self.logger.info(
-                    f"Executing {self.user_input.action} cluster {cluster.cluster_info['name']} "
-                    f"[parallel: {self.user_input.parallel}]"
+        hypershift_pools: List[HypershiftPool] = []
+        if self.user_input.create and self.hypershift_clusters:
+            if self.user_input.hypershift_pool_size:
+                hypershift_pools = self.claim_hypershift_pool_entries()
+
+            if self.user_input.hypershift_batch_vpcs:
+                self.create_hypershift_vpcs(
+                    clusters=[
+                        _cluster
+                        for _cluster in self.hypershift_clusters
+                        if not _cluster.cluster_info.get("hypershift-pool-entry")
+                    ]
                 )
-                if self.user_input.parallel:
-                    futures.append(executor.submit(action_func))
-                else:
-                    action_func()
 
-            if futures:
-                self.process_create_destroy_clusters_threads_results(futures=futures)
+        # Used hypershift pool entries are replaced while the clusters are created
+        refill_executor = ThreadPoolExecutor()
+        refill_futures = {
+            refill_executor.submit(_pool.refill, size=self.user_input.hypershift_pool_size): _pool.region_dir
+            for _pool in hypershift_pools
+        }
+        try:
+            with ThreadPoolExecutor() as executor:
+                for cluster in self.list_clusters:
+                    action_func = getattr(cluster, action_str)
+                    self.logger.info(
+                        f"Executing {self.user_input.action} cluster {cluster.cluster_info['name']} "
+                        f"[parallel: {self.user_input.parallel}]"
+                    )
+                    if self.user_input.parallel:
+                        futures.append(executor.submit(action_func))
+                    else:
+                        action_func()
+
+                if futures:
+                    self.process_create_destroy_clusters_threads_results(futures=futures)
+
+        except BaseException:
+            # Do not wait for the refill on failure; entries already being provisioned complete in the background
+            if refill_futures:
+                self.logger.warning("Clusters action failed, not waiting for the hypershift pools refill")
+
+            refill_executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+        refill_executor.shutdown()
+        for _future, _pool_dir in refill_futures.items():
+            if _future.exception():
+                self.logger.error(f"Failed to refill hypershift pool {_pool_dir}: {_future.exception()}")
 
     def process_create_destroy_clusters_threads_results(self, futures: List[Any]) -> None:
         create_clusters_error = False
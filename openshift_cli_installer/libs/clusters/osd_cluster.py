@@ -5,7 +5,6 @@ from simple_logger.logger import get_logger
 
 from openshift_cli_installer.libs.clusters.ocm_cluster import OcmCluster
 from openshift_cli_installer.libs.user_input import UserInput
-from openshift_cli_installer.utils.cluster_versions import get_cluster_version_to_install
 from openshift_cli_installer.utils.const import AWS_OSD_STR, GCP_OSD_STR
 from openshift_cli_installer.utils.general import zip_and_upload_to_s3, get_dict_from_json
 
@@ -15,21 +14,11 @@ class OsdCluster(OcmCluster):
         super().__init__(ocp_cluster, user_input)
         self.logger = get_logger(f"{self.__class__.__module__}-{self.__class__.__name__}")
 
-        if (platform := self.cluster_info["platform"]) == GCP_OSD_STR:
-            self.gcp_service_account = get_dict_from_json(
-                gcp_service_account_file=self.user_input.gcp_service_account_file
-            )
+        if self.cluster_info["platform"] == GCP_OSD_STR:
+            self.gcp_service_account = get_dict_from_json(gcp_service_account_file=self.gcp_service_account_file)
 
         if self.user_input.create:
             self.cluster_info["aws-account-id"] = self.user_input.aws_account_id
-            self.get_osd_versions()
-            self.cluster["version"] = get_cluster_version_to_install(
-                wanted_version=self.cluster_info["user-requested-version"],
-                base_versions_dict=self.osd_base_available_versions_dict,
-                platform=platform,
-                stream=self.cluster_info["stream"],
-                log_prefix=self.log_prefix,
-            )
 
         if self.user_input.destroy_from_s3_bucket_or_local_directory:
             self.dump_cluster_data_to_file()
@@ -43,7 +32,7 @@ class OsdCluster(OcmCluster):
                 else f"{self.cluster['version']}-{self.cluster_info['channel-group']}"
             )
             provision_osd_kwargs = {
-                "wait_for_ready": True,
+                "wait_for_ready": False,
                 "wait_timeout": self.timeout_watch.remaining_time(),
                 "region": self.cluster_info["region"],
                 "ocp_version": ocp_version,
@@ -68,6 +57,7 @@ class OsdCluster(OcmCluster):
                 provision_osd_kwargs.update({"gcp_service_account": self.gcp_service_account})
 
             self.cluster_object.provision_osd(**provision_osd_kwargs)
+            self.wait_for_cluster_ready()
             self.add_cluster_info_to_cluster_object()
             self.set_cluster_auth()
 
@@ -95,7 +85,8 @@ class OsdCluster(OcmCluster):
     def destroy_cluster(self) -> None:
         self.timeout_watch = self.start_time_watcher()
         try:
-            self.cluster_object.delete(timeout=self.timeout_watch.remaining_time())
+            self.cluster_object.delete(wait=False)
+            self.wait_for_cluster_deletion()
             self.logger.success(f"{self.log_prefix}: Cluster destroyed successfully")
             self.delete_cluster_s3_buckets()
         except Exception as ex:
@@ -1,25 +1,41 @@
 import os
 import re
 import shutil
-from typing import Any, Dict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
 
 import click
-import rosa.cli
 from python_terraform import IsNotFlagged, Terraform
+from rosa.cli import CommandExecuteError
 from simple_logger.logger import get_logger
 import secrets
 import string
 from openshift_cli_installer.libs.clusters.ocm_cluster import OcmCluster
 from openshift_cli_installer.libs.user_input import UserInput
-from openshift_cli_installer.utils.cluster_versions import get_cluster_version_to_install
-from openshift_cli_installer.utils.const import HYPERSHIFT_STR
+from openshift_cli_installer.utils.const import (
+    HYPERSHIFT_STR,
+    IAM_THROTTLING_ERROR_PATTERN,
+    ROSA_LEFTOVER_NOT_FOUND_ERROR_PATTERN,
+    ROSA_LEFTOVERS_MAX_WORKERS,
+    ROSA_LEFTOVERS_RETRIES,
+)
 from openshift_cli_installer.utils.general import (
+    get_aws_az_ids,
     get_manifests_path,
+    run_steps_concurrently,
     zip_and_upload_to_s3,
 )
+from openshift_cli_installer.utils.hypershift_pool import HypershiftPool
+from openshift_cli_installer.utils.hypershift_vpcs import HypershiftVpcsError, HypershiftVpcsWorkspace
+from openshift_cli_installer.utils.resource_wait import wait_for_resource
+from openshift_cli_installer.utils.rosa_cli import execute_rosa_command
+from openshift_cli_installer.utils.terraform_cache import CachedTerraform, get_terraform_cache
+from openshift_cli_installer.utils.terraform_state import (
+    TerraformStateBackendError,
+    get_terraform_state_backend,
+    write_terraform_backend_file,
+)
 from ocp_resources.group import Group
-from rosa.rosa_versions import get_rosa_versions
-from timeout_sampler import TimeoutSampler
 from clouds.aws.roles.roles import get_roles
 
 
@@ -30,36 +46,36 @@ class RosaCluster(OcmCluster):
         if self.user_input.create:
             self.cluster_info["aws-account-id"] = self.user_input.aws_account_id
             self.assert_hypershift_missing_roles()
-            self.rosa_base_available_versions_dict = get_rosa_versions(
-                ocm_client=self.ocm_client,
-                aws_region=self.cluster_info["region"],
-                channel_group=self.cluster_info["channel-group"],
-                hosted_cp=True if self.cluster_info["platform"] == HYPERSHIFT_STR else False,
-            )
-            self.cluster["version"] = get_cluster_version_to_install(
-                wanted_version=self.cluster_info["user-requested-version"],
-                base_versions_dict=self.rosa_base_available_versions_dict,
-                platform=self.cluster_info["platform"],
-                stream=self.cluster_info["stream"],
-                log_prefix=self.log_prefix,
-            )
 
         if not self.user_input.destroy_from_s3_bucket_or_local_directory:
             if self.cluster_info["platform"] == HYPERSHIFT_STR:
                 self.terraform = Terraform()
                 self.cluster["tags"] = "dns:external"
                 self.cluster["machine-cidr"] = self.cluster.get("cidr", "10.0.0.0/16")
+                if self.user_input.create and self.user_input.terraform_state_backend:
+                    self.set_terraform_state_backend()
 
             self.dump_cluster_data_to_file()
 
+    def set_terraform_state_backend(self) -> None:
+        """
+        Keep the cluster VPC terraform state in the remote backend, destroy uses it from any machine.
+        """
+        try:
+            self.cluster_info["terraform-state-backend"] = get_terraform_state_backend(
+                backend_url=self.user_input.terraform_state_backend,
+                name=f"{self.cluster_info['name']}-{self.cluster_info['shortuuid']}",
+                region=self.cluster_info["region"],
+            )
+        except TerraformStateBackendError as ex:
+            self.logger.error(f"{self.log_prefix}: {ex}")
+            raise click.Abort()
+
     def terraform_init(self) -> None:
         self.logger.info(f"{self.log_prefix}: Init Terraform")
-        # az_id example: us-east-2 -> ["use2-az1", "use2-az2"]
-        az_id_prefix_match = re.match(r"(.*)-(\w).*-(\d)", self.cluster_info["region"])
-        az_id_prefix = "".join(az_id_prefix_match.groups()) if az_id_prefix_match else ""
         cluster_parameters = {
             "aws_region": self.cluster_info["region"],
-            "az_ids": [f"{az_id_prefix}-az1", f"{az_id_prefix}-az2"],
+            "az_ids": get_aws_az_ids(region=self.cluster_info["region"]),
             "cluster_name": self.cluster_info["name"],
         }
         cidr = self.cluster.get("cidr")
@@ -74,19 +90,31 @@ class RosaCluster(OcmCluster):
         if public_subnets:
             cluster_parameters["public_subnets"] = public_subnets
 
-        self.terraform = Terraform(working_dir=self.cluster_info["cluster-dir"], variables=cluster_parameters)
         shutil.copy(
             os.path.join(get_manifests_path(), "setup-vpc.tf"),
             self.cluster_info["cluster-dir"],
         )
-        rc, out, err = self.terraform.init()
+        self.terraform = CachedTerraform(
+            env=get_terraform_cache(cache_dir=self.user_input.terraform_cache_dir).prepare_workspace(
+                working_dir=self.cluster_info["cluster-dir"]
+            ),
+            working_dir=self.cluster_info["cluster-dir"],
+            variables=cluster_parameters,
+        )
+        backend_config = None
+        if terraform_state_backend := self.cluster_info.get("terraform-state-backend"):
+            backend_config = write_terraform_backend_file(
+                working_dir=self.cluster_info["cluster-dir"], backend=terraform_state_backend
+            )
+
+        rc, out, err = self.terraform.init(backend_config=backend_config)
         if rc != 0:
             self.logger.error(f"{self.log_prefix}: Terraform init failed. Err: {err}, Out: {out}")
             raise click.Abort()
 
     def create_oidc(self) -> None:
         self.logger.info(f"{self.log_prefix}: Create OIDC config")
-        res = rosa.cli.execute(
+        res = execute_rosa_command(
             command="create oidc-config --managed=true",
             aws_region=self.cluster_info["region"],
             ocm_client=self.ocm_client,
@@ -105,7 +133,7 @@ class RosaCluster(OcmCluster):
             self.logger.warning(f"{self.log_prefix}: No OIDC config ID to delete")
             return
 
-        rosa.cli.execute(
+        execute_rosa_command(
             command=f"delete oidc-config --oidc-config-id={oidc_config_id}",
             aws_region=self.cluster_info["region"],
             ocm_client=self.ocm_client,
@@ -113,7 +141,7 @@ class RosaCluster(OcmCluster):
 
     def create_operator_role(self) -> None:
         self.logger.info(f"{self.log_prefix}: Create operator role")
-        rosa.cli.execute(
+        execute_rosa_command(
             command=(
                 "create operator-roles --hosted-cp"
                 f" --prefix={self.cluster_info['name']} "
@@ -128,14 +156,90 @@ class RosaCluster(OcmCluster):
     def delete_operator_role(self) -> None:
         self.logger.info(f"{self.log_prefix}: Delete operator role")
         name = self.cluster_info["name"]
-        rosa.cli.execute(
+        execute_rosa_command(
             command=f"delete operator-roles --prefix={name} --cluster={name}",
             aws_region=self.cluster_info["region"],
             ocm_client=self.ocm_client,
         )
 
-    def destroy_hypershift_vpc(self) -> None:
-        self.terraform_init()
+    def hypershift_pool(self, pool_dir: str) -> HypershiftPool:
+        return HypershiftPool(
+            pool_dir=pool_dir,
+            ocm_env=self.cluster_info["ocm-env"],
+            region=self.cluster_info["region"],
+            ocm_client=self.ocm_client,
+            aws_account_id=self.cluster_info["aws-account-id"],
+            terraform_cache_dir=self.user_input.terraform_cache_dir,
+        )
+
+    def claim_hypershift_pool_entry(self) -> None:
+        """
+        Use a ready OIDC config, operator roles and VPC from the hypershift pool, if any.
+        """
+        entry = self.hypershift_pool(pool_dir=self.user_input.hypershift_pool_dir).claim(
+            cluster_name=self.cluster_info["name"]
+        )
+        if not entry:
+            return
+
+        self.cluster_info["hypershift-pool-entry"] = {
+            "pool-dir": self.user_input.hypershift_pool_dir,
+            **entry._asdict(),
+        }
+        self.cluster["oidc-config-id"] = entry.oidc_config_id
+        self.cluster["subnet-ids"] = f'"{entry.public_subnet},{entry.private_subnet}"'
+        self.logger.info(f"{self.log_prefix}: Using hypershift pool entry {entry.name}")
+        self.dump_cluster_data_to_file()
+
+    def release_hypershift_pool_entry(self) -> None:
+        pool_entry = self.cluster_info["hypershift-pool-entry"]
+        if not os.path.isdir(pool_entry["pool-dir"]):
+            self.logger.warning(
+                f"{self.log_prefix}: Hypershift pool directory {pool_entry['pool-dir']} not found, pool entry"
+                f" {pool_entry['name']} is not returned"
+            )
+            return
+
+        self.hypershift_pool(pool_dir=pool_entry["pool-dir"]).release(
+            name=pool_entry["name"], cluster_name=self.cluster_info["name"]
+        )
+
+    @property
+    def operator_roles_prefix(self) -> str:
+        pool_entry = self.cluster_info.get("hypershift-pool-entry")
+        return pool_entry["operator_roles_prefix"] if pool_entry else self.cluster_info["name"]
+
+    @property
+    def hypershift_vpcs_workspace(self) -> Optional[HypershiftVpcsWorkspace]:
+        """
+        Region workspace of the cluster VPC, when created in a batch by `OCPClusters.create_hypershift_vpcs`.
+        """
+        workspace_dir = self.cluster_info.get("hypershift-vpcs-workspace")
+        if not workspace_dir:
+            return None
+
+        return HypershiftVpcsWorkspace(
+            workspace_dir=workspace_dir,
+            region=self.cluster_info["region"],
+            terraform_cache_dir=self.user_input.terraform_cache_dir,
+        )
+
+    def destroy_hypershift_vpc(self, terraform_init_future: Optional["Future[None]"] = None) -> None:
+        hypershift_vpcs_workspace = self.hypershift_vpcs_workspace
+        if hypershift_vpcs_workspace:
+            try:
+                hypershift_vpcs_workspace.destroy(name=self.cluster_info["name"])
+            except HypershiftVpcsError as ex:
+                self.logger.error(f"{self.log_prefix}: Failed to destroy hypershift VPCs with error: {ex}")
+
+            return
+
+        if terraform_init_future:
+            # Terraform init started while the cluster was deleted
+            terraform_init_future.result()
+        else:
+            self.terraform_init()
+
         self.logger.info(f"{self.log_prefix}: Destroy hypershift VPCs")
         rc, _, err = self.terraform.destroy(
             force=IsNotFlagged,
@@ -151,13 +255,8 @@ class RosaCluster(OcmCluster):
         self.terraform.plan(dir_or_plan="hypershift.plan")
         rc, _, err = self.terraform.apply(capture_output=True, skip_plan=True, auto_approve=True)
         if rc != 0:
-            self.logger.error(
-                f"{self.log_prefix}: Create hypershift VPC failed with error: {err}, rolling back.",
-            )
-            self.delete_oidc()
-            self.delete_operator_role()
-            # Clean up already created resources from the plan
-            self.destroy_hypershift_vpc()
+            # Already created resources from the plan are cleaned by `prepare_hypershift` rollback
+            self.logger.error(f"{self.log_prefix}: Create hypershift VPC failed with error: {err}")
             raise click.Abort()
 
         terraform_output = self.terraform.output()
@@ -165,6 +264,55 @@ class RosaCluster(OcmCluster):
         public_subnet = terraform_output["cluster-public-subnet"]["value"]
         self.cluster["subnet-ids"] = f'"{public_subnet},{private_subnet}"'
 
+    def prepare_hypershift(self) -> None:
+        """
+        Create the hypershift VPC concurrently with the OIDC config -> operator roles chain.
+
+        If any step fails, all the created resources are removed.
+        """
+
+        def _create_oidc_and_operator_role() -> None:
+            self.create_oidc()
+            self.create_operator_role()
+
+        steps: Dict[str, Callable[[], None]] = {"oidc-and-operator-role": _create_oidc_and_operator_role}
+        # Batched VPCs are created before the clusters
+        if not self.hypershift_vpcs_workspace:
+            steps["vpc"] = self.prepare_hypershift_vpc
+
+        timings, failures = run_steps_concurrently(steps=steps, log_prefix=self.log_prefix)
+        self.cluster_info["hypershift-prepare-timings"] = timings
+        if failures:
+            self.logger.error(
+                f"{self.log_prefix}: Failed to prepare {HYPERSHIFT_STR} cluster: {failures}, rolling back"
+            )
+            self.cleanup_hypershift_resources()
+            raise click.Abort()
+
+    def cleanup_hypershift_resources(self, terraform_init_future: Optional["Future[None]"] = None) -> None:
+        """
+        Delete the hypershift VPC concurrently with the operator roles -> OIDC config chain.
+
+        rosa requires the operator roles to be deleted before their OIDC config; the OIDC config is deleted even if
+        the operator roles deletion failed.
+        """
+
+        def _delete_operator_role_and_oidc() -> None:
+            try:
+                self.delete_operator_role()
+            finally:
+                self.delete_oidc()
+
+        steps: Dict[str, Callable[[], None]] = {
+            "delete-vpc": lambda: self.destroy_hypershift_vpc(terraform_init_future=terraform_init_future),
+            "delete-operator-role-and-oidc": _delete_operator_role_and_oidc,
+        }
+
+        timings, failures = run_steps_concurrently(steps=steps, log_prefix=self.log_prefix)
+        self.logger.info(f"{self.log_prefix}: {HYPERSHIFT_STR} resources cleanup timings: {timings}")
+        if failures:
+            self.logger.error(f"{self.log_prefix}: Failed to delete {HYPERSHIFT_STR} resources: {failures}")
+
     def build_rosa_command(self) -> str:
         ignore_keys = (
             "name",
@@ -181,6 +329,7 @@ class RosaCluster(OcmCluster):
             "aws-account-id",
             "auto-region",
             "name-prefix",
+            "ocm-fatal-patterns",
         )
         ignore_prefix = ("acm-observability", "gcp")
         name = self.cluster_info["name"]
@@ -190,7 +339,7 @@ class RosaCluster(OcmCluster):
                 f" --role-arn=arn:aws:iam::{self.cluster_info['aws-account-id']}:role/ManagedOpenShift-HCP-ROSA-Installer-Role "
                 f"--support-role-arn=arn:aws:iam::{self.cluster_info['aws-account-id']}:role/ManagedOpenShift-HCP-ROSA-Support-Role "
                 f" --worker-iam-role=arn:aws:iam::{self.cluster_info['aws-account-id']}:role/ManagedOpenShift-HCP-ROSA-Worker-Role "
-                f"--hosted-cp --operator-roles-prefix={name} "
+                f"--hosted-cp --operator-roles-prefix={self.operator_roles_prefix} "
             )
 
         for _key, _val in self.cluster.items():
@@ -205,21 +354,19 @@ class RosaCluster(OcmCluster):
         idp_user, idp_password = "", ""
 
         self.timeout_watch = self.start_time_watcher()
-        if self.cluster_info["platform"] == HYPERSHIFT_STR:
-            self.create_oidc()
-            self.create_operator_role()
-            self.prepare_hypershift_vpc()
+        if self.cluster_info["platform"] == HYPERSHIFT_STR and not self.cluster_info.get("hypershift-pool-entry"):
+            self.prepare_hypershift()
 
         self.dump_cluster_data_to_file()
 
         try:
-            rosa.cli.execute(
+            execute_rosa_command(
                 command=self.build_rosa_command(),
                 ocm_client=self.ocm_client,
                 aws_region=self.cluster_info["region"],
             )
 
-            self.cluster_object.wait_for_cluster_ready(wait_timeout=self.timeout_watch.remaining_time())
+            self.wait_for_cluster_ready()
 
             # Must be called right after the cluster is ready.
             self.add_cluster_info_to_cluster_object()
@@ -253,23 +400,37 @@ class RosaCluster(OcmCluster):
         should_raise = False
         exception = None
 
-        try:
-            res = rosa.cli.execute(
-                command=f"delete cluster --cluster={self.cluster_info['name']}",
-                ocm_client=self.ocm_client,
-                aws_region=self.cluster_info["region"],
+        # Hypershift pool entry resources are returned to the pool when the cluster is deleted, not deleted
+        hypershift_pool_entry = self.cluster_info.get("hypershift-pool-entry")
+        is_hypershift = self.cluster_info["platform"] == HYPERSHIFT_STR and not hypershift_pool_entry
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # Terraform init (providers download) overlaps the cluster deletion
+            terraform_init_future = (
+                executor.submit(self.terraform_init) if is_hypershift and not self.hypershift_vpcs_workspace else None
             )
-            self.cluster_object.wait_for_cluster_deletion(wait_timeout=self.timeout_watch.remaining_time())
-            self.remove_leftovers(out=res.get("out", ""))
+            try:
+                # Destroy rerun, after the cluster was deleted: only the outstanding leftovers are removed
+                if self.cluster_info.get("rosa-leftovers") and not self.cluster_object.exists:
+                    res = {}
+                else:
+                    res = execute_rosa_command(
+                        command=f"delete cluster --cluster={self.cluster_info['name']}",
+                        ocm_client=self.ocm_client,
+                        aws_region=self.cluster_info["region"],
+                    )
+                    self.wait_for_cluster_deletion()
 
-        except Exception as ex:
-            should_raise = True
-            exception = ex
+                if hypershift_pool_entry:
+                    self.release_hypershift_pool_entry()
+                else:
+                    self.remove_leftovers(out=res.get("out", ""))
 
-        if self.cluster_info["platform"] == HYPERSHIFT_STR:
-            self.destroy_hypershift_vpc()
-            self.delete_oidc()
-            self.delete_operator_role()
+            except Exception as ex:
+                should_raise = True
+                exception = ex
+
+            if is_hypershift:
+                self.cleanup_hypershift_resources(terraform_init_future=terraform_init_future)
 
         if should_raise:
             self.logger.error(f"{self.log_prefix}: Failed to run cluster destroy\n{exception}")
@@ -278,7 +439,8 @@ class RosaCluster(OcmCluster):
         self.logger.success(f"{self.log_prefix}: Cluster destroyed successfully")
         self.delete_cluster_s3_buckets()
 
-    def remove_leftovers(self, out: str) -> None:
+    @staticmethod
+    def parse_leftovers_commands(out: str) -> List[str]:
         leftovers = re.search(
             r"INFO: Once the cluster is uninstalled use the following commands to"
             r" remove"
@@ -287,6 +449,7 @@ class RosaCluster(OcmCluster):
             out,
             re.DOTALL,
         )
+        commands = []
         if leftovers:
             for line in leftovers.group(1).splitlines():
                 _line = line.strip()
@@ -295,11 +458,53 @@ class RosaCluster(OcmCluster):
                     command = base_command.replace("-c ", "--cluster=")
                     command = command.replace("--prefix ", "--prefix=")
                     command = command.replace("--oidc-config-id ", "--oidc-config-id=")
-                    rosa.cli.execute(
-                        command=command,
-                        ocm_client=self.ocm_client,
-                        aws_region=self.cluster_info["region"],
-                    )
+                    commands.append(command)
+
+        return commands
+
+    def remove_leftovers(self, out: str) -> None:
+        """
+        Run the rosa leftovers cleanup commands concurrently, IAM throttling errors are retried.
+
+        Outstanding commands are saved in the cluster data; a destroy rerun only executes the commands which did not
+        complete, already deleted resources are considered done.
+        """
+        pending = self.cluster_info.get("rosa-leftovers", [])
+        pending.extend(_command for _command in self.parse_leftovers_commands(out=out) if _command not in pending)
+        if not pending:
+            return
+
+        self.cluster_info["rosa-leftovers"] = pending
+        self.dump_cluster_data_to_file()
+
+        def _remove_leftover(command: str) -> None:
+            try:
+                execute_rosa_command(
+                    command=command,
+                    ocm_client=self.ocm_client,
+                    aws_region=self.cluster_info["region"],
+                    retries=ROSA_LEFTOVERS_RETRIES,
+                    retry_pattern=IAM_THROTTLING_ERROR_PATTERN,
+                )
+            except CommandExecuteError as ex:
+                if not re.search(ROSA_LEFTOVER_NOT_FOUND_ERROR_PATTERN, str(ex)):
+                    raise
+
+                self.logger.info(f"{self.log_prefix}: Leftover already removed: {command}")
+
+        self.logger.info(f"{self.log_prefix}: Removing {len(pending)} leftovers")
+        failures = {}
+        with ThreadPoolExecutor(max_workers=ROSA_LEFTOVERS_MAX_WORKERS) as executor:
+            futures = {executor.submit(_remove_leftover, command=_command): _command for _command in pending}
+
+        for _future, _command in futures.items():
+            if _future.exception():
+                failures[_command] = _future.exception()
+
+        self.cluster_info["rosa-leftovers"] = [_command for _command in pending if _command in failures]
+        self.dump_cluster_data_to_file()
+        if failures:
+            raise CommandExecuteError(f"Failed to remove leftovers: {failures}")
 
     def assert_hypershift_missing_roles(self) -> None:
         if self.cluster_info["platform"] == HYPERSHIFT_STR:
@@ -331,7 +536,7 @@ class RosaCluster(OcmCluster):
         rosa_command_success = True
         for command in commands:
             try:
-                rosa.cli.execute(
+                execute_rosa_command(
                     command=command,
                     ocm_client=self.ocm_client,
                     aws_region=aws_region,
@@ -343,15 +548,15 @@ class RosaCluster(OcmCluster):
 
         if rosa_command_success:
             try:
-                for sampler in TimeoutSampler(
-                    wait_timeout=300,
-                    sleep=10,
-                    func=Group,
+                # Returns as soon as the user is added to the group
+                wait_for_resource(
                     client=self.ocp_client,
+                    api_version=f"{Group.api_group}/{Group.ApiVersion.V1}",
+                    kind=Group.kind,
                     name="cluster-admins",
-                ):
-                    if sampler and idp_user in sampler.instance.users:
-                        break
+                    condition=lambda group: idp_user in (group.get("users") or []),
+                    wait_timeout=300,
+                )
 
             except Exception as ex:
                 self.logger.error(f"{self.log_prefix}: {idp_user} is not part of cluster-admins\n{ex}")
@@ -16,6 +16,9 @@ from openshift_cli_installer.utils.const import (
     GCP_STR,
     GCP_OSD_STR,
     HYPERSHIFT_STR,
+    INSTALLER_CACHE_DEFAULT_DIRECTORY,
+    INSTALLER_CACHE_DEFAULT_MAX_SIZE_GB,
+    TERRAFORM_CACHE_DEFAULT_DIRECTORY,
     OBSERVABILITY_SUPPORTED_STORAGE_TYPES,
     ROSA_STR,
     S3_STR,
@@ -70,6 +73,20 @@ class UserInput:
         self.ssh_key_file = self.user_kwargs.get("ssh_key_file", "")
         self.docker_config_file = self.user_kwargs.get("docker_config_file", "")
         self.must_gather_output_dir = self.user_kwargs.get("must_gather_output_dir", "")
+        self.installer_cache_dir = self.user_kwargs.get("installer_cache_dir") or INSTALLER_CACHE_DEFAULT_DIRECTORY
+        self.installer_cache_max_size = float(
+            self.user_kwargs.get("installer_cache_max_size") or INSTALLER_CACHE_DEFAULT_MAX_SIZE_GB
+        )
+        self.terraform_cache_dir = self.user_kwargs.get("terraform_cache_dir") or TERRAFORM_CACHE_DEFAULT_DIRECTORY
+        self.aws_vpc_pool_dir = self.user_kwargs.get("aws_vpc_pool_dir") or os.path.join(
+            self.clusters_install_data_directory, "vpc-pool"
+        )
+        self.terraform_state_backend = self.user_kwargs.get("terraform_state_backend") or ""
+        self.hypershift_batch_vpcs = self.user_kwargs.get("hypershift_batch_vpcs", False)
+        self.hypershift_pool_size = int(self.user_kwargs.get("hypershift_pool_size") or 0)
+        self.hypershift_pool_dir = self.user_kwargs.get("hypershift_pool_dir") or os.path.join(
+            self.clusters_install_data_directory, "hypershift-pool"
+        )
         self.create = self.action == CREATE_STR
 
         # We need to make sure that we don't process the same input twice
@@ -101,8 +118,9 @@ class UserInput:
             )
             _cluster["aws-access-key-id"] = aws_access_key_id
             _cluster["aws-secret-access-key"] = aws_secret_access_key
+            # A cluster `gcp-service-account-file` overrides `--gcp-service-account-file`
             if self.gcp_service_account_file:
-                _cluster["gcp-service-account-file"] = self.gcp_service_account_file
+                _cluster.setdefault("gcp-service-account-file", self.gcp_service_account_file)
 
             for key in USER_INPUT_CLUSTER_BOOLEAN_KEYS:
                 cluster_key_value = _cluster.get(key)
@@ -279,15 +297,24 @@ class UserInput:
                     raise UserInputError(f"ACM not supported for {cluster_platform} clusters")
 
     def assert_gcp_user_input(self) -> None:
-        if (
-            self.create
-            and any([cluster["platform"] in (GCP_OSD_STR, GCP_STR) for cluster in self.clusters])
-            and not self.gcp_service_account_file
-        ):
+        if not self.create:
+            return
+
+        gcp_clusters = [cluster for cluster in self.clusters if cluster["platform"] in (GCP_OSD_STR, GCP_STR)]
+        if any(not cluster.get("gcp-service-account-file") for cluster in gcp_clusters):
             raise UserInputError(
-                f"`--gcp-service-account-file` option must be provided for {GCP_OSD_STR} and {GCP_STR} clusters"
+                f"`--gcp-service-account-file` option or `gcp-service-account-file` cluster parameter must be provided"
+                f" for {GCP_OSD_STR} and {GCP_STR} clusters"
             )
 
+        missing_files = {
+            cluster["gcp-service-account-file"]
+            for cluster in gcp_clusters
+            if not os.path.exists(cluster["gcp-service-account-file"])
+        }
+        if missing_files and not self.dry_run:
+            raise UserInputError(f"GCP service account files not found: {sorted(missing_files)}")
+
     def assert_boolean_values(self) -> None:
         if self.create:
             for cluster in self.clusters:
@@ -63,3 +63,15 @@ output "cluster-public-subnet" {
 output "node-private-subnet" {
   value = module.vpc.private_subnets[1]
 }
+
+output "vpc-id" {
+  value = module.vpc.vpc_id
+}
+
+output "private-subnets" {
+  value = module.vpc.private_subnets
+}
+
+output "public-subnets" {
+  value = module.vpc.public_subnets
+}
@@ -0,0 +1,147 @@
+import datetime
+import gzip
+import json
+import os
+import time
+import tracemalloc
+
+import pytest
+
+from openshift_cli_installer.tests.benchmarks.synthetic_catalogs import (
+    synthetic_base_versions,
+    synthetic_release_page,
+    synthetic_release_streams,
+)
+from openshift_cli_installer.tests.local_http_server import serve_routes
+
+BENCHMARK_RESULTS_ENV = "OPENSHIFT_CLI_INSTALLER_BENCHMARK_RESULTS"
+# Recorded release controller page (html, or gzipped html), the release page benchmarks use it instead of the
+# synthetic page when set
+BENCHMARK_RELEASE_PAGE_ENV = "OPENSHIFT_CLI_INSTALLER_BENCHMARK_RELEASE_PAGE"
+
+
+class BenchmarkResult:
+    def __init__(self, name: str, ops: int, seconds: float, peak_memory_bytes: int, catalog: str) -> None:
+        self.name = name
+        self.ops = ops
+        self.seconds = seconds
+        self.peak_memory_bytes = peak_memory_bytes
+        self.catalog = catalog
+
+    @property
+    def ops_per_second(self) -> float:
+        return self.ops / self.seconds if self.seconds else float("inf")
+
+    def to_dict(self) -> dict:
+        return {
+            "timestamp": datetime.datetime.now(tz=datetime.timezone.utc).isoformat(),
+            "name": self.name,
+            "catalog": self.catalog,
+            "ops": self.ops,
+            "seconds": round(self.seconds, 6),
+            "ops_per_second": round(self.ops_per_second, 2),
+            "peak_memory_bytes": self.peak_memory_bytes,
+        }
+
+
+@pytest.fixture()
+def benchmark_run(request):
+    """
+    Time `ops` calls of a function, then trace the peak memory of one extra call.
+
+    Memory is traced in a separate call since tracemalloc slows down allocation heavy code (HTML parsing).
+    Results are appended as JSON lines to the file set in `OPENSHIFT_CLI_INSTALLER_BENCHMARK_RESULTS`,
+    to track throughput and memory between releases.
+    """
+
+    def _run(func, ops: int = 1, catalog: str = "synthetic") -> BenchmarkResult:
+        start = time.perf_counter()
+        for _ in range(ops):
+            func()
+
+        seconds = time.perf_counter() - start
+
+        tracemalloc.start()
+        try:
+            func()
+            _, peak_memory_bytes = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        result = BenchmarkResult(
+            name=request.node.name,
+            ops=ops,
+            seconds=seconds,
+            peak_memory_bytes=peak_memory_bytes,
+            catalog=catalog,
+        )
+        if results_file := os.environ.get(BENCHMARK_RESULTS_ENV):
+            with open(results_file, "a") as fd:
+                fd.write(f"{json.dumps(result.to_dict())}\n")
+
+        return result
+
+    return _run
+
+
+@pytest.fixture(scope="session")
+def synthetic_streams():
+    return synthetic_release_streams()
+
+
+@pytest.fixture(scope="session")
+def synthetic_base_versions_dict(synthetic_streams):
+    return synthetic_base_versions(streams=synthetic_streams)
+
+
+@pytest.fixture(scope="session")
+def recorded_release_page_html():
+    """
+    Recorded release controller page, None if not set.
+
+    Record it with `curl -s --compressed https://openshift-release.apps.ci.l2s4.p1.openshiftapps.com/ | gzip > page.html.gz`
+    """
+    if not (path := os.environ.get(BENCHMARK_RELEASE_PAGE_ENV)):
+        return None
+
+    with gzip.open(path, "rt") if path.endswith(".gz") else open(path) as fd:
+        return fd.read()
+
+
+@pytest.fixture(scope="session")
+def release_page_html(synthetic_streams, recorded_release_page_html):
+    return recorded_release_page_html or synthetic_release_page(streams=synthetic_streams)
+
+
+@pytest.fixture(scope="session")
+def release_page_catalog(recorded_release_page_html):
+    return "recorded" if recorded_release_page_html else "synthetic"
+
+
+@pytest.fixture(scope="session")
+def release_page_rows_count(synthetic_streams, recorded_release_page_html):
+    """
+    Expected number of parsed rows, None for a recorded page.
+    """
+    return None if recorded_release_page_html else sum(len(tags) for tags in synthetic_streams.values())
+
+
+@pytest.fixture(scope="session")
+def synthetic_release_controller_server(synthetic_streams, release_page_html):
+    routes = {
+        "/": ("text/html", release_page_html),
+        "/api/v1/releasestreams/accepted": (
+            "application/json",
+            json.dumps({
+                stream: [_tag["name"] for _tag in tags if _tag["phase"] == "Accepted"]
+                for stream, tags in synthetic_streams.items()
+            }),
+        ),
+    }
+    routes.update({
+        f"/api/v1/releasestream/{stream}/tags": ("application/json", json.dumps({"name": stream, "tags": tags}))
+        for stream, tags in synthetic_streams.items()
+    })
+    server = serve_routes(routes=routes)
+    yield server
+    server.shutdown()
@@ -0,0 +1,97 @@
+import re
+from typing import Any, Dict, List
+
+MINORS = range(10, 40)
+
+
+def synthetic_release_streams(
+    minors: range = MINORS,
+    ga_per_minor: int = 40,
+    prereleases_per_minor: int = 10,
+    builds_per_minor: int = 100,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Generate release controller streams tags, newest first, as returned by `/api/v1/releasestream/<stream>/tags`.
+
+    Every 5th nightly/ci build is rejected, the rest are accepted.
+    """
+    streams: Dict[str, List[Dict[str, Any]]] = {"4-stable": [], "4-dev-preview": []}
+    for minor in reversed(minors):
+        streams["4-stable"].extend(
+            release_tag(name=f"4.{minor}.{patch}", registry="quay.io/openshift-release-dev/ocp-release")
+            for patch in reversed(range(ga_per_minor))
+        )
+        streams["4-stable"].extend(
+            release_tag(name=f"4.{minor}.0-rc.{idx}", registry="quay.io/openshift-release-dev/ocp-release")
+            for idx in reversed(range(prereleases_per_minor))
+        )
+        streams["4-dev-preview"].extend(
+            release_tag(name=f"4.{minor}.0-ec.{idx}", registry="quay.io/openshift-release-dev/ocp-release")
+            for idx in reversed(range(prereleases_per_minor))
+        )
+        for build_stream in ("ci", "nightly"):
+            streams[f"4.{minor}.0-0.{build_stream}"] = [
+                release_tag(
+                    name=f"4.{minor}.0-0.{build_stream}-2024-{1 + idx // 28:02d}-{1 + idx % 28:02d}-{idx:06d}",
+                    registry="registry.ci.openshift.org/ocp/release",
+                    phase="Rejected" if idx % 5 == 0 else "Accepted",
+                )
+                for idx in reversed(range(builds_per_minor))
+            ]
+
+    return streams
+
+
+def release_tag(name: str, registry: str, phase: str = "Accepted") -> Dict[str, Any]:
+    return {
+        "name": name,
+        "phase": phase,
+        "pullSpec": f"{registry}:{name}{'-x86_64' if 'quay.io' in registry else ''}",
+        "downloadURL": f"https://openshift-release-artifacts.apps.ci.l2s4.p1.openshiftapps.com/{name}",
+    }
+
+
+def synthetic_base_versions(streams: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Dict[str, List[str]]]:
+    base_versions: Dict[str, List[str]] = {}
+    for tags in streams.values():
+        for tag in tags:
+            if tag["phase"] == "Accepted":
+                base_versions.setdefault(re.findall(r"^\d+.\d+", tag["name"])[0], []).append(tag["name"])
+
+    return {"openshift-release.apps.ci.l2s4.p1.openshiftapps.com": base_versions}
+
+
+def synthetic_release_page(streams: Dict[str, List[Dict[str, Any]]]) -> str:
+    """
+    Generate a release controller page (multi-MB for the default streams) with one table per stream.
+
+    Rows mirror the release page markup: name link, phase, creation time, changelog link and upgrade info.
+    """
+    page = ["<!DOCTYPE html><html><head><title>Release Status</title></head><body><div class='container'>"]
+    for stream, tags in streams.items():
+        page.append(
+            f"<h2 id='{stream}'>{stream}</h2><table class='table text-nowrap'>"
+            "<thead><tr><th>Name</th><th>Phase</th><th>Started</th><th>Changes</th><th>Upgrades</th></tr></thead>"
+            "<tbody>"
+        )
+        for idx, tag in enumerate(tags):
+            name = tag["name"]
+            link_class = "text-success" if tag["phase"] == "Accepted" else "text-danger"
+            previous = tags[idx + 1]["name"] if idx + 1 < len(tags) else name
+            page.append(
+                "<tr>"
+                f"<td class='text-monospace'><a class='{link_class}' href='/releasestream/{stream}/release/{name}'>"
+                f"{name}</a></td>"
+                f"<td>{tag['phase']}</td>"
+                "<td title='2024-04-17T03:47:41Z'>2 days ago</td>"
+                f"<td><a href='/releasestream/{stream}/release/{name}?from={previous}'>Changes from {previous}</a>"
+                "</td>"
+                f"<td><span class='text-success' title='{previous} -> {name}'>{previous} (3)</span>, "
+                f"<span class='text-danger' title='upgrade from {previous} failed'>{previous} (1)</span></td>"
+                "</tr>"
+            )
+
+        page.append("</tbody></table>")
+
+    page.append("</div></body></html>")
+    return "\n".join(page)
@@ -0,0 +1,29 @@
+import pytest
+
+from openshift_cli_installer.utils.install_config import render_install_configs
+
+pytestmark = pytest.mark.benchmark
+
+# Generous budget, a batch of 50 clusters is expected to take tens of milliseconds
+MIN_INSTALL_CONFIG_BATCHES_PER_SECOND = 2
+CLUSTERS_PER_BATCH = 50
+
+
+def test_benchmark_render_install_configs(benchmark_run):
+    clusters_parameters = {
+        f"c{idx}": (
+            "aws",
+            {
+                "name": f"c{idx}",
+                "region": "us-east-2",
+                "base_domain": "aws.example.com",
+                "ssh_key": "ssh-rsa AAAA",
+                "pull_secret": '{"auths": {}}',
+                "subnets": [f"subnet-{idx}-1", f"subnet-{idx}-2"],
+            },
+        )
+        for idx in range(CLUSTERS_PER_BATCH)
+    }
+
+    result = benchmark_run(lambda: render_install_configs(clusters_parameters=clusters_parameters), ops=20)
+    assert result.ops_per_second > MIN_INSTALL_CONFIG_BATCHES_PER_SECOND
@@ -0,0 +1,99 @@
+import pytest
+
+from openshift_cli_installer.tests.local_http_server import server_url
+from openshift_cli_installer.utils.cluster_versions import (
+    ReleaseControllerApiSource,
+    ReleasePageParser,
+    get_cluster_version_to_install,
+    parse_openshift_release_url,
+)
+
+pytestmark = pytest.mark.benchmark
+
+# Generous budgets, meant to catch order of magnitude regressions and not to be flaky on slow CI workers
+MIN_VERSION_RESOLUTIONS_PER_SECOND = 20
+MAX_PAGE_PARSE_SECONDS = 15
+MAX_PAGE_PARSE_PEAK_MEMORY_BYTES = 64 * 1024 * 1024
+MIN_PULLSPEC_LOOKUPS_PER_SECOND = 10_000
+
+VERSION_RESOLUTIONS = [
+    ("4.20", "stable", "4.20.39"),
+    ("4.25.12", "stable", "4.25.12"),
+    ("4.30", "rc", "4.30.0-rc.9"),
+    ("4.38", "ec", "4.38.0-ec.9"),
+    ("4.39", "nightly", "4.39.0-0.nightly-2024-04-16-000099"),
+    ("4.11", "ci", "4.11.0-0.ci-2024-04-16-000099"),
+    ("4.15.0-0.ci-2024-01-02-000001", "ci", "4.15.0-0.ci-2024-01-02-000001"),
+]
+
+
+def test_benchmark_get_cluster_version_to_install(benchmark_run, synthetic_base_versions_dict):
+    def _resolve_versions():
+        for wanted_version, stream, expected in VERSION_RESOLUTIONS:
+            assert (
+                get_cluster_version_to_install(
+                    wanted_version=wanted_version,
+                    base_versions_dict=synthetic_base_versions_dict,
+                    platform="aws",
+                    stream=stream,
+                    log_prefix="benchmark-cluster-versions",
+                )
+                == expected
+            )
+
+    result = benchmark_run(func=_resolve_versions, ops=20)
+    assert result.ops * len(VERSION_RESOLUTIONS) / result.seconds >= MIN_VERSION_RESOLUTIONS_PER_SECOND
+
+
+def assert_release_page_rows(rows_count, expected_rows_count):
+    if expected_rows_count is None:
+        assert rows_count
+    else:
+        assert rows_count == expected_rows_count
+
+
+def test_benchmark_release_page_parser(benchmark_run, release_page_html, release_page_rows_count, release_page_catalog):
+    assert len(release_page_html) > 1024 * 1024
+    rows = []
+
+    def _parse_release_page():
+        parser = ReleasePageParser()
+        for idx in range(0, len(release_page_html), 64 * 1024):
+            parser.feed(release_page_html[idx : idx + 64 * 1024])
+
+        parser.close()
+        rows[:] = parser.rows
+
+    result = benchmark_run(func=_parse_release_page, catalog=release_page_catalog)
+    assert_release_page_rows(rows_count=len(rows), expected_rows_count=release_page_rows_count)
+    assert result.seconds <= MAX_PAGE_PARSE_SECONDS
+    assert result.peak_memory_bytes <= MAX_PAGE_PARSE_PEAK_MEMORY_BYTES
+
+
+def test_benchmark_parse_openshift_release_url(
+    benchmark_run, release_page_rows_count, release_page_catalog, synthetic_release_controller_server
+):
+    url = f"{server_url(synthetic_release_controller_server)}/"
+
+    def _parse_release_url():
+        parse_openshift_release_url.cache_clear()
+        assert_release_page_rows(
+            rows_count=len(parse_openshift_release_url(url=url)), expected_rows_count=release_page_rows_count
+        )
+
+    result = benchmark_run(func=_parse_release_url, catalog=release_page_catalog)
+    assert result.seconds <= MAX_PAGE_PARSE_SECONDS
+    assert result.peak_memory_bytes <= MAX_PAGE_PARSE_PEAK_MEMORY_BYTES
+
+
+def test_benchmark_api_source_pullspec_lookup(benchmark_run, synthetic_streams, synthetic_release_controller_server):
+    source = ReleaseControllerApiSource(base_url=server_url(synthetic_release_controller_server))
+    source.streams
+    versions = [tag["name"] for tags in synthetic_streams.values() for tag in tags]
+
+    def _lookup_pullspecs():
+        for version in versions:
+            assert version in source.get_pullspec(version=version)
+
+    result = benchmark_run(func=_lookup_pullspecs, ops=5)
+    assert result.ops * len(versions) / result.seconds >= MIN_PULLSPEC_LOOKUPS_PER_SECOND
@@ -0,0 +1,38 @@
+import json
+
+import pytest
+
+from openshift_cli_installer.tests.local_http_server import serve_routes
+from openshift_cli_installer.tests.cluster_version.release_controller_responses import (
+    RELEASE_DETAILS_HTML,
+    RELEASE_PAGE_HTML,
+    RELEASE_STREAM_TAGS,
+    RELEASE_STREAMS_ACCEPTED,
+)
+
+
+def release_controller_routes(with_api: bool) -> dict:
+    routes = {"/": ("text/html", RELEASE_PAGE_HTML)}
+    routes.update({path: ("text/html", body) for path, body in RELEASE_DETAILS_HTML.items()})
+    if with_api:
+        routes["/api/v1/releasestreams/accepted"] = ("application/json", json.dumps(RELEASE_STREAMS_ACCEPTED))
+        routes.update({
+            f"/api/v1/releasestream/{stream}/tags": ("application/json", json.dumps(tags))
+            for stream, tags in RELEASE_STREAM_TAGS.items()
+        })
+
+    return routes
+
+
+@pytest.fixture()
+def release_controller_api_server():
+    server = serve_routes(routes=release_controller_routes(with_api=True))
+    yield server
+    server.shutdown()
+
+
+@pytest.fixture()
+def release_controller_html_server():
+    server = serve_routes(routes=release_controller_routes(with_api=False))
+    yield server
+    server.shutdown()
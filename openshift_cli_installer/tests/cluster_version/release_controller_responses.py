@@ -0,0 +1,115 @@
+RELEASE_STREAMS_ACCEPTED = {
+    "4-dev-preview": ["4.16.0-ec.5", "4.16.0-ec.4"],
+    "4-stable": ["4.15.8", "4.15.7", "4.15.0-rc.8"],
+    "4.16.0-0.ci": ["4.16.0-0.ci-2024-04-17-034741"],
+    "4.16.0-0.nightly": ["4.16.0-0.nightly-2024-04-16-195622"],
+}
+
+RELEASE_STREAM_TAGS = {
+    "4-stable": {
+        "name": "4-stable",
+        "tags": [
+            {
+                "name": "4.15.8",
+                "phase": "Accepted",
+                "pullSpec": "quay.io/openshift-release-dev/ocp-release:4.15.8-x86_64",
+                "downloadURL": "https://openshift-release-artifacts.apps.ci.l2s4.p1.openshiftapps.com/4.15.8",
+            },
+            {
+                "name": "4.15.7",
+                "phase": "Accepted",
+                "pullSpec": "quay.io/openshift-release-dev/ocp-release:4.15.7-x86_64",
+                "downloadURL": "https://openshift-release-artifacts.apps.ci.l2s4.p1.openshiftapps.com/4.15.7",
+            },
+            {
+                "name": "4.15.0-rc.8",
+                "phase": "Accepted",
+                "pullSpec": "quay.io/openshift-release-dev/ocp-release:4.15.0-rc.8-x86_64",
+                "downloadURL": "https://openshift-release-artifacts.apps.ci.l2s4.p1.openshiftapps.com/4.15.0-rc.8",
+            },
+        ],
+    },
+    "4-dev-preview": {
+        "name": "4-dev-preview",
+        "tags": [
+            {
+                "name": "4.16.0-ec.5",
+                "phase": "Accepted",
+                "pullSpec": "quay.io/openshift-release-dev/ocp-release:4.16.0-ec.5-x86_64",
+                "downloadURL": "https://openshift-release-artifacts.apps.ci.l2s4.p1.openshiftapps.com/4.16.0-ec.5",
+            },
+            {
+                "name": "4.16.0-ec.4",
+                "phase": "Accepted",
+                "pullSpec": "quay.io/openshift-release-dev/ocp-release:4.16.0-ec.4-x86_64",
+                "downloadURL": "https://openshift-release-artifacts.apps.ci.l2s4.p1.openshiftapps.com/4.16.0-ec.4",
+            },
+        ],
+    },
+    "4.16.0-0.ci": {
+        "name": "4.16.0-0.ci",
+        "tags": [
+            {
+                "name": "4.16.0-0.ci-2024-04-17-064741",
+                "phase": "Rejected",
+                "pullSpec": "registry.ci.openshift.org/ocp/release:4.16.0-0.ci-2024-04-17-064741",
+                "downloadURL": "https://openshift-release-artifacts.apps.ci.l2s4.p1.openshiftapps.com/4.16.0-0.ci-2024-04-17-064741",
+            },
+            {
+                "name": "4.16.0-0.ci-2024-04-17-034741",
+                "phase": "Accepted",
+                "pullSpec": "registry.ci.openshift.org/ocp/release:4.16.0-0.ci-2024-04-17-034741",
+                "downloadURL": "https://openshift-release-artifacts.apps.ci.l2s4.p1.openshiftapps.com/4.16.0-0.ci-2024-04-17-034741",
+            },
+        ],
+    },
+    "4.16.0-0.nightly": {
+        "name": "4.16.0-0.nightly",
+        "tags": [
+            {
+                "name": "4.16.0-0.nightly-2024-04-16-195622",
+                "phase": "Accepted",
+                "pullSpec": "registry.ci.openshift.org/ocp/release:4.16.0-0.nightly-2024-04-16-195622",
+                "downloadURL": "https://openshift-release-artifacts.apps.ci.l2s4.p1.openshiftapps.com/4.16.0-0.nightly-2024-04-16-195622",
+            },
+        ],
+    },
+}
+
+RELEASE_PAGE_HTML = """
+<html>
+<body>
+<table class="table text-nowrap">
+<tr>
+<td class="text-monospace"><a class="text-success" href="/releasestream/4-stable/release/4.15.8">4.15.8</a></td>
+<td>Accepted</td>
+</tr>
+<tr>
+<td class="text-monospace"><a class="text-success" href="/releasestream/4-stable/release/4.15.0-rc.8">4.15.0-rc.8</a></td>
+<td>Accepted</td>
+</tr>
+<tr>
+<td class="text-monospace"><a class="text-danger" href="/releasestream/4.16.0-0.ci/release/4.16.0-0.ci-2024-04-17-064741">4.16.0-0.ci-2024-04-17-064741</a></td>
+<td>Rejected</td>
+</tr>
+<tr>
+<td class="text-monospace"><a class="text-success" href="/releasestream/4.16.0-0.nightly/release/4.16.0-0.nightly-2024-04-16-195622">4.16.0-0.nightly-2024-04-16-195622</a></td>
+<td>Accepted</td>
+</tr>
+</table>
+</body>
+</html>
+"""
+
+RELEASE_DETAILS_HTML = {
+    "/releasestream/4-stable/release/4.15.8": (
+        "<p><code>oc adm release extract --tools quay.io/openshift-release-dev/ocp-release:4.15.8-x86_64</code></p>"
+    ),
+    "/releasestream/4-stable/release/4.15.0-rc.8": (
+        "<p><code>oc adm release extract --tools quay.io/openshift-release-dev/ocp-release:4.15.0-rc.8-x86_64</code></p>"
+    ),
+    "/releasestream/4.16.0-0.nightly/release/4.16.0-0.nightly-2024-04-16-195622": (
+        "<p><code>oc adm release extract --tools "
+        "registry.ci.openshift.org/ocp/release:4.16.0-0.nightly-2024-04-16-195622</code></p>"
+    ),
+}
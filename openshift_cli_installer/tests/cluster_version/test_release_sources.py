@@ -0,0 +1,116 @@
+import pytest
+
+from openshift_cli_installer.tests.cluster_version.release_controller_responses import RELEASE_PAGE_HTML
+from openshift_cli_installer.tests.local_http_server import server_url
+
+from openshift_cli_installer.utils.cluster_versions import (
+    ClusterVersionSource,
+    ReleaseControllerApiSource,
+    ReleaseControllerHtmlSource,
+    ReleasePageParser,
+    ReleaseRow,
+    ReleaseSource,
+    ReleaseSourceError,
+    get_cluster_version_source,
+    get_cluster_version_to_install,
+    get_ipi_cluster_versions,
+    get_ipi_release_source,
+    get_ipi_version_url,
+)
+
+
+def test_api_source_accepted_versions(release_controller_api_server):
+    source = ReleaseControllerApiSource(base_url=server_url(release_controller_api_server))
+    assert source.accepted_versions() == {
+        "4.15": ["4.15.8", "4.15.7", "4.15.0-rc.8"],
+        "4.16": ["4.16.0-ec.5", "4.16.0-ec.4", "4.16.0-0.ci-2024-04-17-034741", "4.16.0-0.nightly-2024-04-16-195622"],
+    }
+
+
+def test_api_source_pullspec_without_details_pages(release_controller_api_server):
+    source = ReleaseControllerApiSource(base_url=server_url(release_controller_api_server))
+    assert (
+        source.get_pullspec(version="4.16.0-0.nightly-2024-04-16-195622")
+        == "registry.ci.openshift.org/ocp/release:4.16.0-0.nightly-2024-04-16-195622"
+    )
+    assert not [_path for _path in release_controller_api_server.requested_paths if "/release/" in _path]
+
+
+def test_api_source_pullspec_not_found(release_controller_api_server):
+    source = ReleaseControllerApiSource(base_url=server_url(release_controller_api_server))
+    with pytest.raises(ReleaseSourceError):
+        source.get_pullspec(version="4.15.40")
+
+
+def test_html_source(release_controller_html_server):
+    source = ReleaseControllerHtmlSource(base_url=server_url(release_controller_html_server))
+    assert source.accepted_versions() == {
+        "4.15": ["4.15.8", "4.15.0-rc.8"],
+        "4.16": ["4.16.0-0.nightly-2024-04-16-195622"],
+    }
+    assert source.get_pullspec(version="4.15.8") == "quay.io/openshift-release-dev/ocp-release:4.15.8-x86_64"
+
+
+@pytest.mark.parametrize(
+    "server_fixture, expected_source",
+    [
+        ("release_controller_api_server", ReleaseControllerApiSource),
+        ("release_controller_html_server", ReleaseControllerHtmlSource),
+    ],
+)
+def test_ipi_release_source_fallback(request, server_fixture, expected_source):
+    base_url = server_url(request.getfixturevalue(server_fixture))
+    assert isinstance(get_ipi_release_source(base_url=base_url), expected_source)
+
+    version = get_cluster_version_to_install(
+        wanted_version="4.15",
+        base_versions_dict=get_ipi_cluster_versions(base_url=base_url),
+        platform="aws",
+        stream="stable",
+        log_prefix="test-release-sources",
+    )
+    assert version == "4.15.8"
+    assert (
+        get_ipi_version_url(version=version, base_url=base_url)
+        == "quay.io/openshift-release-dev/ocp-release:4.15.8-x86_64"
+    )
+
+
+def test_cluster_version_source_grouping():
+    clusters = [
+        {"platform": "aws", "stream": "stable"},
+        {"platform": "gcp", "stream": "nightly"},
+        {"platform": "aws-osd", "ocm-env": "stage", "channel-group": "stable"},
+        {"platform": "gcp-osd", "ocm-env": "stage", "channel-group": "stable"},
+        {"platform": "rosa", "ocm-env": "stage", "channel-group": "stable", "region": "us-east-2"},
+        {"platform": "hypershift", "ocm-env": "stage", "channel-group": "stable", "region": "us-east-2"},
+    ]
+    version_sources = {get_cluster_version_source(cluster_data=_cluster) for _cluster in clusters}
+    assert version_sources == {
+        ClusterVersionSource(kind="ipi"),
+        ClusterVersionSource(kind="osd", ocm_env="stage", channel_group="stable"),
+        ClusterVersionSource(kind="rosa", ocm_env="stage", channel_group="stable", region="us-east-2"),
+        ClusterVersionSource(kind="rosa", ocm_env="stage", channel_group="stable", region="us-east-2", hosted_cp=True),
+    }
+
+
+def test_release_page_parser_compact_rows():
+    parser = ReleasePageParser()
+    for chunk in ("<table><tr><th>Name</th><th>Phase</th></tr>", RELEASE_PAGE_HTML[:200], RELEASE_PAGE_HTML[200:]):
+        parser.feed(chunk)
+
+    parser.close()
+    assert parser.rows[0] == ReleaseRow(
+        version="4.15.8", phase="Accepted", href="/releasestream/4-stable/release/4.15.8"
+    )
+    assert ReleaseRow(version="4.16.0-0.ci-2024-04-17-064741", phase="Rejected", href="") in parser.rows
+    assert len(parser.rows) == 4
+
+
+def test_incomplete_release_source():
+    class AcceptedVersionsOnlySource(ReleaseSource):
+        def accepted_versions(self):
+            return {}
+
+    with pytest.raises(TypeError):
+        AcceptedVersionsOnlySource()
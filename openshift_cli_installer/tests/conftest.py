@@ -0,0 +1,39 @@
+import os
+import shutil
+import textwrap
+
+import pytest
+
+# Every fake terraform call arguments are appended to the `fake_terraform` calls file
+FAKE_TERRAFORM_HEADER = textwrap.dedent(
+    """\
+    import json, os, sys
+
+    with open(os.environ["FAKE_TERRAFORM_CALLS"], "a") as fd:
+        fd.write(" ".join(sys.argv[1:]) + "\\n")
+
+    """
+)
+
+
+@pytest.fixture
+def fake_terraform(request, tmp_path, monkeypatch):
+    """
+    `terraform` on PATH running the test module `FAKE_TERRAFORM` python script body (or the fixture indirect
+    parametrization value).
+
+    Returns:
+        Path: file with the fake terraform calls arguments, one call per line
+    """
+    script = getattr(request, "param", None) or request.module.FAKE_TERRAFORM
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    terraform = bin_dir / "terraform"
+    terraform.write_text(f"#!{shutil.which('python3') or '/usr/bin/python3'}\n{FAKE_TERRAFORM_HEADER}{script}")
+    terraform.chmod(0o755)
+    calls_file = tmp_path / "terraform-calls"
+    calls_file.touch()
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("FAKE_TERRAFORM_CALLS", str(calls_file))
+    monkeypatch.delenv("TF_CLI_CONFIG_FILE", raising=False)
+    return calls_file
@@ -0,0 +1,66 @@
+import threading
+import zipfile
+
+import pytest
+
+from openshift_cli_installer.utils import general
+from openshift_cli_installer.utils.general import run_steps_concurrently, upload_install_dir_snapshot_to_s3
+
+
+def test_run_steps_concurrently():
+    barrier = threading.Barrier(parties=2, timeout=10)
+    done = []
+
+    def _slow_step():
+        # Only passes if both steps run at the same time
+        barrier.wait()
+        done.append("slow")
+
+    def _failing_step():
+        barrier.wait()
+        raise ValueError("step failed")
+
+    timings, failures = run_steps_concurrently(
+        steps={"slow": _slow_step, "failing": _failing_step}, log_prefix="test-steps"
+    )
+    assert set(timings) == {"slow", "failing"}
+    assert list(failures) == ["failing"]
+    assert isinstance(failures["failing"], ValueError)
+    assert done == ["slow"]
+
+
+@pytest.mark.parametrize("steps", [{}, {"noop": lambda: None}])
+def test_run_steps_concurrently_no_failures(steps):
+    timings, failures = run_steps_concurrently(steps=steps, log_prefix="test-steps")
+    assert set(timings) == set(steps)
+    assert not failures
+
+
+def test_upload_install_dir_snapshot_to_s3(tmp_path, monkeypatch):
+    install_dir = tmp_path / "cluster"
+    (install_dir / "auth").mkdir(parents=True)
+    (install_dir / ".terraform").mkdir()
+    for _file in ("metadata.json", "auth/kubeconfig", ".openshift_install_state.json", ".openshift_install.log"):
+        (install_dir / _file).write_text("data")
+
+    uploads = {}
+
+    class FakeS3Client:
+        def upload_file(self, Filename, Bucket, Key):
+            with zipfile.ZipFile(Filename) as zip_file:
+                uploads[Key] = sorted(zip_file.namelist())
+
+    monkeypatch.setattr(general, "s3_client", FakeS3Client)
+    upload_install_dir_snapshot_to_s3(
+        install_dir=str(install_dir), s3_bucket_name="bucket", s3_bucket_object_name="cluster-abc.zip"
+    )
+
+    assert uploads == {"cluster-abc.zip": ["auth/", "auth/kubeconfig", "metadata.json"]}
+    # The installer files are left in place
+    assert sorted(_path.name for _path in install_dir.iterdir()) == [
+        ".openshift_install.log",
+        ".openshift_install_state.json",
+        ".terraform",
+        "auth",
+        "metadata.json",
+    ]
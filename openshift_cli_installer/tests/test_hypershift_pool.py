@@ -0,0 +1,167 @@
+import os
+import socket
+import subprocess
+import textwrap
+import time
+
+import pytest
+import rosa.cli
+
+from openshift_cli_installer.utils.hypershift_pool import PROVISIONING_FILENAME, HypershiftPool
+
+FAKE_TERRAFORM = textwrap.dedent(
+    """\
+    if sys.argv[1] == "destroy" and os.environ.get("FAKE_TERRAFORM_FAIL_DESTROY"):
+        sys.exit(1)
+
+    if sys.argv[1] == "output":
+        print(
+            json.dumps(
+                {
+                    "cluster-public-subnet": {"value": "subnet-public"},
+                    "cluster-private-subnet": {"value": "subnet-private"},
+                }
+            )
+        )
+    """
+)
+
+
+@pytest.fixture
+def rosa_commands(fake_terraform, monkeypatch):
+    monkeypatch.setattr(
+        "openshift_cli_installer.utils.hypershift_pool.get_aws_az_ids", lambda region: ["usw2-az1", "usw2-az2"]
+    )
+
+    commands = []
+
+    def _execute(command, aws_region, ocm_client):
+        commands.append(command)
+        if command.startswith("create oidc-config"):
+            return {"out": {"id": f"oidc-{len(commands)}"}}
+
+        return {"out": ""}
+
+    monkeypatch.setattr(rosa.cli, "execute", _execute)
+    return commands
+
+
+@pytest.fixture
+def pool(tmp_path):
+    return HypershiftPool(
+        pool_dir=str(tmp_path / "pool"),
+        ocm_env="stage",
+        region="us-west-2",
+        ocm_client=None,
+        aws_account_id="123456789012",
+        terraform_cache_dir=str(tmp_path / "cache"),
+    )
+
+
+def test_hypershift_pool_claim_and_refill(rosa_commands, pool):
+    pool.refill(size=2)
+    assert len(pool.entries()) == 2
+
+    entry = pool.claim(cluster_name="hyper1")
+    assert entry.oidc_config_id.startswith("oidc-")
+    assert entry.operator_roles_prefix == entry.name
+    assert (entry.public_subnet, entry.private_subnet) == ("subnet-public", "subnet-private")
+    assert f"--prefix={entry.name} --oidc-config-id={entry.oidc_config_id}" in " ".join(rosa_commands)
+
+    pool.refill(size=2)
+    assert len(pool.entries()) == 3
+
+    pool.release(name=entry.name, cluster_name="hyper2")
+    assert pool.claim(cluster_name="hyper2").name != entry.name
+
+    pool.release(name=entry.name, cluster_name="hyper1")
+    assert pool.claim(cluster_name="hyper3").name == entry.name
+    assert pool.claim(cluster_name="hyper4")
+    assert pool.claim(cluster_name="hyper5") is None
+
+
+def test_hypershift_pool_failed_entry_is_removed(rosa_commands, pool, monkeypatch):
+    def _execute(command, aws_region, ocm_client):
+        rosa_commands.append(command)
+        if command.startswith("create operator-roles"):
+            raise rosa.cli.CommandExecuteError("throttled")
+
+        return {"out": {"id": "oidc-1"}}
+
+    monkeypatch.setattr(rosa.cli, "execute", _execute)
+    pool.refill(size=1)
+
+    assert pool.entries() == []
+    # Operator roles are deleted before their OIDC config
+    assert [_command.split(" --")[0] for _command in rosa_commands[-2:]] == [
+        "delete operator-roles",
+        "delete oidc-config",
+    ]
+    assert "delete oidc-config --oidc-config-id=oidc-1" in rosa_commands
+    assert pool.claim(cluster_name="hyper1") is None
+
+
+def test_hypershift_pool_failed_vpc_destroy_keeps_entry(rosa_commands, pool, fake_terraform, monkeypatch):
+    def _execute(command, aws_region, ocm_client):
+        rosa_commands.append(command)
+        if command.startswith("create operator-roles"):
+            raise rosa.cli.CommandExecuteError("throttled")
+
+        return {"out": {"id": "oidc-1"}}
+
+    monkeypatch.setattr(rosa.cli, "execute", _execute)
+    monkeypatch.setenv("FAKE_TERRAFORM_FAIL_DESTROY", "true")
+    pool.refill(size=1)
+
+    # The entry directory keeps the VPC terraform state, the entry is not used
+    assert "destroy" in fake_terraform.read_text()
+    assert len(pool.entries()) == 1
+    assert os.path.isfile(os.path.join(pool.entry_dir(name=pool.entries()[0]), "setup-vpc.tf"))
+    assert pool.claim(cluster_name="hyper1") is None
+
+
+def dead_process_pid():
+    process = subprocess.Popen(["true"])
+    process.wait()
+    return process.pid
+
+
+@pytest.mark.parametrize(
+    "provisioning",
+    [
+        pytest.param(lambda: {"time": 0}, id="timeout"),
+        pytest.param(
+            lambda: {"time": time.time(), "pid": dead_process_pid(), "hostname": socket.gethostname()},
+            id="dead-process",
+        ),
+    ],
+)
+def test_hypershift_pool_stale_provisioning_is_not_counted(rosa_commands, pool, provisioning):
+    os.makedirs(pool.entry_dir(name="hcp-pool-stale"))
+    pool.write_json(name="hcp-pool-stale", filename=PROVISIONING_FILENAME, data=provisioning())
+
+    pool.refill(size=1)
+
+    assert len(pool.entries()) == 2
+    assert pool.claim(cluster_name="hyper1").name != "hcp-pool-stale"
+
+
+def test_hypershift_pool_refill_unexpected_remove_error(rosa_commands, pool, monkeypatch):
+    def _execute(command, aws_region, ocm_client):
+        rosa_commands.append(command)
+        if command.startswith("create operator-roles"):
+            raise rosa.cli.CommandExecuteError("throttled")
+
+        return {"out": {"id": "oidc-1"}}
+
+    def _remove(name, oidc_config_id=None):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(rosa.cli, "execute", _execute)
+    monkeypatch.setattr(pool, "remove", _remove)
+    # All the entries provisioning is waited for, the failed entries are not used
+    pool.refill(size=2)
+
+    assert len(pool.entries()) == 2
+    assert not any(pool.is_provisioning(name=_name) for _name in pool.entries())
+    assert pool.claim(cluster_name="hyper1") is None
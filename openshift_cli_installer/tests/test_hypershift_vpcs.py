@@ -0,0 +1,134 @@
+import os
+import textwrap
+
+import pytest
+
+from openshift_cli_installer.utils.hypershift_vpcs import HypershiftVpcsError, HypershiftVpcsWorkspace
+
+FAKE_TERRAFORM = textwrap.dedent(
+    """\
+    if sys.argv[1] == "apply" and os.environ.get("FAKE_TERRAFORM_FAIL_APPLY"):
+        sys.exit(1)
+
+    if sys.argv[1] == "destroy" and os.environ.get("FAKE_TERRAFORM_FAIL_DESTROY"):
+        sys.exit(1)
+
+    if sys.argv[1] == "output":
+        with open("clusters.json") as fd:
+            clusters = json.load(fd)
+
+        outputs = {}
+        for name, cluster in clusters.items():
+            outputs[f"{name}-private-subnets"] = {"value": [f"subnet-{name}-private"]}
+            outputs[f"{name}-public-subnets"] = {"value": [f"subnet-{name}-public"]}
+
+        print(json.dumps(outputs))
+    """
+)
+
+
+def vpc_variables(name):
+    return {
+        "name": name,
+        "az_ids": ["usw2-az1", "usw2-az2"],
+        "cidr": "10.0.0.0/16",
+        "private_subnets": ["10.0.1.0/24", "10.0.2.0/24"],
+        "public_subnets": ["10.0.101.0/24", "10.0.102.0/24"],
+    }
+
+
+def terraform_commands(calls_file, command):
+    return [_call for _call in calls_file.read_text().splitlines() if _call.startswith(command)]
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    return HypershiftVpcsWorkspace(
+        workspace_dir=str(tmp_path / "us-west-2"), region="us-west-2", terraform_cache_dir=str(tmp_path / "cache")
+    )
+
+
+def test_hypershift_vpcs_apply(fake_terraform, workspace):
+    assert workspace.apply(clusters={"hyper1": vpc_variables(name="hyper1")}) == {
+        "hyper1": {"private-subnets": ["subnet-hyper1-private"], "public-subnets": ["subnet-hyper1-public"]}
+    }
+    subnets = workspace.apply(clusters={_name: vpc_variables(name=_name) for _name in ("hyper2", "hyper3")})
+
+    assert sorted(subnets) == ["hyper2", "hyper3"]
+    assert sorted(workspace.read_clusters()) == ["hyper1", "hyper2", "hyper3"]
+    main_tf = open(os.path.join(workspace.workspace_dir, "main.tf")).read()
+    for _name in ("hyper1", "hyper2", "hyper3"):
+        assert f'module "{_name}" {{' in main_tf
+        assert f'output "{_name}-private-subnets" {{' in main_tf
+
+    applies = terraform_commands(calls_file=fake_terraform, command="apply")
+    assert len(applies) == 2
+    assert "-parallelism=50" in applies[1]
+    assert "-target=module.hyper2 -target=module.hyper3" in applies[1]
+    assert "module.hyper1" not in applies[1]
+
+
+def test_hypershift_vpcs_targeted_destroy(fake_terraform, workspace):
+    workspace.apply(clusters={_name: vpc_variables(name=_name) for _name in ("hyper1", "hyper2")})
+    workspace.destroy(name="hyper1")
+    workspace.destroy(name="hyper1")
+
+    destroys = terraform_commands(calls_file=fake_terraform, command="destroy")
+    assert len(destroys) == 1
+    assert "-target=module.hyper1" in destroys[0]
+    assert "module.hyper2" not in destroys[0]
+    assert list(workspace.read_clusters()) == ["hyper2"]
+    assert 'module "hyper1"' not in open(os.path.join(workspace.workspace_dir, "main.tf")).read()
+
+
+def test_hypershift_vpcs_apply_failure_rolls_back(fake_terraform, workspace, monkeypatch):
+    workspace.apply(clusters={"hyper1": vpc_variables(name="hyper1")})
+    monkeypatch.setenv("FAKE_TERRAFORM_FAIL_APPLY", "true")
+
+    with pytest.raises(HypershiftVpcsError):
+        workspace.apply(clusters={"hyper2": vpc_variables(name="hyper2")})
+
+    assert "-target=module.hyper2" in terraform_commands(calls_file=fake_terraform, command="destroy")[0]
+    assert list(workspace.read_clusters()) == ["hyper1"]
+
+
+def test_hypershift_vpcs_apply_failure_rollback_failure(fake_terraform, workspace, monkeypatch):
+    workspace.apply(clusters={"hyper1": vpc_variables(name="hyper1")})
+    monkeypatch.setenv("FAKE_TERRAFORM_FAIL_APPLY", "true")
+    monkeypatch.setenv("FAKE_TERRAFORM_FAIL_DESTROY", "true")
+
+    # The apply error is raised, not the rollback destroy error
+    with pytest.raises(HypershiftVpcsError, match="Failed to create"):
+        workspace.apply(clusters={"hyper2": vpc_variables(name="hyper2")})
+
+    assert list(workspace.read_clusters()) == ["hyper1"]
+    assert 'module "hyper2"' not in open(os.path.join(workspace.workspace_dir, "main.tf")).read()
+
+
+def test_hypershift_vpcs_destroy_failure_keeps_cluster(fake_terraform, workspace, monkeypatch):
+    workspace.apply(clusters={"hyper1": vpc_variables(name="hyper1")})
+    monkeypatch.setenv("FAKE_TERRAFORM_FAIL_DESTROY", "true")
+
+    with pytest.raises(HypershiftVpcsError, match="Failed to destroy"):
+        workspace.destroy(name="hyper1")
+
+    # Kept for a later destroy
+    assert list(workspace.read_clusters()) == ["hyper1"]
+
+
+@pytest.mark.parametrize(
+    "cluster_data, private_subnets",
+    [
+        pytest.param({}, ["10.0.1.0/24", "10.0.2.0/24"], id="default"),
+        pytest.param({"private-subnets": "10.1.1.0/24,10.1.2.0/24"}, ["10.1.1.0/24", "10.1.2.0/24"], id="cli"),
+        pytest.param({"private-subnets": ["10.1.1.0/24"]}, ["10.1.1.0/24"], id="yaml"),
+    ],
+)
+def test_hypershift_vpcs_cluster_vpc_variables(cluster_data, private_subnets, monkeypatch):
+    monkeypatch.setattr(
+        "openshift_cli_installer.utils.hypershift_vpcs.get_aws_az_ids", lambda region: ["usw2-az1", "usw2-az2"]
+    )
+    variables = HypershiftVpcsWorkspace.cluster_vpc_variables(
+        name="hyper1", region="us-west-2", cluster_data=cluster_data
+    )
+    assert variables["private_subnets"] == private_subnets
@@ -0,0 +1,90 @@
+import pytest
+
+from openshift_cli_installer.utils.install_config import (
+    InstallConfigError,
+    get_install_config_template,
+    render_install_config,
+    render_install_configs,
+)
+
+AWS_PARAMETERS = {
+    "name": "aws-c1",
+    "region": "us-east-2",
+    "base_domain": "aws.example.com",
+    "platform": "aws",
+    "ssh_key": "ssh-rsa AAAA",
+    "pull_secret": '{"auths": {}}',
+}
+GCP_PARAMETERS = {
+    **AWS_PARAMETERS,
+    "name": "gcp-c1",
+    "region": "us-east1",
+    "platform": "gcp",
+    "gcp_project_id": "my-project",
+}
+
+
+@pytest.mark.parametrize(
+    "platform, required_variables",
+    [
+        ("aws", {"name", "region", "base_domain", "ssh_key", "pull_secret"}),
+        ("gcp", {"name", "region", "base_domain", "ssh_key", "pull_secret", "gcp_project_id"}),
+    ],
+)
+def test_install_config_template_required_variables(platform, required_variables):
+    install_config_template = get_install_config_template(platform=platform)
+    assert install_config_template.required_variables == required_variables
+    assert get_install_config_template(platform=platform) is install_config_template
+
+
+def test_render_install_config():
+    install_config = render_install_config(jinja_dict={**AWS_PARAMETERS, "worker_replicas": 2}, platform="aws")
+    assert install_config["metadata"]["name"] == "aws-c1"
+    assert install_config["compute"][0]["replicas"] == 2
+    assert install_config["compute"][0]["platform"]["aws"]["type"] == "m5.4xlarge"
+    assert "subnets" not in install_config["platform"]["aws"]
+
+
+def test_render_install_config_subnets():
+    install_config = render_install_config(
+        jinja_dict={**AWS_PARAMETERS, "subnets": ["subnet-1", "subnet-2"]}, platform="aws"
+    )
+    assert install_config["platform"]["aws"]["subnets"] == ["subnet-1", "subnet-2"]
+
+
+def test_render_install_config_missing_variable():
+    with pytest.raises(InstallConfigError, match="gcp_project_id"):
+        render_install_config(jinja_dict=AWS_PARAMETERS, platform="gcp")
+
+
+@pytest.mark.parametrize(
+    "parameters, error",
+    [
+        ({"name": "Invalid_Name"}, "metadata.name"),
+        ({"worker_replicas": "two"}, r"compute\[0\].replicas"),
+        ({"pull_secret": "not-json"}, "pullSecret"),
+    ],
+)
+def test_render_install_config_invalid(parameters, error):
+    with pytest.raises(InstallConfigError, match=error):
+        render_install_config(jinja_dict={**AWS_PARAMETERS, **parameters}, platform="aws")
+
+
+def test_render_install_configs_reports_all_invalid_clusters():
+    with pytest.raises(InstallConfigError) as ex:
+        render_install_configs(
+            clusters_parameters={
+                "aws-c1": ("aws", {**AWS_PARAMETERS, "name": "Invalid_Name"}),
+                "aws-c2": ("aws", {**AWS_PARAMETERS, "name": "aws-c2"}),
+                "gcp-c1": ("gcp", {**GCP_PARAMETERS, "gcp_project_id": None}),
+            }
+        )
+
+    assert "aws-c1:" in str(ex.value)
+    assert "gcp-c1:" in str(ex.value)
+    assert "aws-c2:" not in str(ex.value)
+
+    install_configs = render_install_configs(
+        clusters_parameters={"aws-c1": ("aws", AWS_PARAMETERS), "gcp-c1": ("gcp", GCP_PARAMETERS)}
+    )
+    assert install_configs["gcp-c1"]["platform"]["gcp"]["projectID"] == "my-project"
@@ -0,0 +1,363 @@
+import hashlib
+import io
+import json
+import os
+import tarfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from openshift_cli_installer.utils.installer_cache import (
+    _INSTALLER_FUTURES,
+    MANIFEST_FILENAME,
+    InstallerCache,
+    InstallerCacheError,
+    download_openshift_install_from_mirror,
+    get_mirror_version,
+    get_openshift_install_binary,
+    file_lock,
+    get_release_digest,
+    prefetch_openshift_install_binary,
+)
+from openshift_cli_installer.tests.local_http_server import serve_routes, server_url
+
+BINARY_NAME = "openshift-install"
+
+
+class FakeExtract:
+    def __init__(self, content: bytes = b"openshift-install", binary_name: str = BINARY_NAME) -> None:
+        self.content = content
+        self.binary_name = binary_name
+        self.calls = 0
+
+    def __call__(self, target_dir: str) -> None:
+        self.calls += 1
+        with open(os.path.join(target_dir, self.binary_name), "wb") as fd:
+            fd.write(self.content)
+
+
+@pytest.fixture(autouse=True)
+def clear_installer_futures():
+    yield
+    _INSTALLER_FUTURES.clear()
+
+
+@pytest.fixture()
+def installer_cache(tmp_path):
+    return InstallerCache(cache_dir=str(tmp_path), max_size_bytes=1024 * 1024)
+
+
+def test_release_digest_from_pinned_pullspec():
+    digest = f"sha256:{'a' * 64}"
+    assert (
+        get_release_digest(version_url=f"quay.io/openshift-release-dev/ocp-release@{digest}", registry_config="")
+        == digest
+    )
+
+
+def test_installer_cache_entry_key():
+    assert InstallerCache.entry_key(release_digest="sha256:abc", fips=False) == "sha256-abc"
+    assert InstallerCache.entry_key(release_digest="sha256:abc", fips=True) == "sha256-abc-fips"
+
+
+def test_installer_cache_hit(installer_cache):
+    extract = FakeExtract()
+    binary_path = installer_cache.get_or_populate(key="sha256-abc", binary_name=BINARY_NAME, extract=extract)
+    assert installer_cache.get_or_populate(key="sha256-abc", binary_name=BINARY_NAME, extract=extract) == binary_path
+    assert extract.calls == 1
+    with open(binary_path, "rb") as fd:
+        assert fd.read() == b"openshift-install"
+
+
+def test_installer_cache_concurrent_callers_extract_once(installer_cache):
+    extract = FakeExtract()
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        binary_paths = set(
+            executor.map(
+                lambda _: installer_cache.get_or_populate(key="sha256-abc", binary_name=BINARY_NAME, extract=extract),
+                range(5),
+            )
+        )
+
+    assert len(binary_paths) == 1
+    assert extract.calls == 1
+
+
+def test_installer_cache_corrupted_entry_is_repopulated(installer_cache):
+    extract = FakeExtract()
+    binary_path = installer_cache.get_or_populate(key="sha256-abc", binary_name=BINARY_NAME, extract=extract)
+    with open(binary_path, "wb") as fd:
+        fd.write(b"truncated")
+
+    installer_cache.get_or_populate(key="sha256-abc", binary_name=BINARY_NAME, extract=extract)
+    assert extract.calls == 2
+    with open(binary_path, "rb") as fd:
+        assert fd.read() == b"openshift-install"
+
+
+def test_installer_cache_failed_extract_leaves_no_entry(installer_cache):
+    with pytest.raises(InstallerCacheError):
+        installer_cache.get_or_populate(
+            key="sha256-abc", binary_name=BINARY_NAME, extract=FakeExtract(binary_name="other-binary")
+        )
+
+    assert installer_cache.entries() == []
+    assert not [_entry for _entry in os.listdir(installer_cache.cache_dir) if "-tmp-" in _entry]
+
+
+def test_installer_cache_evicts_least_recently_used(tmp_path):
+    content = b"x" * 1024
+    writer_cache = InstallerCache(cache_dir=str(tmp_path), max_size_bytes=10 * 1024)
+    for key in ("sha256-old", "sha256-new"):
+        writer_cache.get_or_populate(key=key, binary_name=BINARY_NAME, extract=FakeExtract(content=content))
+
+    os.utime(os.path.join(tmp_path, "sha256-old", "last-used"), (0, 0))
+    # Entries used by a running process are never evicted, drop the writer in-use locks
+    for fd in writer_cache._in_use.values():
+        fd.close()
+
+    installer_cache = InstallerCache(cache_dir=str(tmp_path), max_size_bytes=int(1.5 * 1024) + 200)
+    installer_cache.evict()
+    assert installer_cache.entries() == ["sha256-new"]
+
+    with open(os.path.join(tmp_path, "sha256-new", MANIFEST_FILENAME)) as fd:
+        assert json.load(fd)["binary"] == BINARY_NAME
+
+
+def test_installer_cache_does_not_evict_entries_in_use(tmp_path):
+    writer_cache = InstallerCache(cache_dir=str(tmp_path), max_size_bytes=10 * 1024)
+    writer_cache.get_or_populate(key="sha256-abc", binary_name=BINARY_NAME, extract=FakeExtract(content=b"x" * 1024))
+
+    installer_cache = InstallerCache(cache_dir=str(tmp_path), max_size_bytes=0)
+    installer_cache.evict()
+    assert installer_cache.entries() == ["sha256-abc"]
+
+
+def test_installer_cache_evict_removes_stale_work_dirs(installer_cache):
+    cache_dir = installer_cache.cache_dir
+    for _work_dir in (".sha256-killed-tmp-a1b2c3d4", ".sha256-killed-removed-e5f6g7h8", ".sha256-running-tmp-i9j0k1l2"):
+        os.makedirs(os.path.join(cache_dir, _work_dir, "partial"))
+        with open(os.path.join(cache_dir, _work_dir, "partial", BINARY_NAME), "wb") as fd:
+            fd.write(b"x" * 1024)
+
+    # A populate in progress (holding the entry lock) keeps its work directory
+    with file_lock(path=os.path.join(cache_dir, ".sha256-running.lock")):
+        installer_cache.evict()
+
+    assert sorted(_dir for _dir in os.listdir(cache_dir) if "-tmp-" in _dir or "-removed-" in _dir) == [
+        ".sha256-running-tmp-i9j0k1l2"
+    ]
+
+
+def test_installer_cache_waiters_get_populate_error(tmp_path):
+    extract_started = threading.Event()
+    waiter_blocked = threading.Event()
+
+    def _failing_extract(target_dir: str) -> None:
+        extract_started.set()
+        waiter_blocked.wait(timeout=10)
+        raise InstallerCacheError("failed to pull release image")
+
+    # Separate cache instances act as separate processes sharing the cache directory
+    owner_cache = InstallerCache(cache_dir=str(tmp_path), max_size_bytes=1024 * 1024)
+    waiter_cache = InstallerCache(cache_dir=str(tmp_path), max_size_bytes=1024 * 1024)
+    waiter_extract = FakeExtract()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        owner = executor.submit(
+            owner_cache.get_or_populate, key="sha256-abc", binary_name=BINARY_NAME, extract=_failing_extract
+        )
+        extract_started.wait(timeout=10)
+        waiter = executor.submit(
+            waiter_cache.get_or_populate, key="sha256-abc", binary_name=BINARY_NAME, extract=waiter_extract
+        )
+        time.sleep(0.2)
+        waiter_blocked.set()
+        for future in (owner, waiter):
+            with pytest.raises(InstallerCacheError, match="failed to pull release image"):
+                future.result()
+
+    assert waiter_extract.calls == 0
+    # A later call retries the extraction
+    waiter_cache.get_or_populate(key="sha256-abc", binary_name=BINARY_NAME, extract=waiter_extract)
+    assert waiter_extract.calls == 1
+
+
+def test_get_openshift_install_binary_single_flight(mocker, tmp_path):
+    release_digest = mocker.patch(
+        "openshift_cli_installer.utils.installer_cache.get_release_digest", return_value="sha256:abc"
+    )
+    extract = mocker.patch(
+        "openshift_cli_installer.utils.installer_cache.extract_openshift_install_binary",
+        side_effect=lambda target_dir, **kwargs: time.sleep(0.2) or FakeExtract()(target_dir=target_dir),
+    )
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        binary_paths = set(
+            executor.map(
+                lambda _: get_openshift_install_binary(
+                    version_url="registry.ci.openshift.org/ocp/release:4.16.0-0.nightly-2024-04-16-195622",
+                    fips=False,
+                    registry_config="",
+                    cache_dir=str(tmp_path),
+                ),
+                range(5),
+            )
+        )
+
+    assert len(binary_paths) == 1
+    assert release_digest.call_count == 1
+    assert extract.call_count == 1
+
+
+def test_get_openshift_install_binary_error_propagates_to_waiters(mocker, tmp_path):
+    mocker.patch("openshift_cli_installer.utils.installer_cache.get_release_digest", return_value="sha256:def")
+
+    def _failing_extract(**kwargs):
+        time.sleep(0.2)
+        raise InstallerCacheError("failed to pull release image")
+
+    extract = mocker.patch(
+        "openshift_cli_installer.utils.installer_cache.extract_openshift_install_binary", side_effect=_failing_extract
+    )
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        futures = [
+            executor.submit(
+                get_openshift_install_binary,
+                version_url="registry.ci.openshift.org/ocp/release:4.16.0-0.ci-2024-04-17-034741",
+                fips=False,
+                registry_config="",
+                cache_dir=str(tmp_path),
+            )
+            for _ in range(5)
+        ]
+        for future in futures:
+            with pytest.raises(InstallerCacheError, match="failed to pull release image"):
+                future.result()
+
+    assert extract.call_count == 1
+
+
+def mirror_routes(version: str, tarball: bytes, sha256: str = "") -> dict:
+    tarball_name = f"openshift-install-linux-{version}.tar.gz"
+    return {
+        f"/ocp/{version}/sha256sum.txt": (
+            "text/plain",
+            f"{sha256 or hashlib.sha256(tarball).hexdigest()}  {tarball_name}\n{'0' * 64}  oc-mirror.tar.gz\n",
+        ),
+        f"/ocp/{version}/{tarball_name}": ("application/gzip", tarball),
+    }
+
+
+def installer_tarball(content: bytes = b"openshift-install") -> bytes:
+    tarball = io.BytesIO()
+    with tarfile.open(fileobj=tarball, mode="w:gz") as tar:
+        for name, data in (("README.md", b"readme"), ("openshift-install", content)):
+            tar_info = tarfile.TarInfo(name=name)
+            tar_info.size = len(data)
+            tar.addfile(tarinfo=tar_info, fileobj=io.BytesIO(data))
+
+    return tarball.getvalue()
+
+
+@pytest.fixture()
+def mirror_server():
+    server = serve_routes(routes=mirror_routes(version="4.15.8", tarball=installer_tarball()))
+    yield server
+    server.shutdown()
+
+
+@pytest.fixture()
+def corrupted_mirror_server():
+    server = serve_routes(routes=mirror_routes(version="4.15.8", tarball=installer_tarball(), sha256="1" * 64))
+    yield server
+    server.shutdown()
+
+
+@pytest.mark.parametrize(
+    "version_url, expected",
+    [
+        ("quay.io/openshift-release-dev/ocp-release:4.15.8-x86_64", "4.15.8"),
+        ("quay.io/openshift-release-dev/ocp-release:4.15.0-rc.8-x86_64", "4.15.0-rc.8"),
+        ("quay.io/openshift-release-dev/ocp-release:4.16.0-ec.5-x86_64", "4.16.0-ec.5"),
+        ("registry.ci.openshift.org/ocp/release:4.16.0-0.nightly-2024-04-16-195622", ""),
+        (f"quay.io/openshift-release-dev/ocp-release@sha256:{'a' * 64}", ""),
+    ],
+)
+def test_get_mirror_version(version_url, expected):
+    assert get_mirror_version(version_url=version_url) == expected
+
+
+def test_download_openshift_install_from_mirror(tmp_path, mirror_server):
+    download_openshift_install_from_mirror(
+        version="4.15.8", target_dir=str(tmp_path), mirror_url=server_url(mirror_server)
+    )
+    assert os.listdir(tmp_path) == ["openshift-install"]
+    assert os.access(os.path.join(tmp_path, "openshift-install"), os.X_OK)
+
+
+def test_download_openshift_install_from_mirror_checksum_mismatch(tmp_path, corrupted_mirror_server):
+    with pytest.raises(InstallerCacheError, match="sha256 does not match"):
+        download_openshift_install_from_mirror(
+            version="4.15.8", target_dir=str(tmp_path), mirror_url=server_url(corrupted_mirror_server)
+        )
+
+
+@pytest.mark.parametrize(
+    "server_fixture, fips, expected_source",
+    [
+        ("mirror_server", False, "mirror"),
+        ("corrupted_mirror_server", False, "release-extract"),
+        ("mirror_server", True, "release-extract"),
+    ],
+)
+def test_get_openshift_install_binary_download_strategy(
+    request, mocker, tmp_path, server_fixture, fips, expected_source
+):
+    server = request.getfixturevalue(server_fixture)
+    mocker.patch(
+        "openshift_cli_installer.utils.installer_cache.get_release_digest", return_value=f"sha256:{server_fixture}"
+    )
+    extract = mocker.patch(
+        "openshift_cli_installer.utils.installer_cache.extract_openshift_install_binary",
+        side_effect=lambda target_dir, binary_name, **kwargs: FakeExtract(binary_name=binary_name)(
+            target_dir=target_dir
+        ),
+    )
+    kwargs = {
+        "version_url": "quay.io/openshift-release-dev/ocp-release:4.15.8-x86_64",
+        "fips": fips,
+        "registry_config": "",
+        "cache_dir": str(tmp_path),
+        "mirror_url": server_url(server),
+    }
+    installer_binary = get_openshift_install_binary(**kwargs)
+    assert installer_binary.source == expected_source
+    assert extract.call_count == (expected_source == "release-extract")
+
+    # Clear the in-process futures, the next call is served from the on-disk cache
+    _INSTALLER_FUTURES.clear()
+    assert get_openshift_install_binary(**kwargs) == (installer_binary.path, "cache")
+
+
+def test_prefetch_openshift_install_binary_runs_in_background(mocker, tmp_path):
+    mocker.patch("openshift_cli_installer.utils.installer_cache.get_release_digest", return_value="sha256:prefetch")
+    extract_release = threading.Event()
+
+    def _extract(target_dir, **kwargs):
+        extract_release.wait(timeout=10)
+        FakeExtract()(target_dir=target_dir)
+
+    mocker.patch("openshift_cli_installer.utils.installer_cache.extract_openshift_install_binary", side_effect=_extract)
+    kwargs = {
+        "version_url": "registry.ci.openshift.org/ocp/release:4.16.0-0.nightly-2024-04-16-195622",
+        "fips": False,
+        "registry_config": "",
+        "cache_dir": str(tmp_path),
+    }
+    future = prefetch_openshift_install_binary(**kwargs)
+    assert not future.done()
+    assert prefetch_openshift_install_binary(**kwargs) is future
+
+    extract_release.set()
+    assert future.result(timeout=10).source == "release-extract"
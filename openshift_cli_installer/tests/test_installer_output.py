@@ -0,0 +1,168 @@
+import sys
+import textwrap
+import time
+
+import pytest
+
+from openshift_cli_installer.utils.installer_output import (
+    API_UP_PHASE,
+    BOOTSTRAP_COMPLETE_PHASE,
+    INFRASTRUCTURE_PHASE,
+    INSTALL_COMPLETE_PHASE,
+    INSTALLER_DEFAULT_FATAL_PATTERNS,
+    InstallerOutputMonitor,
+    get_installer_fatal_patterns,
+    redact_installer_line,
+    run_installer,
+)
+
+INSTALLER_LOG_LINES = [
+    'time="2024-04-17T10:00:00Z" level=info msg="Creating infrastructure resources..."',
+    'time="2024-04-17T10:08:00Z" level=info msg="Waiting up to 20m0s (until 10:28AM UTC) for the Kubernetes API at '
+    'https://api.c1.aws.example.com:6443..."',
+    'time="2024-04-17T10:10:00Z" level=info msg="API v1.28.7+6e2789b up"',
+    'time="2024-04-17T10:10:00Z" level=info msg="Waiting up to 30m0s (until 10:40AM UTC) for bootstrapping to '
+    'complete..."',
+    'time="2024-04-17T10:25:00Z" level=info msg="It is now safe to remove the bootstrap resources"',
+    'time="2024-04-17T10:26:00Z" level=info msg="Waiting up to 40m0s (until 11:06AM UTC) for the cluster at '
+    'https://api.c1.aws.example.com:6443 to initialize..."',
+    'time="2024-04-17T10:50:00Z" level=info msg="Install complete!"',
+]
+
+
+def fake_installer_command(install_log_lines, stdout_lines=(), sleep=0):
+    script = textwrap.dedent(
+        f"""
+        import sys, time
+        for line in {list(stdout_lines)!r}:
+            print(line, flush=True)
+        with open(".openshift_install.log", "a") as fd:
+            for line in {list(install_log_lines)!r}:
+                fd.write(line + "\\n")
+                fd.flush()
+        time.sleep({sleep})
+        """
+    )
+    return [sys.executable, "-c", script]
+
+
+def test_installer_output_monitor_phases():
+    events = []
+    monitor = InstallerOutputMonitor(on_event=events.append)
+    for line in INSTALLER_LOG_LINES + INSTALLER_LOG_LINES:
+        monitor.feed(line=line)
+
+    assert [_event.phase for _event in events] == [
+        INFRASTRUCTURE_PHASE,
+        API_UP_PHASE,
+        "bootstrap",
+        BOOTSTRAP_COMPLETE_PHASE,
+        "operators-progressing",
+        INSTALL_COMPLETE_PHASE,
+    ]
+    assert not monitor.fatal.is_set()
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        'level=error msg="Error: creating EC2 VPC: VpcLimitExceeded: The maximum number of VPCs has been reached."',
+        'level=error msg="failed to fetch Cluster: InvalidClientTokenId: The security token included in the request '
+        'is invalid."',
+        "level=error msg=\"googleapi: Error 403: Quota 'CPUS' exceeded.  Limit: 24.0 in region us-east1.\"",
+        'time="2024-04-17T10:02:00Z" level=fatal msg="failed to fetch Cluster: failed to generate asset"',
+        "ERROR Error: creating EC2 VPC: VpcLimitExceeded: The maximum number of VPCs has been reached.",
+    ],
+)
+def test_installer_output_monitor_fatal_patterns(line):
+    monitor = InstallerOutputMonitor()
+    monitor.feed(line=line)
+    assert monitor.fatal.is_set()
+    assert monitor.fatal_line == line
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        'time="2024-04-17T10:02:00Z" level=debug msg="creating EC2 VPC: VpcLimitExceeded, retrying"',
+        "level=info msg=\"Quota 'CPUS' exceeded, waiting for capacity\"",
+        "WARNING UnauthorizedOperation while tagging subnet, retrying",
+    ],
+)
+def test_installer_output_monitor_ignores_non_error_lines(line):
+    monitor = InstallerOutputMonitor()
+    monitor.feed(line=line)
+    assert not monitor.fatal.is_set()
+
+
+def test_get_installer_fatal_patterns():
+    assert get_installer_fatal_patterns(cluster_data={}) == list(INSTALLER_DEFAULT_FATAL_PATTERNS)
+    assert get_installer_fatal_patterns(cluster_data={"installer-fatal-patterns": "SubnetNotFound, NoSuchBucket"})[
+        -2:
+    ] == ["SubnetNotFound", "NoSuchBucket"]
+    assert get_installer_fatal_patterns(cluster_data={"installer-fatal-patterns": ["SubnetNotFound"]})[-1] == (
+        "SubnetNotFound"
+    )
+
+
+def test_redact_installer_line():
+    line = 'level=info msg="Login to the console with user: \\"kubeadmin\\", and password: \\"aBcDe-12345-fGhIj\\""'
+    assert "aBcDe-12345-fGhIj" not in redact_installer_line(line=line)
+    assert "kubeadmin" in redact_installer_line(line=line)
+
+
+def test_run_installer_success(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    events = []
+    res, out, fatal_error = run_installer(
+        command=fake_installer_command(
+            install_log_lines=INSTALLER_LOG_LINES,
+            stdout_lines=['INFO Login to the console with user: "kubeadmin", and password: "aBcDe-12345-fGhIj"'],
+        ),
+        install_dir=str(tmp_path),
+        monitor=InstallerOutputMonitor(on_event=events.append),
+        log_prefix="test-installer",
+    )
+    assert res
+    assert not fatal_error
+    assert "aBcDe-12345-fGhIj" not in out
+    assert events[-1].phase == INSTALL_COMPLETE_PHASE
+
+
+def test_run_installer_terminates_on_fatal_error(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    start_time = time.time()
+    res, _, fatal_error = run_installer(
+        command=fake_installer_command(
+            install_log_lines=[
+                INSTALLER_LOG_LINES[0],
+                'level=error msg="Error: creating EC2 VPC: VpcLimitExceeded: The maximum number of VPCs"',
+            ],
+            sleep=120,
+        ),
+        install_dir=str(tmp_path),
+        monitor=InstallerOutputMonitor(),
+        log_prefix="test-installer",
+    )
+    assert not res
+    assert "VpcLimitExceeded" in fatal_error
+    assert time.time() - start_time < 30
+
+
+def test_run_installer_retried_transient_error(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    res, _, fatal_error = run_installer(
+        command=fake_installer_command(
+            install_log_lines=[
+                INSTALLER_LOG_LINES[0],
+                'time="2024-04-17T10:02:00Z" level=debug msg="creating EC2 VPC: VpcLimitExceeded, retrying in 10s"',
+                'time="2024-04-17T10:03:00Z" level=debug msg="creating EC2 VPC: VpcLimitExceeded, retrying in 20s"',
+                *INSTALLER_LOG_LINES[1:],
+            ],
+        ),
+        install_dir=str(tmp_path),
+        monitor=InstallerOutputMonitor(),
+        log_prefix="test-installer",
+    )
+    assert res
+    assert not fatal_error
@@ -0,0 +1,239 @@
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from timeout_sampler import TimeoutExpiredError
+
+from openshift_cli_installer.utils.ocm_status_poller import (
+    OCM_DEFAULT_FATAL_PATTERNS,
+    OcmClusterStateError,
+    OcmStatusPoller,
+    get_ocm_fatal_patterns,
+)
+
+
+class FakeStatus:
+    def __init__(self, description):
+        self.description = description
+
+
+class FakeCluster:
+    def __init__(self, name, state, description=""):
+        self.id = f"{name}-id"
+        self.name = name
+        self.state = state
+        self.status = FakeStatus(description=description)
+
+
+class FakeLog:
+    def __init__(self, content):
+        self.content = content
+
+
+class FakeClustersList:
+    def __init__(self, items):
+        self.items = items
+
+
+class FakeOcmClient:
+    """
+    Serves the clusters list from `states` (cluster name -> state); after every full list (last page) the states are
+    updated from `advance` (None deletes the cluster).
+    """
+
+    def __init__(self, states, advance=None, descriptions=None, install_logs=None):
+        self.states = states
+        self.advance = advance or {}
+        self.descriptions = descriptions or {}
+        self.install_logs = install_logs or []
+        self.calls = []
+        self.install_logs_offsets = []
+        self.lock = threading.Lock()
+
+    def api_clusters_mgmt_v1_clusters_cluster_id_logs_install_get(self, cluster_id, offset):
+        self.install_logs_offsets.append(offset)
+        # Logs grow by one line per call
+        lines = self.install_logs[: len(self.install_logs_offsets)]
+        return FakeLog(content="\n".join(lines[offset:]))
+
+    def api_clusters_mgmt_v1_clusters_get(self, search, page, size):
+        with self.lock:
+            self.calls.append((search, page))
+            names = re.findall(r"'([^']+)'", search)
+            clusters = [
+                FakeCluster(name=_name, state=self.states[_name], description=self.descriptions.get(_name, ""))
+                for _name in names
+                if _name in self.states
+            ]
+            items = clusters[(page - 1) * size : page * size]
+            if len(items) < size:
+                for _name, _state in self.advance.items():
+                    if _state is None:
+                        self.states.pop(_name, None)
+                    else:
+                        self.states[_name] = _state
+
+            return FakeClustersList(items=items)
+
+
+def test_ocm_status_poller_shared_list_query():
+    names = [f"cluster-{idx}" for idx in range(5)]
+    client = FakeOcmClient(states={_name: "installing" for _name in names})
+    poller = OcmStatusPoller(ocm_client=client, min_interval=0.05, max_interval=0.1)
+
+    def _set_ready():
+        time.sleep(0.3)
+        client.states.update({_name: "ready" for _name in names})
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        executor.submit(_set_ready)
+        results = list(executor.map(lambda _name: poller.wait_for_cluster_ready(name=_name, wait_timeout=5), names))
+
+    assert [_result.name for _result in results] == names
+    # All the waiters are served by the same list queries, not one query per cluster per interval
+    assert len(client.calls) < 5 * len(names)
+    assert re.findall(r"'([^']+)'", client.calls[-1][0]) == names
+
+
+def test_ocm_status_poller_one_query_per_interval_with_install_logs():
+    names = [f"cluster-{idx}" for idx in range(5)]
+    client = FakeOcmClient(states={_name: "installing" for _name in names}, install_logs=["level=info msg=Waiting"])
+    poller = OcmStatusPoller(ocm_client=client, min_interval=0.05, max_interval=0.05, install_logs_interval=0.25)
+
+    def _set_ready():
+        time.sleep(0.6)
+        client.states.update({_name: "ready" for _name in names})
+
+    start_time = time.monotonic()
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        executor.submit(_set_ready)
+        list(
+            executor.map(
+                lambda _name: poller.wait_for_cluster_ready(name=_name, wait_timeout=5, fatal_patterns=["msg=boom"]),
+                names,
+            )
+        )
+
+    elapsed = time.monotonic() - start_time
+    # Install logs fetches do not add status queries: one single page list query per interval for all the clusters
+    # (and one per new wait, checked right away)
+    assert [_call[1] for _call in client.calls] == [1] * len(client.calls)
+    assert len(client.calls) <= elapsed / 0.05 + len(names) + 1
+    # Install logs are fetched once per install logs interval per cluster, not on every status poll
+    assert len(client.calls) > 6
+    assert len(client.install_logs_offsets) <= len(names) * (elapsed / 0.25 + 1)
+
+
+def test_ocm_status_poller_pagination():
+    names = [f"cluster-{idx}" for idx in range(5)]
+    client = FakeOcmClient(states={_name: "ready" for _name in names})
+    poller = OcmStatusPoller(ocm_client=client, page_size=2)
+
+    assert sorted(poller.list_clusters(names=names)) == names
+    assert [_call[1] for _call in client.calls] == [1, 2, 3]
+
+
+def test_ocm_status_poller_error_state():
+    client = FakeOcmClient(states={"cluster-1": "installing"}, advance={"cluster-1": "error"})
+    poller = OcmStatusPoller(ocm_client=client, min_interval=0.01)
+    with pytest.raises(OcmClusterStateError):
+        poller.wait_for_cluster_ready(name="cluster-1", wait_timeout=5)
+
+
+def test_ocm_status_poller_fatal_status_description():
+    client = FakeOcmClient(
+        states={"cluster-1": "installing"},
+        descriptions={"cluster-1": "Failed: VcpuLimitExceeded: You have requested more vCPU capacity"},
+    )
+    poller = OcmStatusPoller(ocm_client=client, min_interval=0.01)
+    with pytest.raises(OcmClusterStateError, match="VcpuLimitExceeded"):
+        poller.wait_for_cluster_ready(name="cluster-1", wait_timeout=5, fatal_patterns=list(OCM_DEFAULT_FATAL_PATTERNS))
+
+
+def test_ocm_status_poller_fatal_install_logs():
+    client = FakeOcmClient(
+        states={"cluster-1": "installing"},
+        install_logs=[
+            "level=info msg=Creating infrastructure resources",
+            "level=info msg=Waiting",
+            "level=error msg=boom",
+        ],
+    )
+    poller = OcmStatusPoller(ocm_client=client, min_interval=0.01, install_logs_interval=0)
+    with pytest.raises(OcmClusterStateError, match="msg=boom"):
+        poller.wait_for_cluster_ready(name="cluster-1", wait_timeout=5, fatal_patterns=["msg=boom"])
+
+    # Install logs are read incrementally
+    assert client.install_logs_offsets == [0, 1, 2]
+
+
+def test_ocm_status_poller_install_logs_only_while_installing():
+    client = FakeOcmClient(
+        states={"cluster-1": "validating"},
+        advance={"cluster-1": "ready"},
+        install_logs=["level=error msg=boom"],
+    )
+    poller = OcmStatusPoller(ocm_client=client, min_interval=0.01, install_logs_interval=0)
+    assert poller.wait_for_cluster_ready(name="cluster-1", wait_timeout=5, fatal_patterns=["msg=boom"]).state == "ready"
+    assert client.install_logs_offsets == []
+
+
+def test_ocm_status_poller_no_fatal_patterns():
+    client = FakeOcmClient(
+        states={"cluster-1": "installing"},
+        descriptions={"cluster-1": "VcpuLimitExceeded"},
+        advance={"cluster-1": "ready"},
+    )
+    poller = OcmStatusPoller(ocm_client=client, min_interval=0.01)
+    assert poller.wait_for_cluster_ready(name="cluster-1", wait_timeout=5).state == "ready"
+    assert client.install_logs_offsets == []
+
+
+@pytest.mark.parametrize(
+    "cluster_data, extra_patterns",
+    [
+        pytest.param({}, [], id="default"),
+        pytest.param({"ocm-fatal-patterns": "NoSuchBucket, InvalidAMIID"}, ["NoSuchBucket", "InvalidAMIID"], id="str"),
+        pytest.param({"ocm-fatal-patterns": ["NoSuchBucket"]}, ["NoSuchBucket"], id="list"),
+    ],
+)
+def test_get_ocm_fatal_patterns(cluster_data, extra_patterns):
+    assert get_ocm_fatal_patterns(cluster_data=cluster_data) == [*OCM_DEFAULT_FATAL_PATTERNS, *extra_patterns]
+
+
+def test_ocm_status_poller_deletion():
+    client = FakeOcmClient(states={"cluster-1": "uninstalling"}, advance={"cluster-1": None})
+    poller = OcmStatusPoller(ocm_client=client, min_interval=0.01)
+    poller.wait_for_cluster_deletion(name="cluster-1", wait_timeout=5)
+    assert len(client.calls) == 2
+
+
+def test_ocm_status_poller_timed_out_wait_does_not_stop_poller():
+    client = FakeOcmClient(states={"cluster-a": "installing", "cluster-b": "installing"})
+    poller = OcmStatusPoller(ocm_client=client, min_interval=0.01)
+
+    def _slow_check(cluster):
+        # The wait times out while its check is running
+        time.sleep(0.3)
+        return True
+
+    def _set_ready():
+        time.sleep(0.5)
+        client.states["cluster-b"] = "ready"
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        wait_a = executor.submit(poller.wait, name="cluster-a", check=_slow_check, wait_timeout=0.1)
+        executor.submit(_set_ready)
+        assert poller.wait_for_cluster_ready(name="cluster-b", wait_timeout=5).state == "ready"
+
+    with pytest.raises(TimeoutExpiredError):
+        wait_a.result()
+
+
+def test_ocm_status_poller_timeout():
+    client = FakeOcmClient(states={"cluster-1": "installing"})
+    poller = OcmStatusPoller(ocm_client=client, min_interval=0.01)
+    with pytest.raises(TimeoutExpiredError):
+        poller.wait_for_cluster_ready(name="cluster-1", wait_timeout=0.1)
@@ -0,0 +1,55 @@
+import json
+import os
+import stat
+
+import pytest
+
+from openshift_cli_installer.utils import general
+from openshift_cli_installer.utils.general import generate_unified_pull_secret, get_unified_pull_secret_file
+
+
+@pytest.fixture
+def pull_secret_files(tmp_path):
+    registry_config_file = tmp_path / "registry-config.json"
+    registry_config_file.write_text(json.dumps({"auths": {"quay.io": {"auth": "cXVheQ=="}}}))
+    docker_config_file = tmp_path / "docker-config.json"
+    docker_config_file.write_text(json.dumps({"auths": {"registry.ci.openshift.org": {"auth": "Y2k="}}}))
+    yield str(registry_config_file), str(docker_config_file)
+
+    generate_unified_pull_secret.cache_clear()
+    get_unified_pull_secret_file.cache_clear()
+
+
+def test_generate_unified_pull_secret_once(pull_secret_files, monkeypatch):
+    registry_config_file, docker_config_file = pull_secret_files
+    pull_secret = generate_unified_pull_secret(
+        registry_config_file=registry_config_file, docker_config_file=docker_config_file
+    )
+    assert set(json.loads(pull_secret)["auths"]) == {"quay.io", "registry.ci.openshift.org"}
+
+    monkeypatch.setattr(general, "get_pull_secret_data", pytest.fail)
+    assert (
+        generate_unified_pull_secret(registry_config_file=registry_config_file, docker_config_file=docker_config_file)
+        == pull_secret
+    )
+
+
+def test_get_unified_pull_secret_file(pull_secret_files, tmp_path, monkeypatch):
+    secrets_dir = tmp_path / "shm"
+    secrets_dir.mkdir()
+    monkeypatch.setattr(general, "SECRETS_TMPFS_DIRECTORY", str(secrets_dir))
+    registry_config_file, docker_config_file = pull_secret_files
+
+    pull_secret_file = get_unified_pull_secret_file(
+        registry_config_file=registry_config_file, docker_config_file=docker_config_file
+    )
+    assert os.path.dirname(pull_secret_file) == str(secrets_dir)
+    assert stat.S_IMODE(os.stat(pull_secret_file).st_mode) == 0o600
+    with open(pull_secret_file) as fd:
+        assert "registry.ci.openshift.org" in json.load(fd)["auths"]
+
+    assert (
+        get_unified_pull_secret_file(registry_config_file=registry_config_file, docker_config_file=docker_config_file)
+        == pull_secret_file
+    )
+    os.remove(pull_secret_file)
@@ -0,0 +1,110 @@
+import pytest
+from kubernetes.client.rest import ApiException
+from timeout_sampler import TimeoutExpiredError
+
+from openshift_cli_installer.utils.resource_wait import wait_for_resource
+
+
+class FakeResourceList:
+    def __init__(self, resource_list):
+        self.resource_list = resource_list
+
+    def to_dict(self):
+        return self.resource_list
+
+
+class FakeResources:
+    def get(self, api_version, kind):
+        return kind
+
+
+class FakeDynamicClient:
+    """
+    Serves `lists` for `get` calls and `watches` (events lists or exceptions) for `watch` calls, in order.
+    """
+
+    def __init__(self, lists, watches):
+        self.resources = FakeResources()
+        self.lists = lists
+        self.watches = watches
+        self.watch_resource_versions = []
+
+    def get(self, resource, namespace, field_selector):
+        return FakeResourceList(resource_list=self.lists.pop(0))
+
+    def watch(self, resource, namespace, field_selector, resource_version, timeout):
+        self.watch_resource_versions.append(resource_version)
+        events = self.watches.pop(0) if self.watches else []
+        if isinstance(events, Exception):
+            raise events
+
+        yield from events
+
+
+def group(users, resource_version):
+    return {"metadata": {"name": "cluster-admins", "resourceVersion": resource_version}, "users": users}
+
+
+def group_list(users, resource_version):
+    return {"metadata": {"resourceVersion": resource_version}, "items": [group(users, resource_version)]}
+
+
+def wait_for_rosa_admin(client, wait_timeout=5):
+    return wait_for_resource(
+        client=client,
+        api_version="user.openshift.io/v1",
+        kind="Group",
+        name="cluster-admins",
+        condition=lambda _group: "rosa-admin" in (_group.get("users") or []),
+        wait_timeout=wait_timeout,
+        poll_interval=0.01,
+    )
+
+
+def test_wait_for_resource_already_ready():
+    client = FakeDynamicClient(lists=[group_list(users=["rosa-admin"], resource_version="1")], watches=[])
+    assert wait_for_rosa_admin(client=client)["users"] == ["rosa-admin"]
+    assert client.watch_resource_versions == []
+
+
+def test_wait_for_resource_watch_resumes():
+    client = FakeDynamicClient(
+        lists=[group_list(users=None, resource_version="1")],
+        watches=[
+            [{"type": "MODIFIED", "raw_object": group(users=["other"], resource_version="2")}],
+            [{"type": "MODIFIED", "raw_object": group(users=["other", "rosa-admin"], resource_version="3")}],
+        ],
+    )
+    assert wait_for_rosa_admin(client=client)["metadata"]["resourceVersion"] == "3"
+    assert client.watch_resource_versions == ["1", "2"]
+
+
+def test_wait_for_resource_relists_on_gone():
+    client = FakeDynamicClient(
+        lists=[group_list(users=None, resource_version="1"), group_list(users=None, resource_version="7")],
+        watches=[
+            ApiException(status=410),
+            [{"type": "ADDED", "raw_object": group(users=["rosa-admin"], resource_version="8")}],
+        ],
+    )
+    wait_for_rosa_admin(client=client)
+    assert client.watch_resource_versions == ["1", "7"]
+
+
+def test_wait_for_resource_polling_fallback():
+    client = FakeDynamicClient(
+        lists=[
+            group_list(users=None, resource_version="1"),
+            group_list(users=None, resource_version="2"),
+            group_list(users=["rosa-admin"], resource_version="3"),
+        ],
+        watches=[ApiException(status=403)],
+    )
+    assert wait_for_rosa_admin(client=client)["metadata"]["resourceVersion"] == "3"
+    assert client.watch_resource_versions == ["1"]
+
+
+def test_wait_for_resource_timeout():
+    client = FakeDynamicClient(lists=[group_list(users=None, resource_version="1")], watches=[])
+    with pytest.raises(TimeoutExpiredError):
+        wait_for_rosa_admin(client=client, wait_timeout=0.1)
@@ -0,0 +1,146 @@
+import json
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import rosa.cli
+
+from openshift_cli_installer.utils import rosa_cli
+from openshift_cli_installer.utils.const import ROSA_LEFTOVER_NOT_FOUND_ERROR_PATTERN
+from openshift_cli_installer.utils.rosa_cli import RosaCli
+
+
+@pytest.fixture
+def rosa_calls(monkeypatch):
+    calls = []
+
+    def _execute(command, aws_region, ocm_client):
+        calls.append(command)
+        time.sleep(0.05)
+        if command.startswith("fail"):
+            raise rosa.cli.CommandExecuteError("throttled")
+
+        return {"out": [{"id": "us-west-2"}]}
+
+    monkeypatch.setattr(rosa.cli, "execute", _execute)
+    monkeypatch.setattr(rosa_cli, "ROSA_CLI_RETRY_SLEEP_SECONDS", 0)
+    return calls
+
+
+def test_rosa_cli_read_only_cache(rosa_calls):
+    _rosa_cli = RosaCli()
+    _rosa_cli.execute(command="list regions", aws_region="us-west-2", ocm_client=None)
+    res = _rosa_cli.execute(command="list regions", aws_region="us-west-2", ocm_client=None)
+    res["out"].clear()
+    _rosa_cli.execute(command="list regions", aws_region="us-east-1", ocm_client=None)
+
+    assert rosa_calls == ["list regions", "list regions"]
+    assert _rosa_cli.execute(command="list regions", aws_region="us-west-2", ocm_client=None)["out"]
+
+
+def test_rosa_cli_single_flight(rosa_calls):
+    _rosa_cli = RosaCli()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(
+            executor.map(
+                lambda _: _rosa_cli.execute(command="list regions", aws_region="us-west-2", ocm_client=None), range(8)
+            )
+        )
+
+    assert rosa_calls == ["list regions"]
+    assert len(results) == 8
+
+
+def test_rosa_cli_mutating_commands(rosa_calls):
+    _rosa_cli = RosaCli()
+    _rosa_cli.execute(command="list oidc-config", aws_region="us-west-2", ocm_client=None)
+    _rosa_cli.execute(command="create oidc-config --managed=true", aws_region="us-west-2", ocm_client=None)
+    _rosa_cli.execute(command="create oidc-config --managed=true", aws_region="us-west-2", ocm_client=None)
+    _rosa_cli.execute(command="list oidc-config", aws_region="us-west-2", ocm_client=None)
+
+    assert rosa_calls == [
+        "list oidc-config",
+        "create oidc-config --managed=true",
+        "create oidc-config --managed=true",
+        "list oidc-config",
+    ]
+
+
+def test_rosa_cli_ttl(rosa_calls):
+    _rosa_cli = RosaCli(ttl=0)
+    _rosa_cli.execute(command="list regions", aws_region="us-west-2", ocm_client=None)
+    _rosa_cli.execute(command="list regions", aws_region="us-west-2", ocm_client=None)
+
+    assert len(rosa_calls) == 2
+
+
+def test_rosa_cli_calls_log(rosa_calls, tmp_path):
+    log_file = tmp_path / "rosa-cli-calls.jsonl"
+    _rosa_cli = RosaCli(log_file=str(log_file))
+    _rosa_cli.execute(command="list regions", aws_region="us-west-2", ocm_client=None)
+    _rosa_cli.execute(command="list regions", aws_region="us-west-2", ocm_client=None)
+    with pytest.raises(rosa.cli.CommandExecuteError):
+        _rosa_cli.execute(command="fail --token=secret", aws_region="us-west-2", ocm_client=None, retries=2)
+
+    records = [json.loads(_line) for _line in log_file.read_text().splitlines()]
+    assert [(_record["cached"], _record["exit-code"], _record["retries"]) for _record in records] == [
+        (False, 0, 0),
+        (True, 0, 0),
+        (False, 1, 2),
+    ]
+    assert records[0]["latency"] >= 0.05
+    assert "secret" not in records[2]["command"]
+    assert len(rosa_calls) == 4
+
+
+def test_rosa_cli_calls_log_secrets(rosa_calls, tmp_path):
+    log_file = tmp_path / "rosa-cli-calls.jsonl"
+    RosaCli(log_file=str(log_file)).execute(
+        command=(
+            "create idp --type=htpasswd --cluster=hyper1 --username=admin --password=Pa55w0rd "
+            "--client-secret 'cl13nt s3cr3t'"
+        ),
+        aws_region="us-west-2",
+        ocm_client=None,
+    )
+
+    log_line = log_file.read_text()
+    assert "Pa55w0rd" not in log_line
+    assert "s3cr3t" not in log_line
+    assert "--username=admin" in log_line
+
+
+@pytest.mark.parametrize(
+    "retry_pattern, calls",
+    [
+        pytest.param("throttled", 3, id="retried"),
+        pytest.param("NoSuchEntity", 1, id="not-retried"),
+    ],
+)
+def test_rosa_cli_retry_pattern(rosa_calls, retry_pattern, calls):
+    with pytest.raises(rosa.cli.CommandExecuteError):
+        RosaCli().execute(
+            command="fail delete operator-roles --prefix=hyper1",
+            aws_region="us-west-2",
+            ocm_client=None,
+            retries=2,
+            retry_pattern=retry_pattern,
+        )
+
+    assert len(rosa_calls) == calls
+
+
+@pytest.mark.parametrize(
+    "error, already_removed",
+    [
+        pytest.param("An error occurred (NoSuchEntity) when calling the GetRole operation", True, id="no-such-entity"),
+        pytest.param("There are no operator roles to delete for cluster 'hyper1'", True, id="no-operator-roles"),
+        pytest.param("There is no OIDC provider to delete for cluster 'hyper1'", True, id="no-oidc-provider"),
+        pytest.param("Cluster 'hyper1' not found", False, id="cluster-not-found"),
+        pytest.param("The config profile (default) could not be found", False, id="profile-not-found"),
+        pytest.param("aws: command not found", False, id="binary-not-found"),
+    ],
+)
+def test_rosa_leftover_not_found_error_pattern(error, already_removed):
+    assert bool(re.search(ROSA_LEFTOVER_NOT_FOUND_ERROR_PATTERN, error)) is already_removed
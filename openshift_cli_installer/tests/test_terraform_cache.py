@@ -0,0 +1,89 @@
+import os
+import shutil
+import textwrap
+from concurrent.futures import ThreadPoolExecutor
+
+
+from openshift_cli_installer.utils.general import get_manifests_path
+from openshift_cli_installer.utils.terraform_cache import CachedTerraform, TerraformCache
+
+FAKE_TERRAFORM = textwrap.dedent(
+    """\
+    if sys.argv[1] == "init":
+        os.makedirs(".terraform/modules/vpc")
+        with open(".terraform/modules/modules.json", "w") as fd:
+            json.dump(
+                {
+                    "Modules": [
+                        {"Key": "", "Source": "", "Dir": "."},
+                        {
+                            "Key": "vpc",
+                            "Source": "registry.terraform.io/terraform-aws-modules/vpc/aws",
+                            "Version": "5.8.1",
+                            "Dir": ".terraform/modules/vpc",
+                        },
+                    ]
+                },
+                fd,
+            )
+    """
+)
+
+
+def test_terraform_cache_seeds_once(fake_terraform, tmp_path):
+    terraform_cache = TerraformCache(cache_dir=str(tmp_path / "cache"))
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        seed_dirs = set(
+            executor.map(lambda _: terraform_cache.seed(terraform_file=terraform_cache.seed_terraform_file()), range(4))
+        )
+
+    assert len(seed_dirs) == 1
+    assert fake_terraform.read_text().splitlines() == [
+        "init -backend=false -input=false",
+        f"providers mirror {terraform_cache.providers_mirror_dir}",
+    ]
+
+
+def test_terraform_cache_prepare_workspace(fake_terraform, tmp_path):
+    terraform_cache = TerraformCache(cache_dir=str(tmp_path / "cache"))
+    working_dir = tmp_path / "cluster"
+    working_dir.mkdir()
+    shutil.copy(os.path.join(get_manifests_path(), "setup-vpc.tf"), working_dir)
+
+    env = terraform_cache.prepare_workspace(working_dir=str(working_dir))
+
+    terraform_file = (working_dir / "setup-vpc.tf").read_text()
+    seed_dir = terraform_cache.seed_dir(terraform_file=terraform_cache.seed_terraform_file())
+    assert f'source = "{os.path.join(seed_dir, ".terraform/modules/vpc")}"' in terraform_file
+    assert "terraform-aws-modules/vpc/aws" not in terraform_file
+    assert "version" not in terraform_file
+    assert env == {"TF_CLI_CONFIG_FILE": terraform_cache.cli_config_file}
+    # The CLI config is passed per terraform command, the process environment is not changed
+    assert "TF_CLI_CONFIG_FILE" not in os.environ
+    assert terraform_cache.providers_mirror_dir in (tmp_path / "cache" / "terraform.tfrc").read_text()
+    assert CachedTerraform(env=env, working_dir=str(working_dir)).generate_cmd_string("init") == [
+        "env",
+        f"TF_CLI_CONFIG_FILE={terraform_cache.cli_config_file}",
+        "terraform",
+        "init",
+    ]
+
+
+def test_terraform_cache_user_cli_config(fake_terraform, tmp_path, monkeypatch):
+    monkeypatch.setenv("TF_CLI_CONFIG_FILE", str(tmp_path / "user.tfrc"))
+    working_dir = tmp_path / "cluster"
+    working_dir.mkdir()
+    shutil.copy(os.path.join(get_manifests_path(), "setup-vpc.tf"), working_dir)
+
+    assert TerraformCache(cache_dir=str(tmp_path / "cache")).prepare_workspace(working_dir=str(working_dir)) == {}
+
+
+def test_terraform_cache_seed_failure_falls_back(tmp_path, monkeypatch):
+    monkeypatch.setenv("PATH", str(tmp_path))
+    monkeypatch.delenv("TF_CLI_CONFIG_FILE", raising=False)
+    working_dir = tmp_path / "cluster"
+    working_dir.mkdir()
+    shutil.copy(os.path.join(get_manifests_path(), "setup-vpc.tf"), working_dir)
+
+    assert TerraformCache(cache_dir=str(tmp_path / "cache")).prepare_workspace(working_dir=str(working_dir)) == {}
+    assert "terraform-aws-modules/vpc/aws" in (working_dir / "setup-vpc.tf").read_text()
@@ -0,0 +1,40 @@
+import os
+
+import pytest
+
+from openshift_cli_installer.utils.terraform_state import (
+    TerraformStateBackendError,
+    get_terraform_state_backend,
+    write_terraform_backend_file,
+)
+
+
+@pytest.mark.parametrize(
+    "backend_url, key",
+    [
+        pytest.param("s3://tf-state", "hyper1-abc/terraform.tfstate", id="bucket"),
+        pytest.param("s3://tf-state/hypershift/", "hypershift/hyper1-abc/terraform.tfstate", id="prefix"),
+    ],
+)
+def test_terraform_state_s3_backend(backend_url, key, monkeypatch):
+    monkeypatch.delenv("AWS_REGION", raising=False)
+    backend = get_terraform_state_backend(backend_url=backend_url, name="hyper1-abc", region="us-west-2")
+    assert backend == {
+        "type": "s3",
+        "config": {"bucket": "tf-state", "key": key, "region": "us-west-2", "use_lockfile": "true"},
+    }
+
+
+def test_terraform_state_local_backend(tmp_path):
+    backend = get_terraform_state_backend(backend_url=str(tmp_path), name="hyper1-abc", region="us-west-2")
+    backend_config = write_terraform_backend_file(working_dir=str(tmp_path), backend=backend)
+
+    assert backend_config == {"path": os.path.join(tmp_path, "hyper1-abc", "terraform.tfstate")}
+    assert os.path.isdir(tmp_path / "hyper1-abc")
+    assert 'backend "local" {}' in (tmp_path / "backend.tf").read_text()
+
+
+@pytest.mark.parametrize("backend_url", ["s3://", "gs://tf-state"])
+def test_terraform_state_invalid_backend(backend_url):
+    with pytest.raises(TerraformStateBackendError):
+        get_terraform_state_backend(backend_url=backend_url, name="hyper1-abc", region="us-west-2")
@@ -155,7 +155,8 @@ CLUSTER_DATA_DIR = "/tmp/cinstall"
                 "registry_config_file": "reg.json",
                 "clusters": [{"name": "test-cl", "platform": GCP_STR}],
             },
-            "`--gcp-service-account-file` option must be provided for gcp-osd and gcp clusters",
+            "`--gcp-service-account-file` option or `gcp-service-account-file` cluster parameter must be provided for"
+            " gcp-osd and gcp clusters",
         ),
         (
             {
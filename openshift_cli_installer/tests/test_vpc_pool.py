@@ -0,0 +1,124 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from openshift_cli_installer.utils.general import get_aws_az_ids
+from openshift_cli_installer.utils.vpc_pool import FAILED_FILENAME, VPC_DATA_FILENAME, VpcPool, VpcPoolError
+
+
+class FakeTerraform:
+    def __init__(self, apply_rc=0, destroy_rcs=(0,), output=None):
+        self.apply_rc = apply_rc
+        self.destroy_rcs = list(destroy_rcs)
+        self._output = output or {}
+        self.destroy_calls = 0
+
+    def apply(self, **kwargs):
+        return self.apply_rc, "", "apply error" if self.apply_rc else ""
+
+    def destroy(self, **kwargs):
+        self.destroy_calls += 1
+        rc = self.destroy_rcs.pop(0) if self.destroy_rcs else 0
+        return rc, "", "destroy error" if rc else ""
+
+    def output(self):
+        return self._output
+
+
+@pytest.fixture
+def vpc_pool(tmp_path, monkeypatch):
+    provisioned = []
+
+    def _provision(self, name, cidr):
+        provisioned.append(name)
+        vpc_data = {"vpc-id": f"vpc-{name}", "cidr": cidr, "subnets": [f"subnet-{name}-1", f"subnet-{name}-2"]}
+        self.write_json(name=name, filename=VPC_DATA_FILENAME, data=vpc_data)
+        return vpc_data
+
+    monkeypatch.setattr(VpcPool, "provision", _provision)
+    pool = VpcPool(pool_dir=str(tmp_path), region="us-east-2")
+    pool.provisioned = provisioned
+    return pool
+
+
+def test_get_aws_az_ids():
+    assert get_aws_az_ids(region="us-east-2") == ["use2-az1", "use2-az2"]
+    assert get_aws_az_ids(region="ap-southeast-1") == ["aps1-az1", "aps1-az2"]
+
+
+def test_vpc_pool_lease_reuses_released_vpc(vpc_pool):
+    lease = vpc_pool.lease(cluster_name="c1")
+    assert lease.vpc_id == f"vpc-{lease.name}"
+    assert vpc_pool.lease(cluster_name="c2").name != lease.name
+
+    vpc_pool.release(name=lease.name, cluster_name="c1")
+    assert vpc_pool.lease(cluster_name="c3").name == lease.name
+    assert len(vpc_pool.provisioned) == 2
+
+
+def test_vpc_pool_release_other_cluster_lease(vpc_pool):
+    lease = vpc_pool.lease(cluster_name="c1")
+    vpc_pool.release(name=lease.name, cluster_name="c2")
+    assert vpc_pool.lease(cluster_name="c3").name != lease.name
+
+
+def test_vpc_pool_concurrent_leases_are_unique(vpc_pool):
+    vpc_pool.lease(cluster_name="c0")
+    vpc_pool.release(name=vpc_pool.provisioned[0], cluster_name="c0")
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        leases = list(executor.map(lambda _idx: vpc_pool.lease(cluster_name=f"c{_idx}"), range(1, 6)))
+
+    assert len({_lease.name for _lease in leases}) == 5
+    assert len(vpc_pool.provisioned) == 5
+
+
+def test_vpc_pool_failed_provision_removes_vpc(vpc_pool, monkeypatch):
+    def _provision(self, name, cidr):
+        raise VpcPoolError("apply failed")
+
+    monkeypatch.setattr(VpcPool, "provision", _provision)
+    with pytest.raises(VpcPoolError):
+        vpc_pool.lease(cluster_name="c1")
+
+    assert not vpc_pool.vpcs()
+
+
+@pytest.fixture
+def fake_terraform(monkeypatch):
+    terraform = FakeTerraform(apply_rc=1)
+    monkeypatch.setattr(VpcPool, "terraform", lambda self, name, cidr: terraform)
+    return terraform
+
+
+def test_vpc_pool_failed_rollback_keeps_workspace(tmp_path, fake_terraform):
+    fake_terraform.destroy_rcs = [1]
+    vpc_pool = VpcPool(pool_dir=str(tmp_path), region="us-east-2")
+    with pytest.raises(VpcPoolError):
+        vpc_pool.lease(cluster_name="c1")
+
+    assert len(vpc_pool.vpcs()) == 1
+    name = vpc_pool.vpcs()[0]
+    assert vpc_pool.read_json(name=name, filename=FAILED_FILENAME)["cidr"] == "10.0.0.0/16"
+
+    # Failed VPCs are not leased, and their destroy is retried when a VPC is released
+    fake_terraform.apply_rc = 0
+    fake_terraform._output = {
+        "vpc-id": {"value": "vpc-1"},
+        "private-subnets": {"value": ["subnet-1"]},
+        "public-subnets": {"value": ["subnet-2"]},
+    }
+    lease = vpc_pool.lease(cluster_name="c2")
+    assert lease.name != name
+    vpc_pool.release(name=lease.name, cluster_name="c2")
+    assert vpc_pool.vpcs() == [lease.name]
+    assert fake_terraform.destroy_calls == 2
+
+
+def test_vpc_pool_failed_output_rolls_back(tmp_path, fake_terraform):
+    fake_terraform.apply_rc = 0
+    vpc_pool = VpcPool(pool_dir=str(tmp_path), region="us-east-2")
+    with pytest.raises(VpcPoolError):
+        vpc_pool.lease(cluster_name="c1")
+
+    assert fake_terraform.destroy_calls == 1
+    assert not vpc_pool.vpcs()
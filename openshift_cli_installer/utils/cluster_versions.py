@@ -1,10 +1,17 @@
+from __future__ import annotations
 import re
-from typing import Any, Dict, List
+from abc import ABC, abstractmethod
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from typing import Any, Dict, List, NamedTuple, Tuple, Type
+from urllib.parse import quote, urlparse
 
 import click
 from simple_logger.logger import get_logger
 import requests
-from bs4 import BeautifulSoup
+from ocm_python_client.api.default_api import DefaultApi
+from ocm_python_wrapper.versions import Versions
 import sys
 
 from openshift_cli_installer.utils.const import (
@@ -13,6 +20,11 @@ from openshift_cli_installer.utils.const import (
     HYPERSHIFT_STR,
     ROSA_STR,
     IPI_BASED_PLATFORMS,
+    IPI_VERSION_SOURCE,
+    OPENSHIFT_RELEASE_URL,
+    OSD_VERSION_SOURCE,
+    ROSA_VERSION_SOURCE,
+    STAGE_STR,
 )
 
 version = sys.version_info
@@ -69,23 +81,263 @@ def get_cluster_stream(cluster_data: Dict[str, Any]) -> str:
     return cluster_data["stream"] if _platform in IPI_BASED_PLATFORMS else cluster_data["channel-group"]
 
 
-@cache
-def get_ipi_cluster_versions() -> Dict[str, Dict[str, List[str]]]:
-    _source = "openshift-release.apps.ci.l2s4.p1.openshiftapps.com"
-    _accepted_version_dict: Dict[str, Dict[str, List[str]]] = {_source: {}}
-    for tr in parse_openshift_release_url():
-        _version, status = [_tr for _tr in tr.text.splitlines() if _tr][:2]
-        if status == "Accepted":
+class ReleaseSourceError(Exception):
+    pass
+
+
+class ReleaseTag(NamedTuple):
+    version: str
+    phase: str
+    pullspec: str
+
+
+class ReleaseSource(ABC):
+    """
+    Base class for IPI release catalogs.
+
+    A release source lists the accepted OCP versions and resolves a version to its release image pullspec,
+    which is later used to extract the `openshift-install` binary.
+    """
+
+    def __init__(self, base_url: str = OPENSHIFT_RELEASE_URL) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.logger = get_logger(f"{self.__class__.__module__}-{self.__class__.__name__}")
+
+    @property
+    def name(self) -> str:
+        return urlparse(self.base_url).netloc
+
+    @abstractmethod
+    def accepted_versions(self) -> Dict[str, List[str]]:
+        """
+        Returns:
+            dict: Accepted versions grouped by `x.y` version key, newest first.
+        """
+
+    @abstractmethod
+    def get_pullspec(self, version: str) -> str:
+        pass
+
+
+class ReleaseControllerApiSource(ReleaseSource):
+    """
+    Release controller JSON API backend.
+
+    `/api/v1/releasestreams/accepted` lists the release streams and `/api/v1/releasestream/<stream>/tags`
+    returns every tag of a stream with its phase and pullspec, so one request per stream is enough to resolve
+    both the available versions and the release image of each version.
+    """
+
+    def __init__(self, base_url: str = OPENSHIFT_RELEASE_URL) -> None:
+        super().__init__(base_url=base_url)
+        self._streams: Dict[str, List[ReleaseTag]] = {}
+        self._pullspecs: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def streams(self) -> Dict[str, List[ReleaseTag]]:
+        with self._lock:
+            if not self._streams:
+                self._streams = self._get_streams()
+                # Index pullspecs by version; a catalog holds thousands of nightly and ci tags
+                self._pullspecs = {tag.version: tag.pullspec for tags in self._streams.values() for tag in tags}
+
+        return self._streams
+
+    def _get_json(self, path: str) -> Any:
+        url = f"{self.base_url}{path}"
+        self.logger.info(f"Fetching {url}")
+        res = requests.get(url, timeout=60)
+        res.raise_for_status()
+        return res.json()
+
+    def _get_stream_tags(self, stream: str) -> List[ReleaseTag]:
+        return [
+            ReleaseTag(version=tag["name"], phase=tag["phase"], pullspec=tag["pullSpec"])
+            for tag in self._get_json(path=f"/api/v1/releasestream/{quote(stream)}/tags").get("tags", [])
+        ]
+
+    def _get_streams(self) -> Dict[str, List[ReleaseTag]]:
+        # Keep the release page order: stable (GA and rc) streams first, then dev-preview (ec), then nightly/ci.
+        stream_names = sorted(
+            self._get_json(path="/api/v1/releasestreams/accepted"),
+            key=lambda _stream: (_stream != "4-stable", _stream != "4-dev-preview", _stream),
+        )
+        with ThreadPoolExecutor() as executor:
+            stream_tags = executor.map(lambda _stream: self._get_stream_tags(stream=_stream), stream_names)
+            return dict(zip(stream_names, stream_tags))
+
+    def accepted_versions(self) -> Dict[str, List[str]]:
+        _accepted_versions: Dict[str, List[str]] = {}
+        for tags in self.streams.values():
+            for tag in tags:
+                if tag.phase == "Accepted":
+                    _version_key = re.findall(r"^\d+.\d+", tag.version)[0]
+                    _accepted_versions.setdefault(_version_key, []).append(tag.version)
+
+        return _accepted_versions
+
+    def get_pullspec(self, version: str) -> str:
+        if self.streams and (pullspec := self._pullspecs.get(version)):
+            return pullspec
+
+        raise ReleaseSourceError(f"Version {version} not found in {self.name}")
+
+
+class ReleaseControllerHtmlSource(ReleaseSource):
+    """
+    Release controller HTML backend, used as a fallback when the JSON API is not available.
+
+    Versions are scraped from the release page table rows and the pullspec from each version details page.
+    """
+
+    def accepted_versions(self) -> Dict[str, List[str]]:
+        _accepted_versions: Dict[str, List[str]] = {}
+        for row in parse_openshift_release_url(url=self.base_url):
+            if row.phase == "Accepted":
+                _version_key = re.findall(r"^\d+.\d+", row.version)[0]
+                _accepted_versions.setdefault(_version_key, []).append(row.version)
+
+        return _accepted_versions
+
+    def get_pullspec(self, version: str) -> str:
+        for row in parse_openshift_release_url(url=self.base_url):
+            if row.version == version and row.href:
+                version_url_match = re.search(
+                    r"oc adm release extract --tools (.*?)<",
+                    requests.get(f"{self.base_url}{row.href}", timeout=60).text,
+                )
+                if version_url_match:
+                    return version_url_match.group(1)
+
+        raise ReleaseSourceError(f"Version {version} not found in {self.name}")
+
+
+IPI_RELEASE_SOURCES: Tuple[Type[ReleaseSource], ...] = (ReleaseControllerApiSource, ReleaseControllerHtmlSource)
+
+
+class ClusterVersionSource(NamedTuple):
+    """
+    Identifies the catalog a cluster version is resolved from; clusters with the same source share one catalog.
+    """
+
+    kind: str
+    ocm_env: str = ""
+    channel_group: str = ""
+    region: str = ""
+    hosted_cp: bool = False
+
+
+def get_cluster_version_source(cluster_data: Dict[str, Any]) -> ClusterVersionSource:
+    _platform = cluster_data["platform"]
+    if _platform in IPI_BASED_PLATFORMS:
+        return ClusterVersionSource(kind=IPI_VERSION_SOURCE)
+
+    ocm_env = cluster_data.get("ocm-env", STAGE_STR)
+    channel_group = cluster_data.get("channel-group", "stable")
+    if _platform in (AWS_OSD_STR, GCP_OSD_STR):
+        return ClusterVersionSource(kind=OSD_VERSION_SOURCE, ocm_env=ocm_env, channel_group=channel_group)
+
+    return ClusterVersionSource(
+        kind=ROSA_VERSION_SOURCE,
+        ocm_env=ocm_env,
+        channel_group=channel_group,
+        region=cluster_data["region"],
+        hosted_cp=_platform == HYPERSHIFT_STR,
+    )
+
+
+def get_osd_versions(ocm_client: DefaultApi, channel_group: str) -> Dict[str, Dict[str, List[str]]]:
+    osd_versions_dict: Dict[str, Dict[str, List[str]]] = {}
+    for channel, versions in Versions(client=ocm_client).get(channel_group=channel_group).items():
+        osd_versions_dict[channel] = {}
+        for _version in versions:
             _version_key = re.findall(r"^\d+.\d+", _version)[0]
-            _accepted_version_dict[_source].setdefault(_version_key, []).append(_version)
+            osd_versions_dict[channel].setdefault(_version_key, []).append(_version)
+
+    return osd_versions_dict
+
 
-    return _accepted_version_dict
+@cache
+def get_ipi_release_source(base_url: str = OPENSHIFT_RELEASE_URL) -> ReleaseSource:
+    """
+    Returns the first release source in `IPI_RELEASE_SOURCES` which is able to list the accepted versions.
+    """
+    for source_class in IPI_RELEASE_SOURCES:
+        source = source_class(base_url=base_url)
+        try:
+            source.accepted_versions()
+            return source
+
+        except (requests.RequestException, ValueError, KeyError) as ex:
+            LOGGER.warning(f"Failed to get versions from {source_class.__name__}: {ex}")
+
+    LOGGER.error(f"Failed to get IPI versions from {base_url}")
+    raise click.Abort()
 
 
 @cache
-def parse_openshift_release_url() -> List[BeautifulSoup]:
-    url = "https://openshift-release.apps.ci.l2s4.p1.openshiftapps.com"
+def get_ipi_cluster_versions(base_url: str = OPENSHIFT_RELEASE_URL) -> Dict[str, Dict[str, List[str]]]:
+    source = get_ipi_release_source(base_url=base_url)
+    return {source.name: source.accepted_versions()}
+
+
+def get_ipi_version_url(version: str, base_url: str = OPENSHIFT_RELEASE_URL) -> str:
+    return get_ipi_release_source(base_url=base_url).get_pullspec(version=version)
+
+
+class ReleaseRow(NamedTuple):
+    version: str
+    phase: str
+    href: str
+
+
+class ReleasePageParser(HTMLParser):
+    """
+    Streaming parser for the release controller page.
+
+    Only the version, phase and details page link of each release table row are kept; no DOM is built.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.rows: List[ReleaseRow] = []
+        self._in_row = False
+        self._row_text: List[str] = []
+        self._row_href = ""
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, str | None]]) -> None:
+        if tag == "tr":
+            self._in_row = True
+            self._row_text = []
+            self._row_href = ""
+
+        elif tag == "a" and self._in_row and not self._row_href:
+            _attrs = dict(attrs)
+            if "text-success" in (_attrs.get("class") or "").split():
+                self._row_href = _attrs.get("href") or ""
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "tr" and self._in_row:
+            self._in_row = False
+            if len(self._row_text) >= 2 and re.match(r"^\d+\.\d+", self._row_text[0]):
+                self.rows.append(ReleaseRow(version=self._row_text[0], phase=self._row_text[1], href=self._row_href))
+
+    def handle_data(self, data: str) -> None:
+        # Only the first two texts of a row (version and phase) are needed
+        if self._in_row and len(self._row_text) < 2 and (_data := data.strip()):
+            self._row_text.append(_data)
+
+
+@cache
+def parse_openshift_release_url(url: str = OPENSHIFT_RELEASE_URL) -> Tuple[ReleaseRow, ...]:
     LOGGER.info(f"Parsing {url}")
-    req = requests.get(url)
-    soup = BeautifulSoup(req.text, "html.parser")
-    return soup.find_all("tr")
+    parser = ReleasePageParser()
+    with requests.get(url, timeout=60, stream=True) as req:
+        req.raise_for_status()
+        req.encoding = req.encoding or "utf-8"
+        for chunk in req.iter_content(chunk_size=64 * 1024, decode_unicode=True):
+            parser.feed(chunk)
+
+    parser.close()
+    return tuple(parser.rows)
@@ -2,8 +2,21 @@
 import os
 
 CLUSTER_DATA_YAML_FILENAME = "cluster_data.yaml"
-USER_INPUT_CLUSTER_BOOLEAN_KEYS = ("acm", "acm-observability", "auto-region")
+USER_INPUT_CLUSTER_BOOLEAN_KEYS = ("acm", "acm-observability", "auto-region", "split-install", "vpc-pool")
 DESTROY_CLUSTERS_FROM_S3_BASE_DATA_DIRECTORY = os.path.join("/", "tmp", "openshift-cli-installer", "s3-extracted")
+OPENSHIFT_RELEASE_URL = "https://openshift-release.apps.ci.l2s4.p1.openshiftapps.com"
+OPENSHIFT_MIRROR_URL = "https://mirror.openshift.com/pub/openshift-v4/x86_64/clients"
+INSTALLER_CACHE_DEFAULT_DIRECTORY = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+    "openshift-cli-installer",
+    "installers",
+)
+INSTALLER_CACHE_DEFAULT_MAX_SIZE_GB = 10.0
+TERRAFORM_CACHE_DEFAULT_DIRECTORY = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+    "openshift-cli-installer",
+    "terraform",
+)
 
 # Cluster types
 AWS_STR = "aws"
@@ -19,6 +32,11 @@ OCM_MANAGED_PLATFORMS = (ROSA_STR, HYPERSHIFT_STR, AWS_OSD_STR, GCP_OSD_STR)
 OBSERVABILITY_SUPPORTED_STORAGE_TYPES = (S3_STR,)
 IPI_BASED_PLATFORMS = (AWS_STR, GCP_STR)
 
+# Cluster version sources
+IPI_VERSION_SOURCE = "ipi"
+OSD_VERSION_SOURCE = "osd"
+ROSA_VERSION_SOURCE = "rosa"
+
 # Cluster actions
 DESTROY_STR = "destroy"
 CREATE_STR = "create"
@@ -30,3 +48,17 @@ STAGE_STR = "stage"
 
 # Timeouts
 TIMEOUT_60MIN = "60m"
+
+# ROSA leftovers (operator roles, OIDC provider etc.) cleanup
+ROSA_LEFTOVERS_MAX_WORKERS = 4
+ROSA_LEFTOVERS_RETRIES = 5
+IAM_THROTTLING_ERROR_PATTERN = r"Throttling|Rate exceeded|TooManyRequests|RequestLimitExceeded"
+# Already deleted resources (AWS IAM and rosa "nothing to delete" errors), the cleanup command is done; other
+# errors (e.g. cluster not found in the OCM environment or region) keep the command pending
+ROSA_LEFTOVER_NOT_FOUND_ERROR_PATTERN = (
+    r"NoSuchEntity|There are no operator roles to delete|There is no OIDC provider to delete"
+    r"|OIDC provider '[^']*' does not exist"
+)
+
+# ACM
+ACM_NAMESPACES = ("open-cluster-management", "open-cluster-management-observability")
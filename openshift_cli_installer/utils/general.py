@@ -1,21 +1,37 @@
 from __future__ import annotations
+import atexit
+import contextlib
 import json
 import os
+import re
 import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from importlib.util import find_spec
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List, Tuple
 
-import click
-import yaml
 from clouds.aws.session_clients import s3_client
-from jinja2 import DebugUndefined, Environment, FileSystemLoader, meta
 from pyhelper_utils.general import ignore_exceptions
 from simple_logger.logger import get_logger
 
 
+version = sys.version_info
+if version[0] == 3 and version[1] < 9:
+    from functools import lru_cache as cache
+else:
+    from functools import cache  # type: ignore[no-redef]
+
+
 LOGGER = get_logger(name=__name__)
 
+# Memory backed, secrets written there never reach the disk
+SECRETS_TMPFS_DIRECTORY = "/dev/shm"
+# Files openshift-install keeps rewriting in the install dir while it runs
+INSTALLER_WORKING_FILES_PATTERNS = (".openshift_install_state.json*", "*.log", ".terraform", "*.tfstate*")
+
 
 def remove_terraform_folder_from_install_dir(install_dir: str) -> None:
     """
@@ -43,6 +59,20 @@ def zip_and_upload_to_s3(install_dir: str, s3_bucket_name: str, s3_bucket_object
     s3_client().upload_file(Filename=zip_file, Bucket=s3_bucket_name, Key=s3_bucket_object_name)
 
 
+def upload_install_dir_snapshot_to_s3(install_dir: str, s3_bucket_name: str, s3_bucket_object_name: str) -> None:
+    """
+    Upload a copy of `install_dir` while openshift-install is still running in it.
+
+    The installer working files (`INSTALLER_WORKING_FILES_PATTERNS`) are not copied and `install_dir` is not changed.
+    """
+    with tempfile.TemporaryDirectory() as snapshot_parent_dir:
+        snapshot_dir = os.path.join(snapshot_parent_dir, os.path.basename(install_dir))
+        shutil.copytree(install_dir, snapshot_dir, ignore=shutil.ignore_patterns(*INSTALLER_WORKING_FILES_PATTERNS))
+        zip_and_upload_to_s3(
+            install_dir=snapshot_dir, s3_bucket_name=s3_bucket_name, s3_bucket_object_name=s3_bucket_object_name
+        )
+
+
 def get_manifests_path() -> str:
     manifests_path = os.path.join("openshift_cli_installer", "manifests")
     if not os.path.isdir(manifests_path):
@@ -53,25 +83,18 @@ def get_manifests_path() -> str:
     return manifests_path
 
 
-def get_install_config_j2_template(jinja_dict: Dict[str, str], platform: str) -> Dict[str, Any]:
-    env = Environment(
-        loader=FileSystemLoader(get_manifests_path()),
-        trim_blocks=True,
-        lstrip_blocks=True,
-        undefined=DebugUndefined,
-    )
-
-    template = env.get_template(name=f"{platform}-install-config-template.j2")
-    rendered = template.render(jinja_dict)
-    undefined_variables = meta.find_undeclared_variables(env.parse(rendered))
-    if undefined_variables:
-        LOGGER.error(f"The following variables are undefined: {undefined_variables}")
-        raise click.Abort()
-
-    return yaml.safe_load(rendered)
+def get_aws_az_ids(region: str) -> List[str]:
+    # az_id example: us-east-2 -> ["use2-az1", "use2-az2"]
+    az_id_prefix_match = re.match(r"(.*)-(\w).*-(\d)", region)
+    az_id_prefix = "".join(az_id_prefix_match.groups()) if az_id_prefix_match else ""
+    return [f"{az_id_prefix}-az1", f"{az_id_prefix}-az2"]
 
 
+@cache
 def generate_unified_pull_secret(registry_config_file: str, docker_config_file: str) -> str:
+    """
+    Docker config auths merged with the registry config auths, computed once per run.
+    """
     registry_config = get_pull_secret_data(registry_config_file=registry_config_file)
     docker_config = get_pull_secret_data(registry_config_file=docker_config_file)
     docker_config["auths"].update(registry_config["auths"])
@@ -79,6 +102,36 @@ def generate_unified_pull_secret(registry_config_file: str, docker_config_file:
     return json.dumps(docker_config)
 
 
+@cache
+def get_unified_pull_secret_file(registry_config_file: str, docker_config_file: str) -> str:
+    """
+    Unified pull secret file, shared by all installer extracts and runs.
+
+    Written once per run, readable only by the user, to tmpfs when available; removed at exit.
+    """
+    secrets_dir = (
+        SECRETS_TMPFS_DIRECTORY
+        if os.path.isdir(SECRETS_TMPFS_DIRECTORY) and os.access(SECRETS_TMPFS_DIRECTORY, os.W_OK)
+        else None
+    )
+    # mkstemp creates the file with 0600 permissions
+    fd, pull_secret_file = tempfile.mkstemp(prefix="openshift-cli-installer-pull-secret-", dir=secrets_dir)
+
+    def _remove_pull_secret_file() -> None:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(pull_secret_file)
+
+    atexit.register(_remove_pull_secret_file)
+    with os.fdopen(fd, "w") as pull_secret_fd:
+        pull_secret_fd.write(
+            generate_unified_pull_secret(
+                registry_config_file=registry_config_file, docker_config_file=docker_config_file
+            )
+        )
+
+    return pull_secret_file
+
+
 def get_pull_secret_data(registry_config_file: str) -> Dict[str, Any]:
     with open(registry_config_file) as fd:
         return json.load(fd)
@@ -92,3 +145,38 @@ def get_local_ssh_key(ssh_key_file: str) -> str:
 def get_dict_from_json(gcp_service_account_file: str) -> Dict[str, Any]:
     with open(gcp_service_account_file) as fd:
         return json.loads(fd.read())
+
+
+def run_steps_concurrently(
+    steps: Dict[str, Callable[[], Any]], log_prefix: str
+) -> Tuple[Dict[str, float], Dict[str, Exception]]:
+    """
+    Run independent steps in parallel threads and wait for all of them, a failed step does not stop the others.
+
+    Args:
+        steps (dict): step name -> callable
+        log_prefix (str): prefix for the steps logs
+
+    Returns:
+        tuple: (step name -> duration in seconds, step name -> exception, for the failed steps)
+    """
+    timings: Dict[str, float] = {}
+    failures: Dict[str, Exception] = {}
+
+    def _run_step(name: str, func: Callable[[], Any]) -> None:
+        start_time = time.monotonic()
+        try:
+            func()
+        except Exception as ex:
+            failures[name] = ex
+        finally:
+            timings[name] = round(time.monotonic() - start_time, 2)
+            LOGGER.info(
+                f"{log_prefix}: Step {name} {'failed' if name in failures else 'done'} in {timings[name]} seconds"
+            )
+
+    with ThreadPoolExecutor(max_workers=len(steps) or 1) as executor:
+        for _name, _func in steps.items():
+            executor.submit(_run_step, name=_name, func=_func)
+
+    return timings, failures
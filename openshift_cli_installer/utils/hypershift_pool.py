@@ -0,0 +1,285 @@
+from __future__ import annotations
+import json
+import os
+import shutil
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import shortuuid
+from ocm_python_wrapper.ocm_client import DefaultApi
+from python_terraform import IsNotFlagged, Terraform
+from simple_logger.logger import get_logger
+
+from openshift_cli_installer.utils.const import TERRAFORM_CACHE_DEFAULT_DIRECTORY
+from openshift_cli_installer.utils.general import get_aws_az_ids, get_manifests_path, run_steps_concurrently
+from openshift_cli_installer.utils.installer_cache import file_lock
+from openshift_cli_installer.utils.rosa_cli import execute_rosa_command
+from openshift_cli_installer.utils.terraform_cache import CachedTerraform, get_terraform_cache
+
+ENTRY_DATA_FILENAME = "entry.json"
+LEASE_FILENAME = "lease.json"
+PROVISIONING_FILENAME = "provisioning.json"
+# Longer than an entry provisioning (OIDC config, operator roles and VPC), a marker older than that is stale
+PROVISIONING_TIMEOUT_SECONDS = 2 * 60 * 60
+
+
+class HypershiftPoolError(Exception):
+    pass
+
+
+class HypershiftPoolEntry(NamedTuple):
+    name: str
+    oidc_config_id: str
+    operator_roles_prefix: str
+    public_subnet: str
+    private_subnet: str
+
+
+class HypershiftPool:
+    """
+    Pool of ready hypershift prerequisites: OIDC config, operator roles (prefixed with the entry name) and a VPC.
+
+    Each entry is a directory under `<pool_dir>/<ocm env>/<region>/<entry name>` with the VPC terraform workspace,
+    `provisioning.json` while it is created, `entry.json` once it is ready and `lease.json` while it is claimed.
+    Entries which failed to be provisioned and removed are kept (with their terraform state) but not used, as are
+    entries with a stale `provisioning.json` (the provisioning process is gone or timed out).
+    Claimed entries are returned to the pool when the cluster is destroyed.
+    Pool changes are guarded by a region lock file, shared between processes.
+    """
+
+    def __init__(
+        self,
+        pool_dir: str,
+        ocm_env: str,
+        region: str,
+        ocm_client: DefaultApi,
+        aws_account_id: str,
+        terraform_cache_dir: str = TERRAFORM_CACHE_DEFAULT_DIRECTORY,
+    ) -> None:
+        self.logger = get_logger(f"{self.__class__.__module__}-{self.__class__.__name__}")
+        self.region = region
+        self.ocm_client = ocm_client
+        self.aws_account_id = aws_account_id
+        self.terraform_cache_dir = terraform_cache_dir
+        self.region_dir = os.path.join(pool_dir, ocm_env, region)
+        os.makedirs(self.region_dir, exist_ok=True)
+
+    @property
+    def lock_path(self) -> str:
+        return os.path.join(self.region_dir, ".pool.lock")
+
+    def entry_dir(self, name: str) -> str:
+        return os.path.join(self.region_dir, name)
+
+    def entries(self) -> List[str]:
+        return sorted(_name for _name in os.listdir(self.region_dir) if os.path.isdir(self.entry_dir(name=_name)))
+
+    def read_json(self, name: str, filename: str) -> Optional[Dict[str, Any]]:
+        path = os.path.join(self.entry_dir(name=name), filename)
+        if not os.path.isfile(path):
+            return None
+
+        with open(path) as fd:
+            return json.load(fd)
+
+    def write_json(self, name: str, filename: str, data: Dict[str, Any]) -> None:
+        path = os.path.join(self.entry_dir(name=name), filename)
+        with open(f"{path}.tmp", "w") as fd:
+            json.dump(data, fd)
+
+        os.replace(f"{path}.tmp", path)
+
+    def is_provisioning(self, name: str) -> bool:
+        """
+        Returns:
+            bool: True if the entry is being provisioned, False if not or if its provisioning marker is stale
+        """
+        provisioning = self.read_json(name=name, filename=PROVISIONING_FILENAME)
+        if not provisioning:
+            return False
+
+        stale = time.time() - provisioning.get("time", 0) > PROVISIONING_TIMEOUT_SECONDS
+        if not stale and provisioning.get("hostname") == socket.gethostname():
+            try:
+                os.kill(provisioning["pid"], 0)
+            except ProcessLookupError:
+                stale = True
+            except PermissionError:
+                pass
+
+        if stale:
+            self.logger.warning(f"Hypershift pool entry {name} provisioning is stale, not used: {provisioning}")
+
+        return not stale
+
+    def claim(self, cluster_name: str) -> Optional[HypershiftPoolEntry]:
+        """
+        Claim a ready entry for `cluster_name`.
+
+        Returns:
+            HypershiftPoolEntry or None: None if no entry is ready
+        """
+        with file_lock(path=self.lock_path):
+            for _name in self.entries():
+                entry_data = self.read_json(name=_name, filename=ENTRY_DATA_FILENAME)
+                if entry_data and not self.read_json(name=_name, filename=LEASE_FILENAME):
+                    self.write_json(
+                        name=_name, filename=LEASE_FILENAME, data={"cluster": cluster_name, "time": time.time()}
+                    )
+                    self.logger.info(f"Claimed {self.region} hypershift pool entry {_name} for cluster {cluster_name}")
+                    return HypershiftPoolEntry(name=_name, **entry_data)
+
+        self.logger.info(f"No ready hypershift pool entry in {self.region} for cluster {cluster_name}")
+        return None
+
+    def release(self, name: str, cluster_name: str) -> None:
+        with file_lock(path=self.lock_path):
+            lease = self.read_json(name=name, filename=LEASE_FILENAME)
+            if not lease or lease["cluster"] != cluster_name:
+                self.logger.warning(f"Hypershift pool entry {name} is not claimed by {cluster_name}: {lease}")
+                return
+
+            os.remove(os.path.join(self.entry_dir(name=name), LEASE_FILENAME))
+            self.logger.info(f"Returned hypershift pool entry {name} from cluster {cluster_name}")
+
+    def refill(self, size: int) -> None:
+        """
+        Provision entries until `size` entries are not claimed (ready or being provisioned), entries are provisioned
+        concurrently.
+        """
+        with file_lock(path=self.lock_path):
+            available = [
+                _name
+                for _name in self.entries()
+                if not self.read_json(name=_name, filename=LEASE_FILENAME)
+                and (self.read_json(name=_name, filename=ENTRY_DATA_FILENAME) or self.is_provisioning(name=_name))
+            ]
+            # Reserve the new entries directories, provisioned outside the pool lock
+            names = [f"hcp-pool-{shortuuid.uuid().lower()[:8]}" for _ in range(size - len(available))]
+            for _name in names:
+                os.makedirs(self.entry_dir(name=_name))
+                self.write_json(
+                    name=_name,
+                    filename=PROVISIONING_FILENAME,
+                    data={"time": time.time(), "pid": os.getpid(), "hostname": socket.gethostname()},
+                )
+
+        if not names:
+            return
+
+        self.logger.info(f"Refilling {self.region} hypershift pool with {len(names)} entries")
+        with ThreadPoolExecutor(max_workers=len(names)) as executor:
+            for _name, _future in [(_name, executor.submit(self.provision, name=_name)) for _name in names]:
+                try:
+                    _future.result()
+                except Exception as ex:
+                    self.logger.error(f"Failed to provision hypershift pool entry {_name}: {ex}")
+
+    def provision(self, name: str) -> None:
+        entry_data: Dict[str, str] = {"operator_roles_prefix": name}
+
+        def _create_oidc_and_operator_roles() -> None:
+            res = execute_rosa_command(
+                command="create oidc-config --managed=true", aws_region=self.region, ocm_client=self.ocm_client
+            )
+            oidc_config_id = res["out"].get("id")
+            if not oidc_config_id:
+                raise HypershiftPoolError("Failed to get OIDC config")
+
+            entry_data["oidc_config_id"] = oidc_config_id
+            execute_rosa_command(
+                command=(
+                    f"create operator-roles --hosted-cp --prefix={name} --oidc-config-id={oidc_config_id} "
+                    "--installer-role-arn="
+                    f"arn:aws:iam::{self.aws_account_id}:role/ManagedOpenShift-HCP-ROSA-Installer-Role"
+                ),
+                aws_region=self.region,
+                ocm_client=self.ocm_client,
+            )
+
+        def _create_vpc() -> None:
+            terraform = self.terraform(name=name)
+            rc, _, err = terraform.apply(capture_output=True, skip_plan=True, auto_approve=True)
+            if rc != 0:
+                raise HypershiftPoolError(f"Failed to create VPC: {err}")
+
+            terraform_output = terraform.output()
+            entry_data["public_subnet"] = terraform_output["cluster-public-subnet"]["value"]
+            entry_data["private_subnet"] = terraform_output["cluster-private-subnet"]["value"]
+
+        _, failures = run_steps_concurrently(
+            steps={"oidc-and-operator-roles": _create_oidc_and_operator_roles, "vpc": _create_vpc},
+            log_prefix=f"Hypershift pool entry {name}",
+        )
+        os.remove(os.path.join(self.entry_dir(name=name), PROVISIONING_FILENAME))
+        if failures:
+            try:
+                self.remove(name=name, oidc_config_id=entry_data.get("oidc_config_id"))
+            except Exception as ex:
+                self.logger.error(f"Failed to remove hypershift pool entry {name}: {ex}")
+
+            raise HypershiftPoolError(f"{failures}")
+
+        self.write_json(name=name, filename=ENTRY_DATA_FILENAME, data=entry_data)
+        self.logger.info(f"Hypershift pool entry {name} is ready in {self.region}")
+
+    def terraform(self, name: str) -> Terraform:
+        entry_dir = self.entry_dir(name=name)
+        shutil.copy(os.path.join(get_manifests_path(), "setup-vpc.tf"), entry_dir)
+        terraform = CachedTerraform(
+            env=get_terraform_cache(cache_dir=self.terraform_cache_dir).prepare_workspace(working_dir=entry_dir),
+            working_dir=entry_dir,
+            variables={
+                "aws_region": self.region,
+                "az_ids": get_aws_az_ids(region=self.region),
+                "cluster_name": name,
+            },
+        )
+        rc, out, err = terraform.init()
+        if rc != 0:
+            raise HypershiftPoolError(f"Terraform init failed for hypershift pool entry {name}. Err: {err}, Out: {out}")
+
+        return terraform
+
+    def remove(self, name: str, oidc_config_id: Optional[str] = None) -> None:
+        """
+        Delete an entry resources (best effort) and its directory; the directory (with the VPC terraform state) is
+        kept if a resource deletion failed.
+
+        The VPC is destroyed concurrently with the operator roles -> OIDC config chain, rosa requires the operator
+        roles to be deleted before their OIDC config.
+        """
+        self.logger.info(f"Removing hypershift pool entry {name}")
+        entry_data = self.read_json(name=name, filename=ENTRY_DATA_FILENAME) or {}
+        oidc_config_id = oidc_config_id or entry_data.get("oidc_config_id")
+
+        def _delete_vpc() -> None:
+            rc, _, err = self.terraform(name=name).destroy(force=IsNotFlagged, auto_approve=True, capture_output=True)
+            if rc != 0:
+                raise HypershiftPoolError(f"Failed to destroy VPC: {err}")
+
+        def _delete_operator_roles_and_oidc() -> None:
+            try:
+                execute_rosa_command(
+                    command=f"delete operator-roles --prefix={name}", aws_region=self.region, ocm_client=self.ocm_client
+                )
+            finally:
+                if oidc_config_id:
+                    execute_rosa_command(
+                        command=f"delete oidc-config --oidc-config-id={oidc_config_id}",
+                        aws_region=self.region,
+                        ocm_client=self.ocm_client,
+                    )
+
+        steps: Dict[str, Callable[[], None]] = {
+            "delete-vpc": _delete_vpc,
+            "delete-operator-roles-and-oidc": _delete_operator_roles_and_oidc,
+        }
+        _, failures = run_steps_concurrently(steps=steps, log_prefix=f"Hypershift pool entry {name}")
+        if failures:
+            self.logger.error(f"Failed to delete hypershift pool entry {name} resources: {failures}")
+            return
+
+        shutil.rmtree(self.entry_dir(name=name), ignore_errors=True)
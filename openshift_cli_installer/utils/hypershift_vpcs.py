@@ -0,0 +1,168 @@
+from __future__ import annotations
+import json
+import os
+from typing import Any, Dict, List
+
+from jinja2 import Environment, FileSystemLoader
+from python_terraform import IsNotFlagged, Terraform
+from simple_logger.logger import get_logger
+
+from openshift_cli_installer.utils.const import TERRAFORM_CACHE_DEFAULT_DIRECTORY
+from openshift_cli_installer.utils.general import get_aws_az_ids, get_manifests_path
+from openshift_cli_installer.utils.installer_cache import file_lock
+from openshift_cli_installer.utils.terraform_cache import CachedTerraform, get_terraform_cache
+
+CLUSTERS_FILENAME = "clusters.json"
+TERRAFORM_FILENAME = "main.tf"
+# Terraform default is 10, a batch creates ~20 resources per VPC
+TERRAFORM_BATCH_PARALLELISM = 50
+
+
+class HypershiftVpcsError(Exception):
+    pass
+
+
+class HypershiftVpcsWorkspace:
+    """
+    One terraform workspace per region with a VPC module instance per hypershift cluster.
+
+    The clusters VPCs variables are kept in `clusters.json`, `main.tf` is rendered from all the registered clusters.
+    Clusters are applied and destroyed with `-target`, other clusters VPCs in the workspace state are not touched.
+    Workspace changes are serialized with a lock file, shared between processes.
+    """
+
+    def __init__(
+        self, workspace_dir: str, region: str, terraform_cache_dir: str = TERRAFORM_CACHE_DEFAULT_DIRECTORY
+    ) -> None:
+        self.logger = get_logger(f"{self.__class__.__module__}-{self.__class__.__name__}")
+        self.workspace_dir = workspace_dir
+        self.region = region
+        self.terraform_cache_dir = terraform_cache_dir
+        os.makedirs(workspace_dir, exist_ok=True)
+
+    @property
+    def lock_path(self) -> str:
+        return os.path.join(self.workspace_dir, ".workspace.lock")
+
+    @staticmethod
+    def cluster_vpc_variables(name: str, region: str, cluster_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Cluster VPC module variables, same defaults as `setup-vpc.tf`; subnets are a list (YAML) or a comma separated
+        string (CLI).
+        """
+
+        def _subnets(key: str, default: List[str]) -> List[str]:
+            subnets = cluster_data.get(key) or default
+            return subnets.split(",") if isinstance(subnets, str) else subnets
+
+        return {
+            "name": name,
+            "az_ids": get_aws_az_ids(region=region),
+            "cidr": cluster_data.get("cidr") or "10.0.0.0/16",
+            "private_subnets": _subnets(key="private-subnets", default=["10.0.1.0/24", "10.0.2.0/24"]),
+            "public_subnets": _subnets(key="public-subnets", default=["10.0.101.0/24", "10.0.102.0/24"]),
+        }
+
+    def read_clusters(self) -> Dict[str, Dict[str, Any]]:
+        path = os.path.join(self.workspace_dir, CLUSTERS_FILENAME)
+        if not os.path.isfile(path):
+            return {}
+
+        with open(path) as fd:
+            return json.load(fd)
+
+    def write_workspace(self, clusters: Dict[str, Dict[str, Any]]) -> None:
+        path = os.path.join(self.workspace_dir, CLUSTERS_FILENAME)
+        with open(f"{path}.tmp", "w") as fd:
+            json.dump(clusters, fd)
+
+        os.replace(f"{path}.tmp", path)
+
+        template = Environment(
+            loader=FileSystemLoader(get_manifests_path()), trim_blocks=True, lstrip_blocks=True
+        ).get_template("hypershift-vpcs.tf.j2")
+        with open(os.path.join(self.workspace_dir, TERRAFORM_FILENAME), "w") as fd:
+            fd.write(template.render(region=self.region, clusters=[clusters[_name] for _name in sorted(clusters)]))
+
+    def terraform(self) -> Terraform:
+        terraform = CachedTerraform(
+            env=get_terraform_cache(cache_dir=self.terraform_cache_dir).prepare_workspace(
+                working_dir=self.workspace_dir
+            ),
+            working_dir=self.workspace_dir,
+            parallelism=TERRAFORM_BATCH_PARALLELISM,
+        )
+        rc, out, err = terraform.init()
+        if rc != 0:
+            raise HypershiftVpcsError(f"Terraform init failed in {self.workspace_dir}. Err: {err}, Out: {out}")
+
+        return terraform
+
+    def apply(self, clusters: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, List[str]]]:
+        """
+        Create the VPCs of `clusters` (name -> VPC variables) in a single terraform run.
+
+        Returns:
+            dict: cluster name -> {"private-subnets": [...], "public-subnets": [...]}
+        """
+        with file_lock(path=self.lock_path):
+            self.write_workspace(clusters={**self.read_clusters(), **clusters})
+            terraform = self.terraform()
+            self.logger.info(f"Creating {len(clusters)} hypershift VPCs in {self.region}: {sorted(clusters)}")
+            rc, _, err = terraform.apply(
+                capture_output=True,
+                skip_plan=True,
+                auto_approve=True,
+                target=[f"module.{_name}" for _name in clusters],
+            )
+            terraform_output = terraform.output() if rc == 0 else None
+            if terraform_output is None:
+                self.logger.error(f"Failed to create hypershift VPCs in {self.region}, destroying {sorted(clusters)}")
+                try:
+                    self._destroy(terraform=terraform, names=list(clusters))
+                except HypershiftVpcsError as ex:
+                    # The clusters are not created, their VPCs are not destroyed by anyone else
+                    self.logger.error(f"{ex}, leftover resources are kept in {self.workspace_dir} terraform state")
+                    self.remove_clusters(names=list(clusters))
+
+                raise HypershiftVpcsError(f"Failed to create hypershift VPCs in {self.region}: {err}")
+
+        return {
+            _name: {
+                "private-subnets": terraform_output[f"{_name}-private-subnets"]["value"],
+                "public-subnets": terraform_output[f"{_name}-public-subnets"]["value"],
+            }
+            for _name in clusters
+        }
+
+    def destroy(self, name: str) -> None:
+        """
+        Destroy a cluster VPC and remove it from the workspace.
+        """
+        with file_lock(path=self.lock_path):
+            clusters = self.read_clusters()
+            if name not in clusters:
+                self.logger.warning(f"Hypershift VPC of {name} not found in {self.workspace_dir}")
+                return
+
+            self.logger.info(f"Destroying hypershift VPC of {name} in {self.region}")
+            self._destroy(terraform=self.terraform(), names=[name])
+
+    def _destroy(self, terraform: Terraform, names: List[str]) -> None:
+        rc, _, err = terraform.destroy(
+            force=IsNotFlagged,
+            auto_approve=True,
+            capture_output=True,
+            target=[f"module.{_name}" for _name in names],
+        )
+        if rc != 0:
+            raise HypershiftVpcsError(f"Failed to destroy hypershift VPCs of {names}: {err}")
+
+        self.remove_clusters(names=names)
+
+    def remove_clusters(self, names: List[str]) -> None:
+        clusters = self.read_clusters()
+        for _name in names:
+            clusters.pop(_name, None)
+
+        self.write_workspace(clusters=clusters)
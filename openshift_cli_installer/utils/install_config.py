@@ -0,0 +1,213 @@
+from __future__ import annotations
+import json
+import re
+import sys
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Set, Tuple
+
+import yaml
+from jinja2 import Environment, FileSystemLoader, Template, meta, nodes
+
+from openshift_cli_installer.utils.general import get_manifests_path
+
+version = sys.version_info
+if version[0] == 3 and version[1] < 9:
+    from functools import lru_cache as cache
+else:
+    from functools import cache  # type: ignore[no-redef]
+
+
+# Structural install-config schema: a dict lists required keys, a one item list is a list of that item schema
+INSTALL_CONFIG_SCHEMA: Dict[str, Any] = {
+    "apiVersion": str,
+    "kind": str,
+    "baseDomain": str,
+    "metadata": {"name": str},
+    "compute": [{"name": str, "replicas": int, "platform": dict}],
+    "controlPlane": {"name": str, "replicas": int, "platform": dict},
+    "networking": {
+        "clusterNetwork": [{"cidr": str, "hostPrefix": int}],
+        "machineNetwork": [{"cidr": str}],
+        "networkType": str,
+        "serviceNetwork": [str],
+    },
+    "platform": dict,
+    "publish": str,
+    "fips": bool,
+    "sshKey": str,
+    "pullSecret": str,
+}
+
+INSTALL_CONFIG_PLATFORMS_SCHEMA: Dict[str, Dict[str, Any]] = {
+    "aws": {"region": str},
+    "gcp": {"region": str, "projectID": str},
+}
+
+CLUSTER_NAME_REGEX = re.compile(r"^[a-z]([-a-z0-9]*[a-z0-9])?$")
+
+# libyaml loader when available, the pure python loader is an order of magnitude slower
+YAML_SAFE_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+class InstallConfigError(Exception):
+    pass
+
+
+class InstallConfigTemplate(NamedTuple):
+    template: Template
+    required_variables: FrozenSet[str]
+
+
+@cache
+def get_install_config_environment() -> Environment:
+    return Environment(
+        loader=FileSystemLoader(get_manifests_path()),
+        trim_blocks=True,
+        lstrip_blocks=True,
+    )
+
+
+def get_template_optional_variables(ast: nodes.Template) -> Set[str]:
+    """
+    Variables with a `default` filter or only used in `if` tests
+    """
+    optional_variables = {
+        _filter.node.name
+        for _filter in ast.find_all(nodes.Filter)
+        if _filter.name == "default" and isinstance(_filter.node, nodes.Name)
+    }
+    for _if in ast.find_all(nodes.If):
+        optional_variables.update(_name.name for _name in _if.test.find_all(nodes.Name))
+        if isinstance(_if.test, nodes.Name):
+            optional_variables.add(_if.test.name)
+
+    return optional_variables
+
+
+@cache
+def get_install_config_template(platform: str) -> InstallConfigTemplate:
+    """
+    Compiled platform install-config template and its required variables, parsed once per platform.
+    """
+    env = get_install_config_environment()
+    source, _, _ = env.loader.get_source(env, f"{platform}-install-config-template.j2")  # type: ignore[union-attr]
+    ast = env.parse(source)
+    required_variables = meta.find_undeclared_variables(ast) - get_template_optional_variables(ast=ast)
+    return InstallConfigTemplate(template=env.from_string(ast), required_variables=frozenset(required_variables))
+
+
+def validate_schema(data: Any, schema: Any, path: str) -> List[str]:
+    if isinstance(schema, dict):
+        if not isinstance(data, dict):
+            return [f"{path}: expected a mapping, got {type(data).__name__}"]
+
+        errors = []
+        for _key, _schema in schema.items():
+            _path = f"{path}.{_key}" if path else _key
+            if _key not in data or data[_key] is None:
+                errors.append(f"{_path}: missing")
+            else:
+                errors.extend(validate_schema(data=data[_key], schema=_schema, path=_path))
+
+        return errors
+
+    if isinstance(schema, list):
+        if not isinstance(data, list) or not data:
+            return [f"{path}: expected a non empty list"]
+
+        errors = []
+        for idx, _item in enumerate(data):
+            errors.extend(validate_schema(data=_item, schema=schema[0], path=f"{path}[{idx}]"))
+
+        return errors
+
+    # bool is an int subclass, `replicas: true` is not valid
+    if not isinstance(data, schema) or (schema is int and isinstance(data, bool)):
+        return [f"{path}: expected {schema.__name__}, got {type(data).__name__} ({data!r})"]
+
+    return []
+
+
+def validate_install_config(install_config: Dict[str, Any], platform: str) -> List[str]:
+    """
+    Returns:
+        list: install-config errors, empty if valid
+    """
+    errors = validate_schema(data=install_config, schema=INSTALL_CONFIG_SCHEMA, path="")
+    if errors:
+        return errors
+
+    errors.extend(
+        validate_schema(
+            data=install_config["platform"].get(platform),
+            schema=INSTALL_CONFIG_PLATFORMS_SCHEMA[platform],
+            path=f"platform.{platform}",
+        )
+    )
+
+    name = install_config["metadata"]["name"]
+    if not CLUSTER_NAME_REGEX.match(name) or len(name) > 63:
+        errors.append(f"metadata.name: {name} is not a valid DNS label")
+
+    for _machine_pool in install_config["compute"] + [install_config["controlPlane"]]:
+        if _machine_pool["replicas"] < 0:
+            errors.append(f"{_machine_pool['name']}.replicas: must not be negative")
+
+    try:
+        if "auths" not in json.loads(install_config["pullSecret"]):
+            errors.append("pullSecret: missing auths")
+    except (json.JSONDecodeError, TypeError):
+        errors.append("pullSecret: not a valid JSON")
+
+    return errors
+
+
+def render_install_config(jinja_dict: Dict[str, Any], platform: str) -> Dict[str, Any]:
+    """
+    Render and validate a platform install-config.
+
+    Raises:
+        InstallConfigError: if a required variable is missing or the rendered install-config is not valid
+    """
+    install_config_template = get_install_config_template(platform=platform)
+    missing_variables = install_config_template.required_variables - {
+        _key for _key, _value in jinja_dict.items() if _value is not None
+    }
+    if missing_variables:
+        raise InstallConfigError(f"The following variables are undefined: {sorted(missing_variables)}")
+
+    try:
+        install_config = yaml.load(install_config_template.template.render(jinja_dict), Loader=YAML_SAFE_LOADER)
+    except yaml.YAMLError as ex:
+        raise InstallConfigError(f"Rendered install-config is not a valid YAML: {ex}")
+
+    if errors := validate_install_config(install_config=install_config, platform=platform):
+        raise InstallConfigError(f"Invalid install-config: {', '.join(errors)}")
+
+    return install_config
+
+
+def render_install_configs(clusters_parameters: Dict[str, Tuple[str, Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Render and validate all clusters install-configs in one batch.
+
+    Args:
+        clusters_parameters (dict): cluster name -> (platform, template variables)
+
+    Returns:
+        dict: cluster name -> install-config
+
+    Raises:
+        InstallConfigError: with the errors of all the invalid clusters
+    """
+    install_configs = {}
+    errors = []
+    for _name, (_platform, _jinja_dict) in clusters_parameters.items():
+        try:
+            install_configs[_name] = render_install_config(jinja_dict=_jinja_dict, platform=_platform)
+        except InstallConfigError as ex:
+            errors.append(f"{_name}: {ex}")
+
+    if errors:
+        raise InstallConfigError("\n".join(errors))
+
+    return install_configs
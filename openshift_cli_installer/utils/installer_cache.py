@@ -0,0 +1,491 @@
+from __future__ import annotations
+import fcntl
+import hashlib
+import json
+import os
+import re
+import shlex
+import shutil
+import sys
+import tarfile
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import IO, Any, Callable, Dict, Generator, List, NamedTuple, Tuple
+
+import requests
+from pyhelper_utils.shell import run_command
+from simple_logger.logger import get_logger
+
+from openshift_cli_installer.utils.const import (
+    INSTALLER_CACHE_DEFAULT_DIRECTORY,
+    INSTALLER_CACHE_DEFAULT_MAX_SIZE_GB,
+    OPENSHIFT_MIRROR_URL,
+)
+
+version = sys.version_info
+if version[0] == 3 and version[1] < 9:
+    from functools import lru_cache as cache
+else:
+    from functools import cache  # type: ignore[no-redef]
+
+
+LOGGER = get_logger(name=__name__)
+
+MANIFEST_FILENAME = "manifest.json"
+LAST_USED_FILENAME = "last-used"
+# Populate / remove work directories: `.<key>-tmp-<random>` and `.<key>-removed-<random>`
+WORK_DIR_PATTERN = re.compile(r"^\.(?P<key>.+)-(?:tmp|removed)-[A-Za-z0-9_]+$")
+
+INSTALLER_SOURCE_CACHE = "cache"
+INSTALLER_SOURCE_MIRROR = "mirror"
+INSTALLER_SOURCE_RELEASE_EXTRACT = "release-extract"
+
+# openshift-install binary futures by (version_url, fips), shared by clusters running in this process
+_INSTALLER_FUTURES: Dict[Tuple[str, bool], Future[InstallerBinary]] = {}
+_INSTALLER_FUTURES_LOCK = threading.Lock()
+
+
+class InstallerCacheError(Exception):
+    pass
+
+
+def get_release_digest(version_url: str, registry_config: str) -> str:
+    """
+    Get the release image digest (`sha256:<hex>`) of a release pullspec.
+
+    Pullspecs pinned by digest are returned as is, otherwise the digest is read with `oc adm release info`,
+    which only fetches the release image manifest.
+    """
+    if digest_match := re.search(r"@(sha256:[0-9a-f]{64})$", version_url):
+        return digest_match.group(1)
+
+    rc, out, err = run_command(
+        command=shlex.split(f"oc adm release info {version_url} --output=json --registry-config={registry_config}"),
+        check=False,
+    )
+    if not rc:
+        raise InstallerCacheError(f"Failed to get release digest for {version_url}, error: {err}")
+
+    return json.loads(out)["digest"]
+
+
+def extract_openshift_install_binary(version_url: str, binary_name: str, target_dir: str, registry_config: str) -> None:
+    rc, _, err = run_command(
+        command=shlex.split(
+            "oc adm release extract "
+            f"{version_url} "
+            f"--command={binary_name} --to={target_dir} --registry-config={registry_config}"
+        ),
+        check=False,
+    )
+    if not rc:
+        raise InstallerCacheError(f"Failed to get {binary_name} for version {version_url}, error: {err}")
+
+
+def get_mirror_version(version_url: str) -> str:
+    """
+    Get the version of a GA, rc or ec release pullspec, which have prebuilt installers on the mirror.
+
+    Returns an empty string for other releases (nightly, ci, pinned by digest).
+    """
+    if version_match := re.search(
+        r"quay.io/openshift-release-dev/ocp-release:(\d+\.\d+\.\d+(?:-(?:rc|ec)\.\d+)?)-x86_64$", version_url
+    ):
+        return version_match.group(1)
+
+    return ""
+
+
+class HashingReader:
+    """
+    File object wrapper which computes the sha256 of the data read through it.
+    """
+
+    def __init__(self, fileobj: Any) -> None:
+        self.fileobj = fileobj
+        self.sha256 = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.fileobj.read(size)
+        self.sha256.update(data)
+        return data
+
+    def drain(self) -> None:
+        while self.read(1024 * 1024):
+            pass
+
+
+def download_openshift_install_from_mirror(
+    version: str, target_dir: str, mirror_url: str = OPENSHIFT_MIRROR_URL
+) -> None:
+    """
+    Download openshift-install from the mirror tarball, verified against the mirror sha256sum.txt.
+
+    The tarball is streamed: decompressed and hashed while downloaded, only the binary is written to disk.
+    """
+    version_url = f"{mirror_url}/{'ocp-dev-preview' if '-ec.' in version else 'ocp'}/{version}"
+    tarball_name = f"openshift-install-linux-{version}.tar.gz"
+
+    sha256sum_res = requests.get(f"{version_url}/sha256sum.txt", timeout=60)
+    sha256sum_res.raise_for_status()
+    expected_sha256 = {
+        _line.split()[1]: _line.split()[0] for _line in sha256sum_res.text.splitlines() if len(_line.split()) == 2
+    }.get(tarball_name)
+    if not expected_sha256:
+        raise InstallerCacheError(f"{tarball_name} not found in {version_url}/sha256sum.txt")
+
+    binary_path = os.path.join(target_dir, "openshift-install")
+    with requests.get(f"{version_url}/{tarball_name}", timeout=60, stream=True) as res:
+        res.raise_for_status()
+        res.raw.decode_content = True
+        reader = HashingReader(fileobj=res.raw)
+        with tarfile.open(fileobj=reader, mode="r|gz") as tar:  # type: ignore[call-overload]
+            for member in tar:
+                if member.isfile() and member.name == "openshift-install":
+                    with tar.extractfile(member) as binary_fd, open(binary_path, "wb") as fd:
+                        shutil.copyfileobj(binary_fd, fd)
+
+        reader.drain()
+
+    if reader.sha256.hexdigest() != expected_sha256:
+        raise InstallerCacheError(f"{tarball_name} sha256 does not match {version_url}/sha256sum.txt")
+
+    if not os.path.isfile(binary_path):
+        raise InstallerCacheError(f"openshift-install not found in {tarball_name}")
+
+    os.chmod(binary_path, 0o755)
+
+
+def file_sha256(path: str) -> str:
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as fd:
+        for chunk in iter(lambda: fd.read(1024 * 1024), b""):
+            sha256.update(chunk)
+
+    return sha256.hexdigest()
+
+
+@contextmanager
+def file_lock(path: str) -> Generator[IO[Any], None, None]:
+    with open(path, "a") as fd:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            yield fd
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+@contextmanager
+def try_file_lock(path: str) -> Generator[bool, None, None]:
+    """
+    Try to take an exclusive lock without blocking, yield whether the lock was taken.
+    """
+    with open(path, "a") as fd:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+
+        try:
+            yield True
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+class InstallerCache:
+    """
+    Persistent on-disk cache of openshift-install binaries, shared between processes.
+
+    Entries are keyed by release image digest and fips flag, so a tag that moves to a new release is never served stale.
+    Entries are populated in a temporary directory and renamed into place, guarded by a per entry lock file.
+    Each entry holds a manifest with the binary sha256, verified before the binary is used.
+    Least recently used entries are evicted when the cache is over `max_size_bytes`; entries in use by a running
+    process (shared lock on the `.use` file) are never evicted.
+    """
+
+    def __init__(self, cache_dir: str, max_size_bytes: int) -> None:
+        self.logger = get_logger(f"{self.__class__.__module__}-{self.__class__.__name__}")
+        self.cache_dir = cache_dir
+        self.max_size_bytes = max_size_bytes
+        # Shared locks on entries used by this process, held until the process exits
+        self._in_use: Dict[str, IO[Any]] = {}
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def entry_key(release_digest: str, fips: bool) -> str:
+        return f"{release_digest.replace(':', '-')}{'-fips' if fips else ''}"
+
+    def entry_dir(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def _lock_path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.cache_dir, f".{key}.{suffix}")
+
+    def _mark_in_use(self, key: str) -> None:
+        if key not in self._in_use:
+            fd = open(self._lock_path(key=key, suffix="use"), "a")
+            fcntl.flock(fd, fcntl.LOCK_SH)
+            self._in_use[key] = fd
+
+        os.utime(os.path.join(self.entry_dir(key=key), LAST_USED_FILENAME))
+
+    def _verified_binary_path(self, key: str) -> str:
+        """
+        Return the entry binary path if the entry exists and matches its manifest, else an empty string.
+        """
+        manifest_path = os.path.join(self.entry_dir(key=key), MANIFEST_FILENAME)
+        if not os.path.isfile(manifest_path):
+            return ""
+
+        with open(manifest_path) as fd:
+            manifest = json.load(fd)
+
+        binary_path = os.path.join(self.entry_dir(key=key), manifest["binary"])
+        if os.path.isfile(binary_path) and file_sha256(path=binary_path) == manifest["sha256"]:
+            return binary_path
+
+        self.logger.warning(f"Installer cache entry {key} failed integrity check, removing")
+        self._remove_entry(key=key)
+        return ""
+
+    def _remove_entry(self, key: str) -> None:
+        # Rename first so that readers never see a partially removed entry
+        trash_dir = tempfile.mkdtemp(dir=self.cache_dir, prefix=f".{key}-removed-")
+        os.rename(self.entry_dir(key=key), os.path.join(trash_dir, key))
+        shutil.rmtree(trash_dir, ignore_errors=True)
+
+    def _populate(self, key: str, binary_name: str, extract: Callable[[str], None], metadata: Dict[str, Any]) -> None:
+        tmp_dir = tempfile.mkdtemp(dir=self.cache_dir, prefix=f".{key}-tmp-")
+        try:
+            extract(tmp_dir)
+            binary_path = os.path.join(tmp_dir, binary_name)
+            if not os.path.isfile(binary_path):
+                raise InstallerCacheError(f"{binary_name} was not extracted to {tmp_dir}")
+
+            with open(os.path.join(tmp_dir, MANIFEST_FILENAME), "w") as fd:
+                json.dump({**metadata, "binary": binary_name, "sha256": file_sha256(path=binary_path)}, fd)
+
+            open(os.path.join(tmp_dir, LAST_USED_FILENAME), "w").close()
+            os.rename(tmp_dir, self.entry_dir(key=key))
+
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def get_or_populate(
+        self, key: str, binary_name: str, extract: Callable[[str], None], metadata: Dict[str, Any] | None = None
+    ) -> str:
+        """
+        Get the cached binary path of `key`, calling `extract(target_dir)` to populate the entry on a cache miss.
+
+        Concurrent callers (threads or processes) for the same key wait for the first one to populate the entry.
+        If the populating caller fails, callers that were waiting on it fail with the same error instead of retrying;
+        callers that start after the failure retry the extraction.
+        """
+        wait_start_time = time.time()
+        with file_lock(path=self._lock_path(key=key, suffix="lock")):
+            if binary_path := self._verified_binary_path(key=key):
+                self.logger.info(f"Using cached {binary_name} from {binary_path}")
+            else:
+                error_path = self._lock_path(key=key, suffix="error")
+                if os.path.isfile(error_path):
+                    with open(error_path) as fd:
+                        error = json.load(fd)
+
+                    if error["time"] >= wait_start_time:
+                        raise InstallerCacheError(
+                            f"Extracting {binary_name} failed in another process: {error['error']}"
+                        )
+
+                self.logger.info(f"Installer cache miss for {key}, extracting {binary_name}")
+                start_time = time.time()
+                try:
+                    self._populate(key=key, binary_name=binary_name, extract=extract, metadata=metadata or {})
+                except Exception as ex:
+                    with open(error_path, "w") as fd:
+                        json.dump({"time": time.time(), "error": str(ex)}, fd)
+                    raise
+
+                if os.path.isfile(error_path):
+                    os.remove(error_path)
+
+                binary_path = os.path.join(self.entry_dir(key=key), binary_name)
+                self.logger.info(f"Cached {binary_name} in {binary_path} in {time.time() - start_time:.1f} seconds")
+
+            self._mark_in_use(key=key)
+
+        self.evict()
+        return binary_path
+
+    def entries(self) -> List[str]:
+        return [
+            _entry
+            for _entry in os.listdir(self.cache_dir)
+            if not _entry.startswith(".") and os.path.isdir(self.entry_dir(key=_entry))
+        ]
+
+    def entry_size(self, key: str) -> int:
+        return sum(
+            os.path.getsize(os.path.join(root, _file))
+            for root, _, files in os.walk(self.entry_dir(key=key))
+            for _file in files
+        )
+
+    def remove_stale_work_dirs(self) -> None:
+        """
+        Remove populate / remove work directories left behind by a killed process or thread.
+
+        A work directory is stale when nobody holds its entry populate lock; its size is not counted in the cache size.
+        """
+        for _dir in os.listdir(self.cache_dir):
+            work_dir_match = WORK_DIR_PATTERN.match(_dir)
+            if not work_dir_match or not os.path.isdir(os.path.join(self.cache_dir, _dir)):
+                continue
+
+            with try_file_lock(path=self._lock_path(key=work_dir_match.group("key"), suffix="lock")) as populate_locked:
+                if populate_locked:
+                    self.logger.info(f"Removing stale installer cache work directory {_dir}")
+                    shutil.rmtree(os.path.join(self.cache_dir, _dir), ignore_errors=True)
+
+    def evict(self) -> None:
+        with file_lock(path=os.path.join(self.cache_dir, ".evict.lock")):
+            self.remove_stale_work_dirs()
+            entries_sizes = {_entry: self.entry_size(key=_entry) for _entry in self.entries()}
+            cache_size = sum(entries_sizes.values())
+            for _entry in sorted(
+                entries_sizes,
+                key=lambda _key: os.path.getmtime(os.path.join(self.entry_dir(key=_key), LAST_USED_FILENAME)),
+            ):
+                if cache_size <= self.max_size_bytes:
+                    return
+
+                if _entry in self._in_use:
+                    continue
+
+                # Skip entries being populated or used by another running process
+                with try_file_lock(path=self._lock_path(key=_entry, suffix="lock")) as populate_locked:
+                    with try_file_lock(path=self._lock_path(key=_entry, suffix="use")) as use_locked:
+                        if populate_locked and use_locked:
+                            self.logger.info(f"Evicting installer cache entry {_entry}")
+                            self._remove_entry(key=_entry)
+                            cache_size -= entries_sizes[_entry]
+
+
+@cache
+def get_installer_cache(
+    cache_dir: str = INSTALLER_CACHE_DEFAULT_DIRECTORY, max_size_gb: float = INSTALLER_CACHE_DEFAULT_MAX_SIZE_GB
+) -> InstallerCache:
+    return InstallerCache(cache_dir=cache_dir, max_size_bytes=int(max_size_gb * 1024**3))
+
+
+class InstallerBinary(NamedTuple):
+    path: str
+    # Where the binary was taken from: `cache`, `mirror` or `release-extract`
+    source: str
+
+
+def prefetch_openshift_install_binary(
+    version_url: str,
+    fips: bool,
+    registry_config: str,
+    cache_dir: str = INSTALLER_CACHE_DEFAULT_DIRECTORY,
+    max_size_gb: float = INSTALLER_CACHE_DEFAULT_MAX_SIZE_GB,
+    mirror_url: str = OPENSHIFT_MIRROR_URL,
+) -> Future[InstallerBinary]:
+    """
+    Start getting openshift-install (or openshift-install-fips) binary for a release in a background thread.
+
+    On a cache miss, GA, rc and ec installers are downloaded from the mirror tarball, falling back to
+    `oc adm release extract` (always used for nightly, ci and fips installers).
+
+    Calls for the same (version_url, fips) in this process share a single future; the binary is downloaded once
+    and every caller gets its result or exception. Failed futures are dropped so that later calls try again.
+    """
+    future_key = (version_url, fips)
+    with _INSTALLER_FUTURES_LOCK:
+        if future := _INSTALLER_FUTURES.get(future_key):
+            return future
+
+        future = _INSTALLER_FUTURES[future_key] = Future()
+
+    def _get_binary() -> None:
+        try:
+            future.set_result(
+                _get_openshift_install_binary(
+                    version_url=version_url,
+                    fips=fips,
+                    registry_config=registry_config,
+                    cache_dir=cache_dir,
+                    max_size_gb=max_size_gb,
+                    mirror_url=mirror_url,
+                )
+            )
+        except Exception as ex:
+            with _INSTALLER_FUTURES_LOCK:
+                _INSTALLER_FUTURES.pop(future_key, None)
+
+            future.set_exception(ex)
+
+    # Daemon thread, an aborted run should not wait for a download nobody needs
+    threading.Thread(target=_get_binary, name=f"openshift-install-{version_url}", daemon=True).start()
+    return future
+
+
+def get_openshift_install_binary(
+    version_url: str,
+    fips: bool,
+    registry_config: str,
+    cache_dir: str = INSTALLER_CACHE_DEFAULT_DIRECTORY,
+    max_size_gb: float = INSTALLER_CACHE_DEFAULT_MAX_SIZE_GB,
+    mirror_url: str = OPENSHIFT_MIRROR_URL,
+) -> InstallerBinary:
+    return prefetch_openshift_install_binary(
+        version_url=version_url,
+        fips=fips,
+        registry_config=registry_config,
+        cache_dir=cache_dir,
+        max_size_gb=max_size_gb,
+        mirror_url=mirror_url,
+    ).result()
+
+
+def _get_openshift_install_binary(
+    version_url: str, fips: bool, registry_config: str, cache_dir: str, max_size_gb: float, mirror_url: str
+) -> InstallerBinary:
+    binary_name = f"openshift-install{'-fips' if fips else ''}"
+    mirror_version = "" if fips else get_mirror_version(version_url=version_url)
+    sources: List[str] = []
+
+    def _download(target_dir: str) -> None:
+        if mirror_version:
+            try:
+                download_openshift_install_from_mirror(
+                    version=mirror_version, target_dir=target_dir, mirror_url=mirror_url
+                )
+                sources.append(INSTALLER_SOURCE_MIRROR)
+                return
+
+            except (requests.RequestException, tarfile.TarError, OSError, InstallerCacheError) as ex:
+                LOGGER.warning(f"Failed to download {binary_name} {mirror_version} from mirror, falling back: {ex}")
+                for _file in os.listdir(target_dir):
+                    os.remove(os.path.join(target_dir, _file))
+
+        extract_openshift_install_binary(
+            version_url=version_url, binary_name=binary_name, target_dir=target_dir, registry_config=registry_config
+        )
+        sources.append(INSTALLER_SOURCE_RELEASE_EXTRACT)
+
+    release_digest = get_release_digest(version_url=version_url, registry_config=registry_config)
+    binary_path = get_installer_cache(cache_dir=cache_dir, max_size_gb=max_size_gb).get_or_populate(
+        key=InstallerCache.entry_key(release_digest=release_digest, fips=fips),
+        binary_name=binary_name,
+        extract=_download,
+        metadata={"version-url": version_url, "release-digest": release_digest},
+    )
+
+    source = sources[-1] if sources else INSTALLER_SOURCE_CACHE
+    LOGGER.info(f"Using {binary_name} for {version_url} from {source}")
+    return InstallerBinary(path=binary_path, source=source)
@@ -0,0 +1,205 @@
+from __future__ import annotations
+import os
+import re
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional, Pattern, Tuple
+
+from simple_logger.logger import get_logger
+
+LOGGER = get_logger(name=__name__)
+
+INSTALLER_LOG_FILENAME = ".openshift_install.log"
+
+# Installer phases, in install order
+INFRASTRUCTURE_PHASE = "infrastructure"
+BOOTSTRAP_PHASE = "bootstrap"
+API_UP_PHASE = "api-up"
+BOOTSTRAP_COMPLETE_PHASE = "bootstrap-complete"
+OPERATORS_PROGRESSING_PHASE = "operators-progressing"
+INSTALL_COMPLETE_PHASE = "install-complete"
+
+INSTALLER_PHASES_PATTERNS: Tuple[Tuple[str, Pattern[str]], ...] = (
+    (INFRASTRUCTURE_PHASE, re.compile(r"Creating infrastructure resources")),
+    (API_UP_PHASE, re.compile(r"API v\S+ up")),
+    (BOOTSTRAP_PHASE, re.compile(r"Waiting up to \S+ .*for bootstrapping to complete")),
+    (
+        BOOTSTRAP_COMPLETE_PHASE,
+        re.compile(r"It is now safe to remove the bootstrap resources|Bootstrap status: complete"),
+    ),
+    (OPERATORS_PROGRESSING_PHASE, re.compile(r"Waiting up to \S+ .*for the cluster at \S+ to initialize")),
+    (INSTALL_COMPLETE_PHASE, re.compile(r"Install complete!")),
+)
+
+# Errors the installer may retry until its timeout but that will never recover
+INSTALLER_DEFAULT_FATAL_PATTERNS: Tuple[str, ...] = (
+    r"InvalidClientTokenId",
+    r"InvalidCredentials",
+    r"AuthFailure",
+    r"UnauthorizedOperation",
+    r"(Vpc|Vcpu|Address|NatGateway|InternetGateway)LimitExceeded",
+    r"[Qq]uota .*exceeded",
+    r"QUOTA_EXCEEDED",
+    r"PERMISSION_DENIED",
+    r"failed to fetch Cluster: failed to generate asset",
+)
+
+# Fatal patterns are only matched on error level lines: the installer logs the errors it retries (and may recover
+# from) at debug, info or warning level. Logfmt lines (`.openshift_install.log`, non-TTY output) or console lines.
+INSTALLER_ERROR_LINE_PATTERN = re.compile(r'^(?:time="[^"]*"\s+)?level=(?:error|fatal)\b|^(?:ERROR|FATAL)\b')
+
+_SECRETS_PATTERN = re.compile(r"(password\S*\s*[:=]?\s*)(\S+)", re.IGNORECASE)
+
+
+def redact_installer_line(line: str) -> str:
+    """
+    Hide secrets (kubeadmin password) from an installer output line.
+    """
+    return _SECRETS_PATTERN.sub(r"\1<redacted>", line)
+
+
+class InstallerEvent(NamedTuple):
+    phase: str
+    time: float
+    line: str
+
+
+class InstallerOutputMonitor:
+    """
+    Parse openshift-install output lines, emit phase events and detect fatal errors (fatal patterns matched on
+    error level lines).
+
+    Each phase is emitted once, by the first matching line; `on_event` is called with each new event.
+    """
+
+    def __init__(
+        self,
+        fatal_patterns: Tuple[str, ...] | List[str] = INSTALLER_DEFAULT_FATAL_PATTERNS,
+        on_event: Optional[Callable[[InstallerEvent], None]] = None,
+    ) -> None:
+        self.fatal_patterns = [re.compile(_pattern) for _pattern in fatal_patterns]
+        self.on_event = on_event
+        self.events: Dict[str, InstallerEvent] = {}
+        self.fatal_line = ""
+        self.fatal = threading.Event()
+        self._lock = threading.Lock()
+
+    def feed(self, line: str) -> None:
+        for phase, pattern in INSTALLER_PHASES_PATTERNS:
+            if pattern.search(line):
+                with self._lock:
+                    if phase in self.events:
+                        continue
+
+                    event = self.events[phase] = InstallerEvent(
+                        phase=phase, time=time.time(), line=redact_installer_line(line=line)
+                    )
+
+                if self.on_event:
+                    self.on_event(event)
+
+        if self.fatal.is_set() or not INSTALLER_ERROR_LINE_PATTERN.search(line):
+            return
+
+        for pattern in self.fatal_patterns:
+            if not self.fatal.is_set() and pattern.search(line):
+                self.fatal_line = redact_installer_line(line=line)
+                self.fatal.set()
+
+
+def get_installer_fatal_patterns(cluster_data: Dict[str, Any]) -> List[str]:
+    """
+    Default fatal patterns and the cluster `installer-fatal-patterns` (list, or comma separated string).
+    """
+    extra_patterns = cluster_data.get("installer-fatal-patterns") or []
+    if isinstance(extra_patterns, str):
+        extra_patterns = [_pattern.strip() for _pattern in extra_patterns.split(",") if _pattern.strip()]
+
+    return [*INSTALLER_DEFAULT_FATAL_PATTERNS, *extra_patterns]
+
+
+def tail_file(path: str, on_line: Callable[[str], None], stop: threading.Event, interval: float = 1) -> None:
+    """
+    Call `on_line` with each line appended to `path` (which may not exist yet) until `stop` is set.
+    """
+    position = os.path.getsize(path) if os.path.isfile(path) else 0
+    partial_line = ""
+    while True:
+        stopped = stop.wait(timeout=interval)
+        if os.path.isfile(path):
+            with open(path, errors="replace") as fd:
+                fd.seek(position)
+                data = fd.read()
+                position = fd.tell()
+
+            lines = (partial_line + data).split("\n")
+            partial_line = lines.pop()
+            for line in lines:
+                on_line(line)
+
+        if stopped:
+            return
+
+
+def run_installer(
+    command: List[str],
+    install_dir: str,
+    monitor: InstallerOutputMonitor,
+    log_prefix: str,
+    env: Optional[Dict[str, str]] = None,
+    output_lines: int = 50,
+) -> Tuple[bool, str, str]:
+    """
+    Run openshift-install, streaming its output and `.openshift_install.log` (always debug level) to the monitor.
+
+    The installer is terminated as soon as the monitor matches a fatal error.
+
+    Returns:
+        tuple: (success, last output lines, fatal error line)
+    """
+    process = subprocess.Popen(
+        command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, errors="replace", env=env
+    )
+    output: Deque[str] = deque(maxlen=output_lines)
+    stop_tail = threading.Event()
+    log_tail = threading.Thread(
+        target=tail_file,
+        kwargs={
+            "path": os.path.join(install_dir, INSTALLER_LOG_FILENAME),
+            "on_line": monitor.feed,
+            "stop": stop_tail,
+        },
+        daemon=True,
+    )
+    log_tail.start()
+
+    def _read_output() -> None:
+        for line in process.stdout:  # type: ignore[union-attr]
+            line = line.rstrip("\n")
+            monitor.feed(line=line)
+            line = redact_installer_line(line=line)
+            output.append(line)
+            LOGGER.info(f"{log_prefix}: {line}")
+
+    output_reader = threading.Thread(target=_read_output, daemon=True)
+    output_reader.start()
+
+    while process.poll() is None:
+        if monitor.fatal.wait(timeout=1):
+            LOGGER.error(f"{log_prefix}: Fatal installer error, terminating installer: {monitor.fatal_line}")
+            process.terminate()
+            try:
+                process.wait(timeout=60)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+            break
+
+    output_reader.join(timeout=10)
+    stop_tail.set()
+    log_tail.join(timeout=10)
+
+    return process.returncode == 0 and not monitor.fatal.is_set(), "\n".join(output), monitor.fatal_line
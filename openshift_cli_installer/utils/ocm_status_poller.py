@@ -0,0 +1,270 @@
+from __future__ import annotations
+import re
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ocm_python_client.api.default_api import DefaultApi
+from simple_logger.logger import get_logger
+from timeout_sampler import TimeoutExpiredError
+
+OCM_STATUS_POLLER_MIN_INTERVAL_SECONDS = 5
+OCM_STATUS_POLLER_MAX_INTERVAL_SECONDS = 60
+OCM_STATUS_POLLER_PAGE_SIZE = 100
+# Install logs are one request per cluster, fetched less often than the shared status query
+OCM_STATUS_POLLER_INSTALL_LOGS_INTERVAL_SECONDS = 60
+OCM_CLUSTER_READY_STATE = "ready"
+OCM_CLUSTER_ERROR_STATE = "error"
+OCM_CLUSTER_INSTALLING_STATE = "installing"
+
+# Install errors OCM may retry until the cluster install timeout but that will never recover
+OCM_DEFAULT_FATAL_PATTERNS: Tuple[str, ...] = (
+    r"InvalidClientTokenId",
+    r"UnauthorizedOperation",
+    r"OptInRequired",
+    r"(Vpc|Vcpu|Address|NatGateway|InternetGateway)LimitExceeded",
+    r"InsufficientInstanceCapacity",
+    r"[Qq]uota .*exceeded",
+    r"QUOTA_EXCEEDED",
+    r"PERMISSION_DENIED",
+)
+
+
+class OcmClusterStateError(Exception):
+    pass
+
+
+class OcmStatusWaiter:
+    """
+    A cluster wait registered in the poller; `check` is called with the cluster OCM object (None if the cluster does
+    not exist) on every poll and returns True when the wait is done, or raises to fail the wait.
+    """
+
+    def __init__(self, name: str, check: Callable[[Optional[Any]], bool]) -> None:
+        self.name = name
+        self.check = check
+        self.future: "Future[Optional[Any]]" = Future()
+
+
+class OcmStatusPoller:
+    """
+    Shared clusters status poller for one OCM environment.
+
+    All the waited clusters are fetched with one paginated clusters list query per interval, and the waiting threads
+    are woken through their futures. The interval starts at `min_interval` and is doubled (up to `max_interval`) while
+    no waited cluster changes state; it is reset when a state changes or a new wait is registered.
+    Install logs (one request per cluster) are fetched at most once per `install_logs_interval` per wait.
+    """
+
+    def __init__(
+        self,
+        ocm_client: DefaultApi,
+        min_interval: float = OCM_STATUS_POLLER_MIN_INTERVAL_SECONDS,
+        max_interval: float = OCM_STATUS_POLLER_MAX_INTERVAL_SECONDS,
+        page_size: int = OCM_STATUS_POLLER_PAGE_SIZE,
+        install_logs_interval: float = OCM_STATUS_POLLER_INSTALL_LOGS_INTERVAL_SECONDS,
+    ) -> None:
+        self.logger = get_logger(f"{self.__class__.__module__}-{self.__class__.__name__}")
+        self.ocm_client = ocm_client
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.page_size = page_size
+        self.install_logs_interval = install_logs_interval
+        self._lock = threading.Lock()
+        self._wake_up = threading.Event()
+        self._waiters: List[OcmStatusWaiter] = []
+        self._states: Dict[str, str] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def list_clusters(self, names: List[str]) -> Dict[str, Any]:
+        """
+        Returns:
+            dict: cluster name -> cluster OCM object, for the existing clusters
+        """
+        search = f"name in ({', '.join(repr(_name) for _name in sorted(names))})"
+        clusters: Dict[str, Any] = {}
+        page = 1
+        while True:
+            clusters_list = self.ocm_client.api_clusters_mgmt_v1_clusters_get(
+                search=search, page=page, size=self.page_size
+            )
+            items = clusters_list.items or []
+            clusters.update({_cluster.name: _cluster for _cluster in items})
+            if len(items) < self.page_size:
+                return clusters
+
+            page += 1
+
+    def wait(self, name: str, check: Callable[[Optional[Any]], bool], wait_timeout: float) -> Optional[Any]:
+        """
+        Wait until `check` returns True for cluster `name`.
+
+        Returns:
+            The cluster OCM object (None if the cluster does not exist)
+
+        Raises:
+            TimeoutExpiredError: if the wait is not done within `wait_timeout` seconds
+        """
+        waiter = OcmStatusWaiter(name=name, check=check)
+        with self._lock:
+            self._waiters.append(waiter)
+            if not self._thread or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._poll, name="ocm-status-poller", daemon=True)
+                self._thread.start()
+
+        self._wake_up.set()
+        try:
+            return waiter.future.result(timeout=max(wait_timeout, 0))
+        except FutureTimeoutError:
+            raise TimeoutExpiredError(f"Timeout waiting for cluster {name}", elapsed_time=wait_timeout)
+        finally:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+
+    def get_install_logs(self, cluster_id: str, offset: int) -> str:
+        """
+        Returns:
+            str: the cluster install logs from line `offset`, empty if the logs are not available (yet)
+        """
+        try:
+            log = self.ocm_client.api_clusters_mgmt_v1_clusters_cluster_id_logs_install_get(
+                cluster_id=cluster_id, offset=offset
+            )
+        except Exception as ex:
+            self.logger.debug(f"Failed to get cluster {cluster_id} install logs: {ex}")
+            return ""
+
+        return getattr(log, "content", "") or ""
+
+    def wait_for_cluster_ready(self, name: str, wait_timeout: float, fatal_patterns: Optional[List[str]] = None) -> Any:
+        """
+        Wait for the cluster to be ready.
+
+        The wait fails as soon as the cluster is in error state, or its status description or install logs match one
+        of `fatal_patterns`. Install logs are read incrementally while the cluster is installing, at most once per
+        `install_logs_interval`.
+
+        Raises:
+            OcmClusterStateError: if the cluster is in error state or a fatal pattern matched
+        """
+        _fatal_patterns = [re.compile(_pattern) for _pattern in fatal_patterns or []]
+        install_log_offset = 0
+        install_logs_time: Optional[float] = None
+
+        def _fatal_error(text: str) -> str:
+            for _line in text.splitlines():
+                if any(_pattern.search(_line) for _pattern in _fatal_patterns):
+                    return _line.strip()
+
+            return ""
+
+        def _check(cluster: Optional[Any]) -> bool:
+            nonlocal install_log_offset, install_logs_time
+
+            state = str(getattr(cluster, "state", ""))
+            description = str(getattr(getattr(cluster, "status", None), "description", "") or "")
+            if state == OCM_CLUSTER_ERROR_STATE:
+                raise OcmClusterStateError(f"Cluster {name} is in {state} state: {description}")
+
+            if state == OCM_CLUSTER_READY_STATE:
+                return True
+
+            if cluster is None or not _fatal_patterns:
+                return False
+
+            fatal_error = _fatal_error(text=description)
+            if (
+                not fatal_error
+                and state == OCM_CLUSTER_INSTALLING_STATE
+                and (install_logs_time is None or time.monotonic() - install_logs_time >= self.install_logs_interval)
+            ):
+                install_logs_time = time.monotonic()
+                install_logs = self.get_install_logs(cluster_id=cluster.id, offset=install_log_offset)
+                install_log_offset += len(install_logs.splitlines())
+                fatal_error = _fatal_error(text=install_logs)
+
+            if fatal_error:
+                raise OcmClusterStateError(f"Cluster {name} install failed: {fatal_error}")
+
+            return False
+
+        return self.wait(name=name, check=_check, wait_timeout=wait_timeout)
+
+    def wait_for_cluster_deletion(self, name: str, wait_timeout: float) -> None:
+        self.wait(name=name, check=lambda cluster: cluster is None, wait_timeout=wait_timeout)
+
+    def _check_waiter(self, waiter: OcmStatusWaiter, cluster: Optional[Any]) -> None:
+        try:
+            if waiter.check(cluster):
+                waiter.future.set_result(cluster)
+        except Exception as ex:
+            waiter.future.set_exception(ex)
+
+        if waiter.future.done():
+            with self._lock:
+                # Already removed if the wait timed out meanwhile
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+
+    def _poll(self) -> None:
+        interval = self.min_interval
+        while True:
+            with self._lock:
+                waiters = list(self._waiters)
+                if not waiters:
+                    self._thread = None
+                    return
+
+            try:
+                clusters = self.list_clusters(names=list({_waiter.name for _waiter in waiters}))
+            except Exception as ex:
+                self.logger.warning(f"Failed to get clusters status from OCM: {ex}")
+                clusters = None
+
+            if clusters is not None:
+                states = {_name: str(getattr(clusters.get(_name), "state", "")) for _name in clusters}
+                changed = {_name: _state for _name, _state in states.items() if self._states.get(_name) != _state}
+                for _name, _state in changed.items():
+                    self.logger.info(f"Status of cluster {_name} is {_state}")
+
+                self._states.update(states)
+                interval = self.min_interval if changed else min(interval * 2, self.max_interval)
+                for _waiter in waiters:
+                    # The poller thread is shared by all the waits, a wait failure must not stop it
+                    try:
+                        self._check_waiter(waiter=_waiter, cluster=clusters.get(_waiter.name))
+                    except Exception as ex:
+                        self.logger.error(f"Failed to check cluster {_waiter.name} status: {ex}")
+            else:
+                interval = min(interval * 2, self.max_interval)
+
+            # A new waiter is checked right away
+            if self._wake_up.wait(timeout=interval):
+                self._wake_up.clear()
+                interval = self.min_interval
+
+
+def get_ocm_fatal_patterns(cluster_data: Dict[str, Any]) -> List[str]:
+    """
+    Default fatal patterns and the cluster `ocm-fatal-patterns` (list, or comma separated string).
+    """
+    extra_patterns = cluster_data.get("ocm-fatal-patterns") or []
+    if isinstance(extra_patterns, str):
+        extra_patterns = [_pattern.strip() for _pattern in extra_patterns.split(",") if _pattern.strip()]
+
+    return [*OCM_DEFAULT_FATAL_PATTERNS, *extra_patterns]
+
+
+_POLLERS: Dict[str, OcmStatusPoller] = {}
+_POLLERS_LOCK = threading.Lock()
+
+
+def get_ocm_status_poller(ocm_env: str, ocm_client: DefaultApi) -> OcmStatusPoller:
+    with _POLLERS_LOCK:
+        if ocm_env not in _POLLERS:
+            _POLLERS[ocm_env] = OcmStatusPoller(ocm_client=ocm_client)
+
+        return _POLLERS[ocm_env]
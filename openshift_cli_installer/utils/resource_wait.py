@@ -0,0 +1,81 @@
+from __future__ import annotations
+import time
+from typing import Any, Callable, Dict, Optional
+
+from kubernetes.client.rest import ApiException
+from kubernetes.dynamic import DynamicClient
+from simple_logger.logger import get_logger
+from timeout_sampler import TimeoutExpiredError
+
+LOGGER = get_logger(name=__name__)
+
+RESOURCE_WAIT_POLL_INTERVAL_SECONDS = 10
+HTTP_STATUS_GONE = 410
+
+
+def wait_for_resource(
+    client: DynamicClient,
+    api_version: str,
+    kind: str,
+    name: str,
+    condition: Callable[[Dict[str, Any]], bool],
+    wait_timeout: float,
+    namespace: Optional[str] = None,
+    poll_interval: float = RESOURCE_WAIT_POLL_INTERVAL_SECONDS,
+) -> Dict[str, Any]:
+    """
+    Wait until a resource matches `condition`, using a Kubernetes watch stream.
+
+    The resource is listed once, then watched from the list resourceVersion; when the stream ends it is resumed
+    from the last seen resourceVersion, and the resource is listed again if that version expired (410 Gone).
+    If the watch fails, the resource is polled every `poll_interval` seconds.
+
+    Args:
+        condition (Callable): called with the resource dict, returns True when the wait is done
+
+    Returns:
+        dict: the resource
+
+    Raises:
+        TimeoutExpiredError: if the resource does not match `condition` within `wait_timeout` seconds
+    """
+    resource_api = client.resources.get(api_version=api_version, kind=kind)
+    field_selector = f"metadata.name={name}"
+    deadline = time.monotonic() + wait_timeout
+    resource_version: Optional[str] = None
+    watch_failed = False
+
+    while (remaining := deadline - time.monotonic()) > 0:
+        if resource_version is None or watch_failed:
+            resources = client.get(resource_api, namespace=namespace, field_selector=field_selector).to_dict()
+            for _resource in resources["items"]:
+                if condition(_resource):
+                    return _resource
+
+            resource_version = resources["metadata"]["resourceVersion"]
+            if watch_failed:
+                time.sleep(min(poll_interval, max(deadline - time.monotonic(), 0)))
+                continue
+
+        try:
+            for event in client.watch(
+                resource_api,
+                namespace=namespace,
+                field_selector=field_selector,
+                resource_version=resource_version,
+                timeout=max(int(remaining), 1),
+            ):
+                raw_object = event["raw_object"]
+                resource_version = raw_object["metadata"]["resourceVersion"]
+                if event["type"] in ("ADDED", "MODIFIED") and condition(raw_object):
+                    return raw_object
+
+        except Exception as ex:
+            if isinstance(ex, ApiException) and ex.status == HTTP_STATUS_GONE:
+                resource_version = None
+                continue
+
+            LOGGER.warning(f"Failed to watch {kind} {name}, polling every {poll_interval} seconds: {ex}")
+            watch_failed = True
+
+    raise TimeoutExpiredError(f"{kind} {name} did not reach the expected state", elapsed_time=wait_timeout)
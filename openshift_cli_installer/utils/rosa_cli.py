@@ -0,0 +1,200 @@
+from __future__ import annotations
+import copy
+import json
+import re
+import shlex
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, Optional, Tuple
+
+import rosa.cli
+from simple_logger.logger import get_logger
+
+version = sys.version_info
+if version[0] == 3 and version[1] < 9:
+    from functools import lru_cache as cache
+else:
+    from functools import cache  # type: ignore[no-redef]
+
+
+ROSA_CLI_LOG_FILENAME = "rosa-cli-calls.jsonl"
+ROSA_READ_ONLY_COMMANDS = ("describe", "list", "verify", "version", "whoami")
+ROSA_CLI_CACHE_TTL_SECONDS = 300
+# Read-only commands have no side effects and are safe to retry
+ROSA_CLI_READ_ONLY_RETRIES = 2
+ROSA_CLI_RETRY_SLEEP_SECONDS = 5
+# Flags values which are not written to the calls log, in addition to `rosa.cli.hash_log_keys` ones
+ROSA_CLI_SECRET_FLAGS = ("password", "client-secret", "token", "private-key", "secret-key", "access-key")
+
+
+class RosaCli:
+    """
+    `rosa.cli.execute` wrapper.
+
+    Read-only commands results are cached per (OCM env, region, command) for `ttl` seconds and identical concurrent
+    read-only commands run once. Mutating commands run every time and invalidate the (OCM env, region) cached
+    results. Every call (latency, exit code, retries, cache hit) is appended to a JSON lines log file, if set.
+    """
+
+    def __init__(self, ttl: float = ROSA_CLI_CACHE_TTL_SECONDS, log_file: str = "") -> None:
+        self.logger = get_logger(f"{self.__class__.__module__}-{self.__class__.__name__}")
+        self.ttl = ttl
+        self.log_file = log_file
+        self._lock = threading.Lock()
+        self._log_lock = threading.Lock()
+        self._cache: Dict[Tuple[str, str, str], Tuple[float, Dict[str, Any]]] = {}
+        self._in_flight: Dict[Tuple[str, str, str], "Future[Dict[str, Any]]"] = {}
+
+    @staticmethod
+    def is_read_only(command: str) -> bool:
+        return shlex.split(command)[0] in ROSA_READ_ONLY_COMMANDS
+
+    @staticmethod
+    def ocm_env(ocm_client: Any) -> str:
+        return getattr(getattr(getattr(ocm_client, "api_client", None), "configuration", None), "host", "") or ""
+
+    def execute(
+        self, command: str, aws_region: str, ocm_client: Any, retries: Optional[int] = None, retry_pattern: str = ""
+    ) -> Dict[str, Any]:
+        """
+        Execute a rosa command, see `rosa.cli.execute`.
+
+        Args:
+            retries (int): number of retries on failure, with exponential backoff; defaults to
+                `ROSA_CLI_READ_ONLY_RETRIES` for read-only commands and 0 for mutating commands
+            retry_pattern (str): regex, retry only the failures which match it (all the failures if not set)
+        """
+        read_only = self.is_read_only(command=command)
+        key = (self.ocm_env(ocm_client=ocm_client), aws_region, command)
+        if not read_only:
+            self.invalidate(ocm_env=key[0], aws_region=aws_region)
+            return self._execute(
+                command=command,
+                aws_region=aws_region,
+                ocm_client=ocm_client,
+                retries=retries or 0,
+                retry_pattern=retry_pattern,
+            )
+
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached and time.monotonic() - cached[0] < self.ttl:
+                self.log_call(command=command, aws_region=aws_region, ocm_env=key[0], read_only=True, cached=True)
+                return copy.deepcopy(cached[1])
+
+            future = self._in_flight.get(key)
+            is_owner = future is None
+            if future is None:
+                future = self._in_flight[key] = Future()
+
+        if not is_owner:
+            return copy.deepcopy(future.result())
+
+        try:
+            result = self._execute(
+                command=command,
+                aws_region=aws_region,
+                ocm_client=ocm_client,
+                retries=ROSA_CLI_READ_ONLY_RETRIES if retries is None else retries,
+                retry_pattern=retry_pattern,
+            )
+        except Exception as ex:
+            future.set_exception(ex)
+            raise
+        else:
+            future.set_result(result)
+            with self._lock:
+                self._cache[key] = (time.monotonic(), result)
+
+            return copy.deepcopy(result)
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def _execute(
+        self, command: str, aws_region: str, ocm_client: Any, retries: int, retry_pattern: str
+    ) -> Dict[str, Any]:
+        start_time = time.monotonic()
+        attempt = 0
+        exit_code = 1
+        try:
+            while True:
+                try:
+                    result = rosa.cli.execute(command=command, aws_region=aws_region, ocm_client=ocm_client)
+                    exit_code = 0
+                    return result
+                except rosa.cli.CommandExecuteError as ex:
+                    if attempt >= retries or not re.search(retry_pattern, str(ex)):
+                        raise
+
+                    attempt += 1
+                    self.logger.warning(f"rosa command failed, retry {attempt}/{retries}: {ex}")
+                    time.sleep(ROSA_CLI_RETRY_SLEEP_SECONDS * 2 ** (attempt - 1))
+        finally:
+            self.log_call(
+                command=command,
+                aws_region=aws_region,
+                ocm_env=self.ocm_env(ocm_client=ocm_client),
+                read_only=self.is_read_only(command=command),
+                latency=time.monotonic() - start_time,
+                exit_code=exit_code,
+                retries=attempt,
+            )
+
+    @staticmethod
+    def redact_command(command: str) -> str:
+        """
+        Hide the command secret flags values (`--flag=value` or `--flag value`, quoted or not).
+        """
+        for _flag in ROSA_CLI_SECRET_FLAGS:
+            command = re.sub(rf"(--{_flag})(=|\s+)(?!--)(\"[^\"]*\"|'[^']*'|\S+)", rf"\1\2{'*' * 5}", command)
+
+        return rosa.cli.hash_log_keys(log=command).strip()
+
+    def invalidate(self, ocm_env: str, aws_region: str) -> None:
+        with self._lock:
+            for _key in [_key for _key in self._cache if _key[:2] == (ocm_env, aws_region)]:
+                self._cache.pop(_key)
+
+    def log_call(
+        self,
+        command: str,
+        aws_region: str,
+        ocm_env: str,
+        read_only: bool,
+        cached: bool = False,
+        latency: float = 0.0,
+        exit_code: int = 0,
+        retries: int = 0,
+    ) -> None:
+        if not self.log_file:
+            return
+
+        record = {
+            "time": time.time(),
+            "command": self.redact_command(command=command),
+            "region": aws_region,
+            "ocm-env": ocm_env,
+            "read-only": read_only,
+            "cached": cached,
+            "latency": round(latency, 3),
+            "exit-code": exit_code,
+            "retries": retries,
+        }
+        with self._log_lock, open(self.log_file, "a") as fd:
+            fd.write(f"{json.dumps(record)}\n")
+
+
+@cache
+def get_rosa_cli() -> RosaCli:
+    return RosaCli()
+
+
+def execute_rosa_command(
+    command: str, aws_region: str, ocm_client: Any, retries: Optional[int] = None, retry_pattern: str = ""
+) -> Dict[str, Any]:
+    return get_rosa_cli().execute(
+        command=command, aws_region=aws_region, ocm_client=ocm_client, retries=retries, retry_pattern=retry_pattern
+    )
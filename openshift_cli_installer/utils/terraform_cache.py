@@ -0,0 +1,201 @@
+from __future__ import annotations
+import glob
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional
+
+from python_terraform import Terraform
+from simple_logger.logger import get_logger
+
+from openshift_cli_installer.utils.const import TERRAFORM_CACHE_DEFAULT_DIRECTORY
+from openshift_cli_installer.utils.general import get_manifests_path
+from openshift_cli_installer.utils.installer_cache import file_lock
+
+version = sys.version_info
+if version[0] == 3 and version[1] < 9:
+    from functools import lru_cache as cache
+else:
+    from functools import cache  # type: ignore[no-redef]
+
+
+LOGGER = get_logger(name=__name__)
+
+SEED_COMPLETE_FILENAME = ".seed-complete"
+TERRAFORM_CLI_CONFIG_FILENAME = "terraform.tfrc"
+TERRAFORM_SEED_CLI_CONFIG_FILENAME = "seed.tfrc"
+
+
+class TerraformCacheError(Exception):
+    pass
+
+
+class CachedTerraform(Terraform):
+    """
+    python-terraform `Terraform` running terraform with extra environment variables (`env`), python-terraform itself
+    only passes the process environment.
+    """
+
+    def __init__(self, env: Optional[Dict[str, str]] = None, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.env = env or {}
+
+    def generate_cmd_string(self, cmd: str, *args: Any, **kwargs: Any) -> List[str]:
+        cmds = super().generate_cmd_string(cmd, *args, **kwargs)
+        if not self.env:
+            return cmds
+
+        return ["env", *[f"{_name}={_value}" for _name, _value in self.env.items()], *cmds]
+
+
+class TerraformCache:
+    """
+    Shared terraform providers and modules cache, used by all clusters workspaces and processes.
+
+    The cache is seeded once per `setup-vpc.tf` content (the only run that needs the network):
+        - providers are mirrored to `<cache_dir>/providers`, used as a filesystem mirror by all workspaces.
+        - registry modules are downloaded once, workspaces use them as local path modules (not copied by init).
+    Seeding is guarded by a lock file; seeded content is read only.
+    """
+
+    def __init__(self, cache_dir: str) -> None:
+        self.logger = get_logger(f"{self.__class__.__module__}-{self.__class__.__name__}")
+        self.cache_dir = cache_dir
+        self.providers_mirror_dir = os.path.join(cache_dir, "providers")
+        self.plugins_cache_dir = os.path.join(cache_dir, "plugins")
+        self.cli_config_file = os.path.join(cache_dir, TERRAFORM_CLI_CONFIG_FILENAME)
+        for _dir in (self.providers_mirror_dir, self.plugins_cache_dir):
+            os.makedirs(_dir, exist_ok=True)
+
+    @staticmethod
+    def seed_terraform_file() -> str:
+        return os.path.join(get_manifests_path(), "setup-vpc.tf")
+
+    def seed_dir(self, terraform_file: str) -> str:
+        with open(terraform_file, "rb") as fd:
+            return os.path.join(self.cache_dir, "seeds", hashlib.sha256(fd.read()).hexdigest()[:16])
+
+    def write_cli_configs(self) -> None:
+        seed_cli_config = f'plugin_cache_dir = "{self.plugins_cache_dir}"\n'
+        cli_config = (
+            f"{seed_cli_config}"
+            "provider_installation {\n"
+            "  filesystem_mirror {\n"
+            f'    path    = "{self.providers_mirror_dir}"\n'
+            '    include = ["registry.terraform.io/hashicorp/*"]\n'
+            "  }\n"
+            "  direct {\n"
+            '    exclude = ["registry.terraform.io/hashicorp/*"]\n'
+            "  }\n"
+            "}\n"
+        )
+        for _filename, _content in (
+            (TERRAFORM_SEED_CLI_CONFIG_FILENAME, seed_cli_config),
+            (TERRAFORM_CLI_CONFIG_FILENAME, cli_config),
+        ):
+            _path = os.path.join(self.cache_dir, _filename)
+            with open(f"{_path}.tmp", "w") as fd:
+                fd.write(_content)
+
+            os.replace(f"{_path}.tmp", _path)
+
+    def run_terraform(self, command: List[str], working_dir: str) -> None:
+        env = {
+            **os.environ,
+            "TF_CLI_CONFIG_FILE": os.path.join(self.cache_dir, TERRAFORM_SEED_CLI_CONFIG_FILENAME),
+            "TF_IN_AUTOMATION": "true",
+        }
+        try:
+            res = subprocess.run(["terraform", *command], cwd=working_dir, env=env, capture_output=True, text=True)
+        except OSError as ex:
+            raise TerraformCacheError(f"Failed to run terraform {command[0]}: {ex}")
+
+        if res.returncode != 0:
+            raise TerraformCacheError(f"terraform {' '.join(command)} failed: {res.stderr or res.stdout}")
+
+    def seed(self, terraform_file: str) -> str:
+        """
+        Download the providers and modules of `terraform_file` once.
+
+        Returns:
+            str: seed workspace directory
+        """
+        seed_dir = self.seed_dir(terraform_file=terraform_file)
+        if os.path.exists(os.path.join(seed_dir, SEED_COMPLETE_FILENAME)):
+            return seed_dir
+
+        with file_lock(path=os.path.join(self.cache_dir, ".seed.lock")):
+            if os.path.exists(os.path.join(seed_dir, SEED_COMPLETE_FILENAME)):
+                return seed_dir
+
+            self.logger.info(f"Seeding terraform cache {self.cache_dir} from {terraform_file}")
+            shutil.rmtree(seed_dir, ignore_errors=True)
+            os.makedirs(seed_dir)
+            shutil.copy(terraform_file, seed_dir)
+            self.write_cli_configs()
+            self.run_terraform(command=["init", "-backend=false", "-input=false"], working_dir=seed_dir)
+            self.run_terraform(command=["providers", "mirror", self.providers_mirror_dir], working_dir=seed_dir)
+            open(os.path.join(seed_dir, SEED_COMPLETE_FILENAME), "w").close()
+
+        return seed_dir
+
+    @staticmethod
+    def seed_modules(seed_dir: str) -> Dict[str, str]:
+        """
+        Returns:
+            dict: registry module source (as written in the terraform file) -> downloaded module directory
+        """
+        with open(os.path.join(seed_dir, ".terraform", "modules", "modules.json")) as fd:
+            modules = json.load(fd)["Modules"]
+
+        return {
+            re.sub(r"^registry\.terraform\.io/", "", _module["Source"]): os.path.join(seed_dir, _module["Dir"])
+            for _module in modules
+            if _module.get("Key") and _module.get("Version")
+        }
+
+    def prepare_workspace(self, working_dir: str) -> Dict[str, str]:
+        """
+        Point the workspace terraform files registry modules to the cached modules.
+
+        Falls back to a regular (online) `terraform init` if the cache cannot be seeded.
+
+        Returns:
+            dict: environment variables for the workspace terraform commands (`CachedTerraform` env), to use the
+                providers mirror; empty if the cache is not used or a user CLI config is set
+        """
+        try:
+            seed_dir = self.seed(terraform_file=self.seed_terraform_file())
+            seed_modules = self.seed_modules(seed_dir=seed_dir)
+        except (TerraformCacheError, OSError, KeyError, ValueError) as ex:
+            self.logger.warning(f"Terraform cache not used for {working_dir}: {ex}")
+            return {}
+
+        for _terraform_file in glob.glob(os.path.join(working_dir, "*.tf")):
+            with open(_terraform_file) as fd:
+                content = fd.read()
+
+            for _source, _module_dir in seed_modules.items():
+                # Local path modules are used in place, a registry source `version` is not allowed for them
+                content = re.sub(
+                    rf'source\s*=\s*"{re.escape(_source)}"\s*\n(\s*version\s*=\s*"[^"]*"\s*\n)?',
+                    f'source = "{_module_dir}"\n',
+                    content,
+                )
+
+            with open(_terraform_file, "w") as fd:
+                fd.write(content)
+
+        if "TF_CLI_CONFIG_FILE" in os.environ:
+            return {}
+
+        return {"TF_CLI_CONFIG_FILE": self.cli_config_file}
+
+
+@cache
+def get_terraform_cache(cache_dir: str = TERRAFORM_CACHE_DEFAULT_DIRECTORY) -> TerraformCache:
+    return TerraformCache(cache_dir=cache_dir)
@@ -0,0 +1,65 @@
+from __future__ import annotations
+import os
+from typing import Any, Dict
+from urllib.parse import urlparse
+
+BACKEND_FILENAME = "backend.tf"
+S3_BACKEND_SCHEME = "s3"
+
+
+class TerraformStateBackendError(Exception):
+    pass
+
+
+def get_terraform_state_backend(backend_url: str, name: str, region: str) -> Dict[str, Any]:
+    """
+    Remote terraform state backend of a workspace.
+
+    Args:
+        backend_url (str): `s3://<bucket>[/<prefix>]` or a local directory (shared filesystem)
+        name (str): state name, unique per workspace
+        region (str): S3 bucket region, used if `AWS_REGION` is not set
+
+    Returns:
+        dict: {"type": <terraform backend type>, "config": <terraform backend configuration>}
+    """
+    parsed_url = urlparse(backend_url)
+    if parsed_url.scheme == S3_BACKEND_SCHEME:
+        if not parsed_url.netloc:
+            raise TerraformStateBackendError(f"Missing S3 bucket name in terraform state backend {backend_url}")
+
+        return {
+            "type": "s3",
+            "config": {
+                "bucket": parsed_url.netloc,
+                "key": os.path.join(parsed_url.path.strip("/"), name, "terraform.tfstate"),
+                "region": os.environ.get("AWS_REGION") or region,
+                # S3 native state locking, terraform >= 1.10
+                "use_lockfile": "true",
+            },
+        }
+
+    if parsed_url.scheme:
+        raise TerraformStateBackendError(f"Unsupported terraform state backend {backend_url}")
+
+    # The local backend locks the state file
+    return {
+        "type": "local",
+        "config": {"path": os.path.join(os.path.abspath(backend_url), name, "terraform.tfstate")},
+    }
+
+
+def write_terraform_backend_file(working_dir: str, backend: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Write a partial backend configuration to `working_dir`, the backend configuration is passed to `terraform init`.
+
+    Returns:
+        dict: `terraform init` backend configuration
+    """
+    with open(os.path.join(working_dir, BACKEND_FILENAME), "w") as fd:
+        fd.write(f'terraform {{\n  backend "{backend["type"]}" {{}}\n}}\n')
+
+    if backend["type"] == "local":
+        os.makedirs(os.path.dirname(backend["config"]["path"]), exist_ok=True)
+
+    return backend["config"]
@@ -0,0 +1,220 @@
+from __future__ import annotations
+import json
+import os
+import shutil
+import time
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import shortuuid
+from python_terraform import IsNotFlagged, Terraform
+from simple_logger.logger import get_logger
+
+from openshift_cli_installer.utils.const import TERRAFORM_CACHE_DEFAULT_DIRECTORY
+from openshift_cli_installer.utils.general import get_aws_az_ids, get_manifests_path
+from openshift_cli_installer.utils.installer_cache import file_lock, try_file_lock
+from openshift_cli_installer.utils.terraform_cache import CachedTerraform, get_terraform_cache
+
+VPC_DATA_FILENAME = "vpc.json"
+LEASE_FILENAME = "lease.json"
+# Provision failed and the rollback destroy failed too, the workspace (terraform state) is kept for a later cleanup
+FAILED_FILENAME = "failed.json"
+
+
+class VpcPoolError(Exception):
+    pass
+
+
+class VpcLease(NamedTuple):
+    name: str
+    vpc_id: str
+    subnets: List[str]
+
+
+class VpcPool:
+    """
+    Pool of pre-provisioned AWS VPCs (created with `setup-vpc.tf`) for IPI clusters installed into existing subnets.
+
+    Each pool VPC is a terraform workspace under `<pool_dir>/<region>/<vpc name>` with its state and subnets.
+    A cluster leases a free VPC (`lease.json` in the VPC workspace) and releases it when destroyed; a new VPC is
+    provisioned when no VPC is free. Pool changes are guarded by a region lock file, shared between processes.
+    A VPC whose provision and rollback both failed keeps its workspace, marked with `failed.json`, and its destroy is
+    retried when a VPC is released.
+    """
+
+    def __init__(
+        self, pool_dir: str, region: str, terraform_cache_dir: str = TERRAFORM_CACHE_DEFAULT_DIRECTORY
+    ) -> None:
+        self.logger = get_logger(f"{self.__class__.__module__}-{self.__class__.__name__}")
+        self.region = region
+        self.terraform_cache_dir = terraform_cache_dir
+        self.region_dir = os.path.join(pool_dir, region)
+        os.makedirs(self.region_dir, exist_ok=True)
+
+    @property
+    def lock_path(self) -> str:
+        return os.path.join(self.region_dir, ".pool.lock")
+
+    def vpc_dir(self, name: str) -> str:
+        return os.path.join(self.region_dir, name)
+
+    def vpcs(self) -> List[str]:
+        return sorted(_name for _name in os.listdir(self.region_dir) if os.path.isdir(self.vpc_dir(name=_name)))
+
+    def read_json(self, name: str, filename: str) -> Optional[Dict[str, Any]]:
+        path = os.path.join(self.vpc_dir(name=name), filename)
+        if not os.path.isfile(path):
+            return None
+
+        with open(path) as fd:
+            return json.load(fd)
+
+    def write_json(self, name: str, filename: str, data: Dict[str, Any]) -> None:
+        path = os.path.join(self.vpc_dir(name=name), filename)
+        with open(f"{path}.tmp", "w") as fd:
+            json.dump(data, fd)
+
+        os.replace(f"{path}.tmp", path)
+
+    def lease(self, cluster_name: str, cidr: str = "10.0.0.0/16") -> VpcLease:
+        """
+        Lease a free pool VPC with `cidr` for `cluster_name`, provisioning a new VPC if none is free.
+        """
+        with file_lock(path=self.lock_path):
+            for _name in self.vpcs():
+                vpc_data = self.read_json(name=_name, filename=VPC_DATA_FILENAME)
+                if vpc_data and vpc_data["cidr"] == cidr and not self.read_json(name=_name, filename=LEASE_FILENAME):
+                    self.write_json(
+                        name=_name, filename=LEASE_FILENAME, data={"cluster": cluster_name, "time": time.time()}
+                    )
+                    self.logger.info(f"Leased pool VPC {_name} ({vpc_data['vpc-id']}) to cluster {cluster_name}")
+                    return VpcLease(name=_name, vpc_id=vpc_data["vpc-id"], subnets=vpc_data["subnets"])
+
+            # Reserve the new VPC workspace, provisioned outside the pool lock
+            name = f"ipi-pool-{shortuuid.uuid().lower()[:8]}"
+            os.makedirs(self.vpc_dir(name=name))
+            self.write_json(name=name, filename=LEASE_FILENAME, data={"cluster": cluster_name, "time": time.time()})
+
+        try:
+            vpc_data = self.provision(name=name, cidr=cidr)
+        except Exception:
+            # Keep the terraform state of VPCs that failed to roll back
+            if not self.read_json(name=name, filename=FAILED_FILENAME):
+                shutil.rmtree(self.vpc_dir(name=name), ignore_errors=True)
+
+            raise
+
+        self.logger.info(f"Leased new pool VPC {name} ({vpc_data['vpc-id']}) to cluster {cluster_name}")
+        return VpcLease(name=name, vpc_id=vpc_data["vpc-id"], subnets=vpc_data["subnets"])
+
+    def provision(self, name: str, cidr: str) -> Dict[str, Any]:
+        self.logger.info(f"Provisioning pool VPC {name} in {self.region}")
+        terraform = self.terraform(name=name, cidr=cidr)
+        rc, _, err = terraform.apply(capture_output=True, skip_plan=True, auto_approve=True)
+        try:
+            if rc != 0:
+                raise VpcPoolError(f"Failed to provision pool VPC {name} in {self.region}: {err}")
+
+            terraform_output = terraform.output()
+            vpc_data = {
+                "vpc-id": terraform_output["vpc-id"]["value"],
+                "cidr": cidr,
+                "subnets": terraform_output["private-subnets"]["value"] + terraform_output["public-subnets"]["value"],
+            }
+            self.write_json(name=name, filename=VPC_DATA_FILENAME, data=vpc_data)
+            return vpc_data
+
+        except Exception as ex:
+            self.logger.error(f"Failed to provision pool VPC {name}, rolling back. Err: {ex}")
+            self.destroy(name=name, cidr=cidr, terraform=terraform, error=str(ex))
+            if isinstance(ex, VpcPoolError):
+                raise
+
+            raise VpcPoolError(f"Failed to provision pool VPC {name} in {self.region}: {ex}") from ex
+
+    def destroy(self, name: str, cidr: str, terraform: Terraform, error: str = "") -> bool:
+        """
+        Destroy a pool VPC and remove its workspace.
+
+        If the destroy fails the workspace is kept and marked failed, so that the destroy can be retried.
+
+        Returns:
+            bool: True if the VPC was destroyed
+        """
+        rc, _, err = terraform.destroy(force=IsNotFlagged, auto_approve=True, capture_output=True)
+        if rc != 0:
+            self.logger.error(
+                f"Failed to destroy pool VPC {name}, terraform state kept in {self.vpc_dir(name=name)}. Err: {err}"
+            )
+            with file_lock(path=self.lock_path):
+                self.write_json(
+                    name=name,
+                    filename=FAILED_FILENAME,
+                    data={"cidr": cidr, "time": time.time(), "error": error or err},
+                )
+                lease_path = os.path.join(self.vpc_dir(name=name), LEASE_FILENAME)
+                if os.path.isfile(lease_path):
+                    os.remove(lease_path)
+
+            return False
+
+        shutil.rmtree(self.vpc_dir(name=name), ignore_errors=True)
+        return True
+
+    def cleanup_failed(self) -> None:
+        """
+        Retry the destroy of the pool VPCs whose provision rollback failed.
+        """
+        for _name in self.vpcs():
+            failed = self.read_json(name=_name, filename=FAILED_FILENAME)
+            if not failed:
+                continue
+
+            # Skip VPCs being cleaned up by another process
+            with try_file_lock(path=os.path.join(self.region_dir, f".{_name}.cleanup.lock")) as locked:
+                if not locked or not os.path.isdir(self.vpc_dir(name=_name)):
+                    continue
+
+                self.logger.info(f"Retrying destroy of failed pool VPC {_name}")
+                try:
+                    terraform = self.terraform(name=_name, cidr=failed["cidr"])
+                except Exception as ex:
+                    self.logger.error(f"Failed to destroy pool VPC {_name}: {ex}")
+                    continue
+
+                if self.destroy(name=_name, cidr=failed["cidr"], terraform=terraform, error=failed["error"]):
+                    os.remove(os.path.join(self.region_dir, f".{_name}.cleanup.lock"))
+
+    def terraform(self, name: str, cidr: str) -> Terraform:
+        vpc_dir = self.vpc_dir(name=name)
+        shutil.copy(os.path.join(get_manifests_path(), "setup-vpc.tf"), vpc_dir)
+        terraform = CachedTerraform(
+            env=get_terraform_cache(cache_dir=self.terraform_cache_dir).prepare_workspace(working_dir=vpc_dir),
+            working_dir=vpc_dir,
+            variables={
+                "aws_region": self.region,
+                "az_ids": get_aws_az_ids(region=self.region),
+                "cluster_name": name,
+                "cidr": cidr,
+            },
+        )
+        rc, out, err = terraform.init()
+        if rc != 0:
+            raise VpcPoolError(f"Terraform init failed for pool VPC {name}. Err: {err}, Out: {out}")
+
+        return terraform
+
+    def release(self, name: str, cluster_name: str) -> None:
+        with file_lock(path=self.lock_path):
+            lease = self.read_json(name=name, filename=LEASE_FILENAME)
+            if not lease:
+                self.logger.warning(f"Pool VPC {name} is not leased")
+                return
+
+            if lease["cluster"] != cluster_name:
+                self.logger.warning(f"Pool VPC {name} is leased to {lease['cluster']}, not to {cluster_name}")
+                return
+
+            os.remove(os.path.join(self.vpc_dir(name=name), LEASE_FILENAME))
+            self.logger.info(f"Released pool VPC {name} from cluster {cluster_name}")
+
+        self.cleanup_failed()